@@ -30,7 +30,7 @@ setup(
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "bank-marketing=src.main:main",
+            "bank-marketing=src.cli:main",
         ],
     },
 )
\ No newline at end of file
@@ -0,0 +1,362 @@
+"""
+Headless batch campaign generation
+
+Reads customers from a CSV or Parquet file, or generates synthetic ones,
+generates each customer's insights and campaign with bounded concurrency,
+and streams the results to JSON Lines or Parquet as they complete. A summary
+of throughput, latency percentiles, cache hit rate and failures is printed
+at the end.
+
+    python src/cli.py --generate 500 --seed 7 --output campaigns.jsonl --concurrency 8
+    bank-marketing --input customers.parquet --output campaigns.parquet --packed --workers 4
+"""
+import argparse
+import ast
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Make the src modules importable when run as `src.cli` through the console script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from config.settings import API_SETTINGS
+from data.compact import MASK_COLUMNS
+from data.synthetic_data import generate_synthetic_data
+from models.campaign_generator import generate_campaigns
+from models.campaign_models import CampaignResult
+from models.campaign_validator import json_safe
+from models.customer_insights import calculate_metrics, generate_recommendations
+from utils.api_utils import make_api_call
+
+REQUIRED_COLUMNS = (
+    'customer_id', 'age', 'gender', 'location', 'income', 'occupation',
+    'transaction_frequency', 'average_transaction', 'digital_engagement', 'customer_segment'
+)
+
+# Parquet output columns; nested values are stored as JSON strings
+PARQUET_COLUMNS = {
+    'customer_id': 'string',
+    'success': 'bool',
+    'cached': 'bool',
+    'latency': 'float64',
+    'error': 'string',
+    'validation_errors': 'json',
+    'insights': 'json',
+    'campaign': 'json'
+}
+
+
+def _parse_list(value: Any) -> List[str]:
+    """A list column value read back from CSV ("['a', 'b']", "('a', 'b')" or "a, b") or Parquet (an array)"""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(item) for item in value]
+    if not isinstance(value, str) or not value.strip():
+        return []
+    value = value.strip()
+    if value.startswith(('[', '(')):
+        return [str(item) for item in ast.literal_eval(value)]
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def load_customers(path: str) -> pd.DataFrame:
+    """
+    Read customer records from a CSV file or a Parquet file or dataset directory
+
+    List columns (products, interests, channels) are converted back to lists;
+    compact ``*_mask`` columns are used as they are.
+
+    Args:
+        path (str): Input path
+
+    Returns:
+        pd.DataFrame: Customer records with a fresh integer index
+
+    Raises:
+        ValueError: If the format is not supported or required columns are missing
+    """
+    source = Path(path)
+    if source.is_dir() or source.suffix.lower() in ('.parquet', '.pq'):
+        customers = pd.read_parquet(source)
+    elif source.suffix.lower() == '.csv':
+        customers = pd.read_csv(source)
+    else:
+        raise ValueError(f"Unsupported input format '{source.suffix}', expected .csv or .parquet")
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in customers.columns]
+    for column, (mask_column, _, _) in MASK_COLUMNS.items():
+        if column in customers.columns:
+            customers[column] = customers[column].map(_parse_list)
+        elif mask_column not in customers.columns:
+            missing.append(column)
+    if missing:
+        raise ValueError(f"Input is missing columns: {', '.join(missing)}")
+
+    customers['customer_id'] = customers['customer_id'].astype(str)
+    return customers.reset_index(drop=True)
+
+
+def customer_insights(customer: pd.Series) -> Dict[str, Any]:
+    """Metrics and recommendations for one customer, without the dashboard charts"""
+    return json_safe({
+        'metrics': calculate_metrics(customer),
+        'recommendations': generate_recommendations(customer)
+    })
+
+
+def result_record(result: CampaignResult, insights: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """One output row for a campaign result"""
+    return {
+        'customer_id': None if result.customer_id is None else str(result.customer_id),
+        'success': result.success,
+        'cached': result.cached,
+        'latency': round(result.latency, 4),
+        'error': result.error,
+        'validation_errors': [str(issue) for issue in result.validation_errors],
+        'insights': insights,
+        'campaign': json_safe(result.campaign) if result.campaign is not None else None
+    }
+
+
+class JsonlWriter:
+    """Writes one JSON object per line, flushed as each result arrives"""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """Writes results to a Parquet file in row groups of ``batch_size``"""
+
+    def __init__(self, path: str, batch_size: int = 500):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self.batch_size = batch_size
+        types = {'string': pa.string(), 'json': pa.string(), 'bool': pa.bool_(), 'float64': pa.float64()}
+        self.schema = pa.schema([(name, types[kind]) for name, kind in PARQUET_COLUMNS.items()])
+        self._writer = pq.ParquetWriter(path, self.schema)
+        self._rows: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._rows.append({
+            name: json.dumps(record[name]) if kind == 'json' and record[name] is not None else record[name]
+            for name, kind in PARQUET_COLUMNS.items()
+        })
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+WRITERS = {'.jsonl': JsonlWriter, '.ndjson': JsonlWriter, '.parquet': ParquetWriter, '.pq': ParquetWriter}
+
+
+def open_writer(path: str):
+    """JSON Lines or Parquet writer for ``path``, chosen by its extension"""
+    suffix = Path(path).suffix.lower()
+    if suffix not in WRITERS:
+        raise ValueError(f"Unsupported output format '{suffix}', expected .jsonl or .parquet")
+    return WRITERS[suffix](path)
+
+
+def _failure_reasons(result: CampaignResult) -> List[str]:
+    """Validation failures grouped by field and problem, other failures by their message"""
+    if result.validation_errors:
+        return sorted({f"{issue.path or '<root>'}: {issue.code}" for issue in result.validation_errors})
+    return [result.error or 'Unknown error']
+
+
+class BatchSummary:
+    """Running totals of a batch for the closing report"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.succeeded = 0
+        self.cached = 0
+        self.failures: Counter = Counter()
+
+    @property
+    def total(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.succeeded
+
+    def add(self, result: CampaignResult) -> None:
+        """Count one result"""
+        self.latencies.append(result.latency)
+        self.cached += result.cached
+        if result.success:
+            self.succeeded += 1
+        else:
+            self.failures.update(_failure_reasons(result))
+
+    def format(self, elapsed: float, top: int = 5) -> str:
+        """
+        Human-readable summary
+
+        Args:
+            elapsed (float): Wall-clock seconds the batch took
+            top (int): Failure reasons to list
+
+        Returns:
+            str: Multi-line summary
+        """
+        lines = [
+            f"Customers:        {self.total}",
+            f"Succeeded:        {self.succeeded} ({self.succeeded / self.total:.1%})" if self.total
+            else "Succeeded:        0",
+            f"Failed:           {self.failed}",
+            f"Elapsed:          {elapsed:.2f}s",
+            f"Throughput:       {self.total / elapsed if elapsed > 0 else 0.0:.2f} customers/s"
+        ]
+        if self.latencies:
+            p50, p90, p99 = np.percentile(self.latencies, [50, 90, 99])
+            lines.append(f"Latency p50/p90/p99: {p50:.2f}s / {p90:.2f}s / {p99:.2f}s")
+            lines.append(f"Cache hit rate:   {self.cached / self.total:.1%}")
+        if self.failures:
+            lines.append("Top failure reasons:")
+            lines.extend(f"  {count:>6}  {reason}" for reason, count in self.failures.most_common(top))
+        return '\n'.join(lines)
+
+
+def run_batch(customers: pd.DataFrame, output: str,
+              concurrency: Optional[int] = None,
+              workers: int = 1,
+              packed: bool = False,
+              pack_size: Optional[int] = None,
+              use_cache: bool = True,
+              insights: bool = True,
+              progress: bool = True,
+              api_call: Callable[..., Optional[Dict[str, Any]]] = make_api_call) -> BatchSummary:
+    """
+    Generate campaigns for customers and stream each result to ``output``
+
+    Args:
+        customers (pd.DataFrame): Customer records, one per row
+        output (str): .jsonl or .parquet output path
+        concurrency (Optional[int]): Parallel requests across all workers, defaults to API_SETTINGS['max_concurrency']
+        workers (int): Worker processes
+        packed (bool): Put several customers into each prompt
+        pack_size (Optional[int]): Maximum customers per packed prompt
+        use_cache (bool): Allow cached API responses
+        insights (bool): Add each customer's metrics and recommendations
+        progress (bool): Show a progress bar
+        api_call (Callable): Function with the ``make_api_call`` signature
+
+    Returns:
+        BatchSummary: Totals for the closing report
+    """
+    summary = BatchSummary()
+    writer = open_writer(output)
+    try:
+        with tqdm(total=len(customers), unit='customer', disable=not progress) as bar:
+            for result in generate_campaigns(customers, concurrency, api_call=api_call, use_cache=use_cache,
+                                             packed=packed, pack_size=pack_size, workers=workers):
+                details = customer_insights(customers.loc[result.index]) if insights else None
+                writer.write(result_record(result, details))
+                summary.add(result)
+                bar.update(1)
+                bar.set_postfix(failed=summary.failed, refresh=False)
+    finally:
+        writer.close()
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options"""
+    parser = argparse.ArgumentParser(
+        prog='bank-marketing',
+        description="Generate personalized marketing campaigns for a batch of customers."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input', metavar='PATH', help="Customer records as .csv or .parquet")
+    source.add_argument('--generate', type=int, metavar='N', help="Generate N synthetic customers")
+    parser.add_argument('--seed', type=int, help="Seed for --generate")
+    parser.add_argument('--output', required=True, metavar='PATH', help="Results as .jsonl or .parquet")
+    parser.add_argument('--limit', type=int, metavar='N', help="Only process the first N customers")
+    parser.add_argument('--concurrency', type=int, metavar='N',
+                        help=f"Parallel requests across all workers (default {API_SETTINGS['max_concurrency']})")
+    parser.add_argument('--workers', type=int, default=1, metavar='N', help="Worker processes (default 1)")
+    parser.add_argument('--packed', action='store_true', help="Put several customers into each prompt")
+    parser.add_argument('--pack-size', type=int, metavar='N', help="Maximum customers per packed prompt")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore cached API responses")
+    parser.add_argument('--no-insights', action='store_true', help="Skip customer metrics and recommendations")
+    parser.add_argument('--quiet', action='store_true', help="Hide the progress bar")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None,
+         api_call: Callable[..., Optional[Dict[str, Any]]] = make_api_call) -> int:
+    """
+    Run a batch from the command line
+
+    Args:
+        argv (Optional[Sequence[str]]): Arguments, defaults to ``sys.argv[1:]``
+        api_call (Callable): Function with the ``make_api_call`` signature
+
+    Returns:
+        int: Exit status, 1 if no campaign was generated
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+
+    try:
+        # Fail on an unsupported output before doing any work
+        if Path(args.output).suffix.lower() not in WRITERS:
+            raise ValueError(f"Unsupported output format '{Path(args.output).suffix}', "
+                             "expected .jsonl or .parquet")
+        if args.input:
+            customers = load_customers(args.input)
+        else:
+            customers = generate_synthetic_data(args.generate, seed=args.seed)
+            if customers is None:
+                raise ValueError("Synthetic data generation failed")
+    except (OSError, ValueError, SyntaxError) as e:
+        parser.error(str(e))
+
+    if args.limit is not None:
+        customers = customers.head(args.limit)
+
+    start = time.perf_counter()
+    summary = run_batch(customers, args.output,
+                        concurrency=args.concurrency,
+                        workers=args.workers,
+                        packed=args.packed,
+                        pack_size=args.pack_size,
+                        use_cache=not args.no_cache,
+                        insights=not args.no_insights,
+                        progress=not args.quiet,
+                        api_call=api_call)
+    print(summary.format(time.perf_counter() - start))
+    return 0 if summary.succeeded or not summary.total else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,7 +4,8 @@ from .brand_guidelines import (
     get_visual_style,
     get_tone_guidelines,
     get_channel_recommendations,
-    get_brand_colors
+    get_brand_colors,
+    get_guidelines_version
 )
 
 __all__ = [
@@ -13,5 +14,6 @@ __all__ = [
     'get_visual_style',
     'get_tone_guidelines',
     'get_channel_recommendations',
-    'get_brand_colors'
+    'get_brand_colors',
+    'get_guidelines_version'
 ]
\ No newline at end of file
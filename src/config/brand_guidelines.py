@@ -1,6 +1,8 @@
 """
 Brand guidelines configuration for CommBank
 """
+import hashlib
+import json
 
 BRAND_GUIDELINES = {
     'colors': {
@@ -122,4 +124,9 @@ def get_brand_colors(segment: str) -> list:
 def get_legal_disclaimer(product_type: str = 'banking') -> str:
     """Get legal disclaimer based on product type"""
     return (f"{BRAND_GUIDELINES['legal']['regulatory'][product_type]} "
-            f"{BRAND_GUIDELINES['legal']['disclaimer']}")
\ No newline at end of file
+            f"{BRAND_GUIDELINES['legal']['disclaimer']}")
+
+def get_guidelines_version() -> str:
+    """Get a short content hash of the brand guidelines, changing whenever they change"""
+    payload = json.dumps(BRAND_GUIDELINES, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:12]
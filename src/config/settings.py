@@ -18,23 +18,74 @@ APP_SETTINGS = {
 # Data Generation Settings
 DATA_SETTINGS = {
     'min_records': 10,
-    'max_records': 1000,
-    'default_records': 100
+    'max_records': 1000,  # Upper bound offered in the UI
+    'max_generated_records': 10_000_000,  # Upper bound for programmatic generation
+    'default_records': 100,
+    'chunk_size': 100_000,  # Rows per chunk when streaming to disk
+    'city_pool_size': 2000,  # Distinct city names sampled by the columnar engine
+    'default_workers': os.cpu_count() or 1,
+    'default_seed': 42  # Fixed seed so UI datasets can be served from the dataset store
 }
 
 # API Settings
 API_SETTINGS = {
     'model': 'claude-2',
     'max_tokens': 1500,
-    'temperature': 0.7
+    'temperature': 0.7,
+    'max_concurrency': 8,  # Parallel requests for batch generation
+    'min_concurrency': 1,  # Floor for the adaptive concurrency limiter
+    'requests_per_minute': 50,  # Client-side pacing, keep just under provider limits
+    'tokens_per_minute': 40000,
+    'latency_spike_factor': 2.0,  # Latency above this multiple of the baseline shrinks concurrency
+    'call_deadline': 120,  # Seconds per call including retries and backoff
+    'max_retries': 3,  # Retries of transient errors (timeouts, connection errors, 429, 5xx)
+    'retry_base_delay': 0.5,  # First backoff ceiling in seconds, doubled per retry with full jitter
+    'retry_max_delay': 8.0,
+    'breaker_failure_threshold': 5,  # Consecutive transient failures that open the circuit
+    'breaker_recovery_seconds': 30,  # Time the circuit stays open before a probe call
+    'hedge_requests': False,  # Issue a duplicate call when the first is slower than recent latency
+    'hedge_percentile': 95,  # Latency percentile after which a call is hedged
+    'hedge_max_fraction': 0.1,  # At most this share of calls may be hedged
+    'hedge_min_samples': 20,  # Latency samples needed before hedging starts
+    'latency_window': 200,  # Recent calls kept in the latency histogram
+    'pool_max_connections': 32,  # Shared HTTP connection pool for all sessions
+    'pool_max_keepalive': 16,
+    'pool_keepalive_expiry': 60,  # Seconds an idle connection is kept open
+    'connect_timeout': 10,
+    'read_timeout': 120,
+    'pack_max_size': 8,  # Customers per prompt in packed batch generation
+    'pack_token_budget': 12000,  # Estimated prompt plus completion tokens per packed request
+    'campaign_completion_tokens': 800,  # Completion tokens reserved per campaign in a pack
+    'max_completion_tokens': 4096,  # Model's limit on tokens sampled per request
+    'compact_prompts': False,  # Minified example JSON and a single set of instructions
+    'default_max_tokens': 2000,  # Completion reservation until enough lengths are observed
+    'max_tokens_min_samples': 20,  # Completions per segment before max_tokens adapts
+    'max_tokens_headroom': 1.25,  # Multiple of the 95th percentile completion length reserved
+    'max_tokens_step': 256  # Adaptive max_tokens is rounded up to a multiple of this
 }
 
 # Cache Settings
 CACHE_SETTINGS = {
     'ttl': 3600,  # 1 hour
-    'max_entries': 1000
+    'max_entries': 1000,
+    'max_bytes': 256 * 1024 * 1024,  # Estimated size limit per memoized function
+    'dataset_dir': os.getenv('DATASET_CACHE_DIR', os.path.join('.cache', 'datasets')),
+    'shared_max_entries': 10000,  # Process-wide tier shared by all sessions
+    'shared_max_bytes': 1024 * 1024 * 1024,
+    'disk_path': os.getenv('CACHE_DB_PATH'),  # SQLite tier shared across processes, unset to disable
+    'disk_max_entries': 100000,
+    'disk_max_bytes': 4 * 1024 * 1024 * 1024,
+    'namespace_check_interval': 1.0,  # Seconds between brand guideline version checks
+    # LLM response cache, set RESPONSE_CACHE_PATH to an empty string to disable
+    'response_cache_path': os.getenv('RESPONSE_CACHE_PATH', os.path.join('.cache', 'responses.db')),
+    'response_ttl': 7 * 24 * 3600,  # 1 week
+    'response_max_entries': 50000,
+    'response_max_bytes': 512 * 1024 * 1024
 }
 
+# Bump when prompt wording or response handling changes, so cached campaigns are not reused
+PROMPT_VERSION = '4'
+
 # Campaign Types
 CAMPAIGN_TYPES = {
     'product_launch': {
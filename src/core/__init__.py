@@ -0,0 +1,13 @@
+from .reporting import (
+    Reporter,
+    LoggingReporter,
+    get_reporter,
+    set_reporter
+)
+
+__all__ = [
+    'Reporter',
+    'LoggingReporter',
+    'get_reporter',
+    'set_reporter'
+]
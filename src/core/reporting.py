@@ -0,0 +1,80 @@
+"""
+Pluggable error and event reporting for the core modules
+
+Models, data generation and API helpers report through ``get_reporter()``
+instead of a UI toolkit, so they run unchanged in worker processes, the
+CLI and tests. The default ``LoggingReporter`` writes to the standard
+logging module; the Streamlit app installs a reporter that shows messages
+in the page (see ``ui.streamlit_adapter``).
+"""
+import logging
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger('campaigns')
+
+
+class Reporter:
+    """Receiver of user-facing messages and engine events; every method is optional"""
+
+    def error(self, message: str) -> None:
+        """A failure the user should see"""
+
+    def warning(self, message: str) -> None:
+        """A problem that did not stop the current operation"""
+
+    def info(self, message: str) -> None:
+        """A progress or status message"""
+
+    def detail(self, label: str, value: Any) -> None:
+        """Supporting data for a previous message, e.g. a response that failed to parse"""
+
+    def event(self, name: str, **data: Any) -> None:
+        """A structured engine event, e.g. for metrics"""
+
+
+class LoggingReporter(Reporter):
+    """Reports through a standard library logger"""
+
+    def __init__(self, log: Optional[logging.Logger] = None):
+        self.log = log or logger
+
+    def error(self, message: str) -> None:
+        self.log.error(message)
+
+    def warning(self, message: str) -> None:
+        self.log.warning(message)
+
+    def info(self, message: str) -> None:
+        self.log.info(message)
+
+    def detail(self, label: str, value: Any) -> None:
+        self.log.debug("%s: %r", label, value)
+
+    def event(self, name: str, **data: Any) -> None:
+        self.log.debug("event %s %r", name, data)
+
+
+_reporter: Reporter = LoggingReporter()
+_reporter_lock = threading.Lock()
+
+
+def get_reporter() -> Reporter:
+    """Process-wide reporter"""
+    return _reporter
+
+
+def set_reporter(reporter: Reporter) -> Reporter:
+    """
+    Install the process-wide reporter
+
+    Args:
+        reporter (Reporter): Reporter for all later messages
+
+    Returns:
+        Reporter: The previous reporter, so callers can restore it
+    """
+    global _reporter
+    with _reporter_lock:
+        previous, _reporter = _reporter, reporter
+        return previous
@@ -0,0 +1,211 @@
+"""
+Compact encoding for customer datasets
+
+List columns are stored as bitmasks over small fixed vocabularies and
+low-cardinality string columns as categoricals. The accessor helpers
+accept either a list-based or a compact row, so model code does not need
+to know which representation it was given.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+PRODUCTS = (
+    'Savings Account', 'Checking Account', 'Credit Card',
+    'Investment Account', 'Mortgage', 'Personal Loan',
+    'Insurance', 'Business Account'
+)
+
+INTERESTS = (
+    'Travel', 'Investment', 'Shopping', 'Technology', 'Education',
+    'Real Estate', 'Luxury', 'Family', 'Retirement', 'Small Business',
+    'International Banking', 'Cryptocurrency', 'Sustainable Banking',
+    'Health & Insurance', 'Arts & Culture'
+)
+
+CHANNELS = (
+    'Email', 'SMS', 'Mobile App', 'Web', 'Social Media',
+    'Push Notification', 'Branch Visit', 'Phone Banking'
+)
+
+LIFE_STAGES = (
+    'Student', 'Young Professional', 'Family Builder',
+    'Mid-Career', 'Pre-retirement', 'Retired'
+)
+
+OCCUPATIONS = (
+    'Software Engineer', 'Doctor', 'Teacher', 'Business Owner',
+    'Sales Manager', 'Financial Analyst', 'Marketing Manager',
+    'Lawyer', 'Architect', 'Consultant', 'Engineer', 'Professor',
+    'Small Business Owner', 'Executive', 'Freelancer'
+)
+
+SEGMENTS = ('Basic', 'Standard', 'Premium')
+
+ENGAGEMENT_LEVELS = ('Low', 'Medium', 'High')
+
+GENDERS = ('M', 'F')
+
+# List column -> (mask column, vocabulary, mask dtype)
+MASK_COLUMNS: Dict[str, Tuple[str, Tuple[str, ...], type]] = {
+    'product_holdings': ('product_holdings_mask', PRODUCTS, np.uint8),
+    'primary_interests': ('primary_interests_mask', INTERESTS, np.uint16),
+    'preferred_channels': ('preferred_channels_mask', CHANNELS, np.uint8)
+}
+
+# Column -> category vocabulary
+CATEGORICAL_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'customer_segment': SEGMENTS,
+    'occupation': OCCUPATIONS,
+    'digital_engagement': ENGAGEMENT_LEVELS,
+    'life_stage': LIFE_STAGES,
+    'gender': GENDERS
+}
+
+# Columns drawn from a pool of strings that is not fixed here (cities, recent
+# dates); stored as categoricals whose categories come from the data
+POOLED_COLUMNS = ('location', 'last_interaction')
+
+
+@lru_cache(maxsize=None)
+def vocabulary_items(vocabulary: Tuple[str, ...]) -> np.ndarray:
+    """Lookup table from item bitmask to the tuple of selected vocabulary items
+
+    The table is shared process-wide, so its cells are immutable tuples that
+    can be handed to many rows without one caller's change leaking into others.
+    """
+    table = np.empty(1 << len(vocabulary), dtype=object)
+    for mask in range(len(table)):
+        table[mask] = tuple(item for bit, item in enumerate(vocabulary) if mask >> bit & 1)
+    return table
+
+
+@lru_cache(maxsize=None)
+def _popcount_table(bits: int) -> np.ndarray:
+    """Lookup table from bitmask to number of set bits"""
+    return np.array([bin(mask).count('1') for mask in range(1 << bits)], dtype=np.uint8)
+
+
+def selection_to_masks(selected: np.ndarray, dtype: type = np.uint16) -> np.ndarray:
+    """Pack a boolean (rows x items) selection matrix into one bitmask per row"""
+    weights = np.left_shift(1, np.arange(selected.shape[1], dtype=np.int64))
+    return (selected.astype(np.int64) @ weights).astype(dtype)
+
+
+@lru_cache(maxsize=None)
+def _item_bits(vocabulary: Tuple[str, ...]) -> Dict[str, int]:
+    """Map each vocabulary item to its bit"""
+    return {item: 1 << bit for bit, item in enumerate(vocabulary)}
+
+
+def encode_items(items: Any, vocabulary: Tuple[str, ...]) -> int:
+    """Encode an iterable of vocabulary items as a bitmask"""
+    bits = _item_bits(vocabulary)
+    mask = 0
+    for item in items:
+        mask |= bits[item]
+    return mask
+
+
+def decode_mask(mask: int, vocabulary: Tuple[str, ...]) -> List[str]:
+    """Decode a bitmask into a new list of vocabulary items"""
+    return list(vocabulary_items(vocabulary)[int(mask)])
+
+
+def count_mask(masks: Any, bits: int = 16) -> Any:
+    """Number of selected items in a bitmask or array of bitmasks"""
+    if np.ndim(masks) == 0:
+        return int(_popcount_table(bits)[int(masks)])
+    return _popcount_table(bits)[np.asarray(masks, dtype=np.int64)]
+
+
+def encode_compact(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a list-based customer DataFrame to the compact representation
+
+    Args:
+        data (pd.DataFrame): Customer data as produced by ``generate_synthetic_data``
+
+    Returns:
+        pd.DataFrame: New frame with list columns replaced in place by ``*_mask``
+        columns and categorical dtypes for low-cardinality and pooled string columns
+    """
+    columns = {}
+    for column, values in data.items():
+        if column in MASK_COLUMNS:
+            mask_column, vocabulary, dtype = MASK_COLUMNS[column]
+            columns[mask_column] = np.fromiter(
+                (encode_items(items, vocabulary) for items in values),
+                dtype=dtype,
+                count=len(values)
+            )
+        elif column in CATEGORICAL_COLUMNS:
+            columns[column] = pd.Categorical(values, categories=CATEGORICAL_COLUMNS[column])
+        elif column in POOLED_COLUMNS:
+            columns[column] = pd.Categorical(values)
+        else:
+            columns[column] = values.array
+    return pd.DataFrame(columns, index=data.index)
+
+
+def decode_compact(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a compact customer DataFrame back to list columns and plain strings
+
+    Args:
+        data (pd.DataFrame): Customer data produced by ``encode_compact``
+
+    Returns:
+        pd.DataFrame: New frame with ``*_mask`` columns expanded into item tuples
+        and categoricals turned back into Arrow-backed strings
+    """
+    list_columns = {mask_column: (column, vocabulary)
+                    for column, (mask_column, vocabulary, _) in MASK_COLUMNS.items()}
+    columns = {}
+    for column, values in data.items():
+        if column in list_columns:
+            name, vocabulary = list_columns[column]
+            columns[name] = vocabulary_items(vocabulary)[values.to_numpy(np.int64)]
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            columns[column] = values.astype(pd.StringDtype('pyarrow')).array
+        else:
+            columns[column] = values.array
+    return pd.DataFrame(columns, index=data.index)
+
+
+def _items(customer_data: Mapping[str, Any], column: str) -> List[str]:
+    mask_column, vocabulary, _ = MASK_COLUMNS[column]
+    if mask_column in customer_data:
+        return decode_mask(customer_data[mask_column], vocabulary)
+    return list(customer_data[column])
+
+
+def get_products(customer_data: Mapping[str, Any]) -> List[str]:
+    """Products held by a customer row in either representation"""
+    return _items(customer_data, 'product_holdings')
+
+
+def get_interests(customer_data: Mapping[str, Any]) -> List[str]:
+    """Interests of a customer row in either representation"""
+    return _items(customer_data, 'primary_interests')
+
+
+def get_channels(customer_data: Mapping[str, Any]) -> List[str]:
+    """Preferred channels of a customer row in either representation"""
+    return _items(customer_data, 'preferred_channels')
+
+
+def get_product_count(customer_data: Mapping[str, Any]) -> int:
+    """Number of products held, without building a list for compact rows"""
+    if 'product_holdings_mask' in customer_data:
+        return count_mask(customer_data['product_holdings_mask'])
+    return len(customer_data['product_holdings'])
+
+
+def has_product(customer_data: Mapping[str, Any], product: str) -> bool:
+    """Whether a customer row holds a product, without building a list for compact rows"""
+    if 'product_holdings_mask' in customer_data:
+        return bool(int(customer_data['product_holdings_mask']) >> PRODUCTS.index(product) & 1)
+    return product in customer_data['product_holdings']
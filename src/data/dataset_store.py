@@ -0,0 +1,185 @@
+"""
+Persistent on-disk store for generated customer datasets
+
+Datasets are kept as uncompressed Arrow IPC (Feather) files in the compact
+representation from ``data.compact``, so reloading one is a memory-mapped
+read rather than a regeneration. Files live under a directory named after
+the generator fingerprint, which changes whenever the generator code or
+``GENERATOR_VERSION`` changes, so stale datasets are never served.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from config.settings import CACHE_SETTINGS
+from core.reporting import get_reporter
+from data import compact, synthetic_data
+from data.compact import decode_compact, encode_compact
+from data.synthetic_data import GENERATOR_VERSION, generate_synthetic_data
+
+
+@lru_cache(maxsize=None)
+def generator_fingerprint() -> str:
+    """
+    Short hash of the generator version and the source of the modules that shape its output
+
+    Computed once per process; the Streamlit app builds a store on every rerun.
+    """
+    digest = hashlib.sha256(GENERATOR_VERSION.encode('utf-8'))
+    for module in (synthetic_data, compact):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class DatasetStore:
+    """Feather-backed dataset cache keyed by (num_records, seed, workers, generator version)"""
+
+    def __init__(self, root: Optional[str] = None, version: Optional[str] = None):
+        """
+        Args:
+            root (Optional[str]): Store directory, defaults to CACHE_SETTINGS['dataset_dir']
+            version (Optional[str]): Generator version, defaults to ``generator_fingerprint()``
+        """
+        self.root = Path(root or CACHE_SETTINGS['dataset_dir'])
+        self.version = version or generator_fingerprint()
+
+    @property
+    def directory(self) -> Path:
+        """Directory holding datasets for the current generator version"""
+        return self.root / self.version
+
+    def path_for(self, num_records: int, seed: int, workers: int = 1) -> Path:
+        """
+        File path for a dataset with the given generation parameters
+
+        Raises:
+            ValueError: If ``seed`` is None; a randomly seeded dataset is not reproducible
+        """
+        if seed is None:
+            raise ValueError("The dataset store needs an integer seed")
+        return self.directory / f"records-{num_records}_seed-{seed}_workers-{workers}.feather"
+
+    def load(self, num_records: int, seed: int, workers: int = 1,
+             compact_form: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Load a stored dataset, memory-mapping the file
+
+        Args:
+            num_records (int): Number of records the dataset was generated with
+            seed (int): Seed the dataset was generated with
+            workers (int): Worker count the dataset was generated with
+            compact_form (bool): Return the compact representation as stored,
+                skipping the list-column decode
+
+        Returns:
+            Optional[pd.DataFrame]: Stored dataset or None if it is not in the store
+        """
+        from pyarrow import feather
+
+        path = self.path_for(num_records, seed, workers)
+        if not path.exists():
+            return None
+
+        try:
+            data = feather.read_table(str(path), memory_map=True).to_pandas()
+        except Exception:
+            # Unreadable or partially written entry, drop it and treat as a miss
+            path.unlink(missing_ok=True)
+            return None
+
+        return data if compact_form else decode_compact(data)
+
+    def save(self, data: pd.DataFrame, num_records: int, seed: int, workers: int = 1) -> Path:
+        """
+        Store a dataset atomically in the compact representation
+
+        Args:
+            data (pd.DataFrame): Dataset in either representation
+            num_records (int): Number of records the dataset was generated with
+            seed (int): Seed the dataset was generated with
+            workers (int): Worker count the dataset was generated with
+
+        Returns:
+            Path: Path of the stored file
+        """
+        import pyarrow as pa
+        from pyarrow import feather
+
+        if 'product_holdings' in data.columns:
+            data = encode_compact(data)
+
+        path = self.path_for(num_records, seed, workers)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        os.close(fd)
+        try:
+            feather.write_feather(pa.Table.from_pandas(data, preserve_index=False), tmp_path,
+                                  compression='uncompressed')
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return path
+
+    def get_or_generate(self, num_records: int, seed: Optional[int], workers: int = 1,
+                        compact_form: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Load a dataset from the store, generating and storing it on a miss
+
+        With ``seed=None`` the dataset is random, so it is generated without
+        touching the store.
+
+        Args:
+            num_records (int): Number of records to generate
+            seed (Optional[int]): Seed for reproducible generation
+            workers (int): Number of worker processes used on a miss
+            compact_form (bool): Return the compact representation
+
+        Returns:
+            Optional[pd.DataFrame]: Dataset or None if generation fails
+        """
+        if seed is None:
+            return generate_synthetic_data(num_records, workers=workers, compact=compact_form)
+
+        data = self.load(num_records, seed, workers, compact_form=compact_form)
+        if data is not None:
+            return data
+
+        data = generate_synthetic_data(num_records, seed=seed, workers=workers, compact=True)
+        if data is None:
+            return None
+
+        try:
+            self.save(data, num_records, seed, workers)
+        except Exception as e:
+            get_reporter().error(f"Error saving dataset to cache: {str(e)}")
+
+        return data if compact_form else decode_compact(data)
+
+    def invalidate(self, all_versions: bool = False) -> int:
+        """
+        Remove stored datasets
+
+        Args:
+            all_versions (bool): Also remove datasets of the current generator version
+
+        Returns:
+            int: Number of version directories removed
+        """
+        if not self.root.exists():
+            return 0
+
+        removed = 0
+        for directory in self.root.iterdir():
+            if directory.is_dir() and (all_versions or directory.name != self.version):
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+        return removed
@@ -2,47 +2,118 @@ import pandas as pd
 import numpy as np
 from faker import Faker
 import random
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Sequence
+from functools import lru_cache
+from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-import streamlit as st
 from config.settings import DATA_SETTINGS
+from core.reporting import get_reporter
+from data.compact import (
+    PRODUCTS,
+    INTERESTS,
+    CHANNELS,
+    LIFE_STAGES,
+    OCCUPATIONS,
+    SEGMENTS,
+    ENGAGEMENT_LEVELS,
+    GENDERS,
+    MASK_COLUMNS,
+    selection_to_masks,
+    vocabulary_items
+)
+
+# Bump when a change alters generated data without touching this module's source
+GENERATOR_VERSION = '2'
+
+# Faker is only needed for the per-row path and the city pool, so create it on demand
+_fake: Optional[Faker] = None
+
+
+def _get_faker() -> Faker:
+    """Return the shared Faker instance, creating it on first use"""
+    global _fake
+    if _fake is None:
+        _fake = Faker()
+    return _fake
+
+
+@lru_cache(maxsize=None)
+def _city_pool(size: int) -> np.ndarray:
+    """Precomputed pool of Faker city names, identical in every process"""
+    fake = Faker()
+    fake.seed_instance(0)
+    return np.array([fake.city() for _ in range(size)], dtype=object)
+
+
+@lru_cache(maxsize=None)
+def _city_categories(size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct names of the city pool and the category code of each pool entry"""
+    return np.unique(_city_pool(size).astype(str), return_inverse=True)
+
+
+def _uuid4_strings(rng: np.random.Generator, n: int) -> pd.api.extensions.ExtensionArray:
+    """Build ``n`` random version-4 UUID strings from one bulk draw of random bytes
+
+    The strings are laid out as one fixed-width ASCII buffer and wrapped as an
+    Arrow string array without creating a Python object per row.
+    """
+    import pyarrow as pa
+
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+
+    hex_chars = np.frombuffer(raw.tobytes().hex().encode('ascii'), dtype=np.uint8).reshape(n, 32)
+    formatted = np.full((n, 36), ord('-'), dtype=np.uint8)
+    for start, end, offset in ((0, 8, 0), (8, 12, 1), (12, 16, 2), (16, 20, 3), (20, 32, 4)):
+        formatted[:, start + offset:end + offset] = hex_chars[:, start:end]
+    offsets = np.arange(0, 36 * (n + 1), 36, dtype=np.int64)
+    strings = pa.LargeStringArray.from_buffers(n, pa.py_buffer(offsets), pa.py_buffer(formatted))
+    return pd.arrays.ArrowStringArray(strings)
+
+
+@lru_cache(maxsize=None)
+def _subset_masks(size: int, count: int) -> np.ndarray:
+    """Bitmasks of every ``count``-item subset of ``size`` items"""
+    return np.array([sum(1 << bit for bit in subset) for subset in combinations(range(size), count)],
+                    dtype=np.int64)
 
-# Initialize Faker
-fake = Faker()
+
+def _take_strings(values: Sequence[str], codes: np.ndarray) -> pd.api.extensions.ExtensionArray:
+    """Arrow string array of ``values[codes]``, gathered without Python objects per row"""
+    import pyarrow as pa
+
+    return pd.arrays.ArrowStringArray(pa.array(values, type=pa.large_string()).take(codes))
 
 
 class CustomerDataGenerator:
-    def __init__(self):
-        """Initialize data generation parameters"""
-        self.interests = [
-            'Travel', 'Investment', 'Shopping', 'Technology', 'Education',
-            'Real Estate', 'Luxury', 'Family', 'Retirement', 'Small Business',
-            'International Banking', 'Cryptocurrency', 'Sustainable Banking',
-            'Health & Insurance', 'Arts & Culture'
-        ]
-
-        self.channels = [
-            'Email', 'SMS', 'Mobile App', 'Web', 'Social Media',
-            'Push Notification', 'Branch Visit', 'Phone Banking'
-        ]
-
-        self.life_stages = [
-            'Student', 'Young Professional', 'Family Builder',
-            'Mid-Career', 'Pre-retirement', 'Retired'
-        ]
-
-        self.occupations = [
-            'Software Engineer', 'Doctor', 'Teacher', 'Business Owner',
-            'Sales Manager', 'Financial Analyst', 'Marketing Manager',
-            'Lawyer', 'Architect', 'Consultant', 'Engineer', 'Professor',
-            'Small Business Owner', 'Executive', 'Freelancer'
-        ]
-
-        self.products = [
-            'Savings Account', 'Checking Account', 'Credit Card',
-            'Investment Account', 'Mortgage', 'Personal Loan',
-            'Insurance', 'Business Account'
-        ]
+    def __init__(self, seed: Optional[int] = None):
+        """Initialize data generation parameters
+
+        Args:
+            seed (Optional[int]): Seed for the columnar engine's NumPy generator
+        """
+        self.interests = list(INTERESTS)
+        self.channels = list(CHANNELS)
+        self.life_stages = list(LIFE_STAGES)
+        self.occupations = list(OCCUPATIONS)
+        self.products = list(PRODUCTS)
+
+        self.occupation_multipliers = {
+            'Software Engineer': 1.4,
+            'Doctor': 1.8,
+            'Business Owner': 1.6,
+            'Financial Analyst': 1.3,
+            'Lawyer': 1.7,
+            'Executive': 2.0,
+            'Professor': 1.3,
+            'Teacher': 0.9,
+            'Freelancer': 0.8
+        }
+
+        # NumPy generator used by the columnar engine
+        self.rng = np.random.default_rng(seed)
 
     def _generate_income(self, age: int, occupation: str) -> float:
         """Generate realistic income based on age and occupation"""
@@ -62,19 +133,7 @@ class CustomerDataGenerator:
             age_multiplier = 1.4
 
         # Occupation multiplier
-        occupation_multipliers = {
-            'Software Engineer': 1.4,
-            'Doctor': 1.8,
-            'Business Owner': 1.6,
-            'Financial Analyst': 1.3,
-            'Lawyer': 1.7,
-            'Executive': 2.0,
-            'Professor': 1.3,
-            'Teacher': 0.9,
-            'Freelancer': 0.8
-        }
-
-        occupation_multiplier = occupation_multipliers.get(occupation, 1.0)
+        occupation_multiplier = self.occupation_multipliers.get(occupation, 1.0)
 
         return round(base_income * age_multiplier * occupation_multiplier, -3)
 
@@ -174,10 +233,10 @@ class CustomerDataGenerator:
             'Medium' if transaction_patterns['online_transactions_ratio'] > 0.4 else 'Low'
 
         customer = {
-            'customer_id': fake.uuid4(),
+            'customer_id': _get_faker().uuid4(),
             'age': age,
             'gender': random.choice(['M', 'F']),
-            'location': fake.city(),
+            'location': _get_faker().city(),
             'income': income,
             'occupation': occupation,
             'life_stage': self._determine_life_stage(age),
@@ -199,48 +258,302 @@ class CustomerDataGenerator:
 
         return customer
 
-    def generate_dataset(self, num_records: int) -> pd.DataFrame:
-        """Generate a dataset with specified number of records"""
+    def _sample_subsets(self, eligible: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Pick ``counts[i]`` random eligible items per row, returned as a boolean matrix"""
+        keys = self.rng.random(eligible.shape)
+        keys[~eligible] = 2.0  # ineligible items always sort last
+        # An item is picked when its key is within the row's ``counts`` smallest keys
+        thresholds = np.sort(keys, axis=1)[np.arange(len(keys)), np.maximum(counts - 1, 0)]
+        return (keys <= thresholds[:, None]) & (counts > 0)[:, None]
+
+    def _sample_masks(self, size: int, counts: np.ndarray, dtype: type) -> np.ndarray:
+        """Pick ``counts[i]`` random items out of ``size`` per row, returned as bitmasks
+
+        Each row draws one index into the table of all subsets of its size,
+        which is uniform over subsets like ``random.sample`` and needs no
+        per-item work.
+        """
+        masks = np.zeros(len(counts), dtype=dtype)
+        for count in range(int(counts.min()), int(counts.max()) + 1):
+            rows = np.flatnonzero(counts == count)
+            table = _subset_masks(size, count)
+            masks[rows] = table[self.rng.integers(0, len(table), size=len(rows))]
+        return masks
+
+    def generate_columns(self, num_records: int, compact: bool = False) -> Dict[str, Any]:
+        """Generate every customer column for all records at once
+
+        Applies the same rules as ``generate_customer`` as array operations
+        driven by ``self.rng``. Customer IDs are built from random bytes and
+        cities are sampled from a precomputed Faker pool instead of calling
+        Faker per row. String columns are Arrow-backed, so no column holds a
+        Python string per row.
+
+        Args:
+            num_records (int): Number of records to generate
+            compact (bool): Emit ``*_mask`` bitmask columns and categoricals
+                (see ``data.compact``) instead of item tuples and strings
+
+        Returns:
+            Dict[str, Any]: Column name to values, in ``generate_customer`` order
+        """
+        rng = self.rng
+        n = num_records
+        city_pool = _city_pool(DATA_SETTINGS['city_pool_size'])
+
+        age = rng.integers(18, 76, size=n)
+        occupation_idx = rng.integers(0, len(self.occupations), size=n)
+
+        # Income: base * age multiplier * occupation multiplier
+        age_multipliers = np.array([0.7, 1.0, 1.3, 1.5, 1.4])
+        age_multiplier = age_multipliers[np.searchsorted([25, 35, 45, 55], age, side='right')]
+        occupation_multiplier = np.array(
+            [self.occupation_multipliers.get(o, 1.0) for o in self.occupations]
+        )[occupation_idx]
+        income = np.round(rng.uniform(30000, 80000, size=n) * age_multiplier * occupation_multiplier, -3)
+
+        relationship_tenure = np.minimum(rng.integers(0, 21, size=n), age - 18)
+
+        # Product holdings, columns follow self.products
+        holdings = np.zeros((n, len(self.products)), dtype=bool)
+        holdings[:, 0] = True  # Savings Account
+        holdings[:, 1] = True  # Checking Account
+        holdings[:, 2] = income > 30000  # Credit Card
+        additional = np.column_stack([
+            (income > 80000) | (age > 35),  # Investment Account
+            (age > 30) & (income > 60000),  # Mortgage
+            age > 25,  # Insurance
+            rng.random(n) < 0.2  # Business Account
+        ])
+        num_eligible = additional.sum(axis=1)
+        num_additional = np.floor(rng.random(n) * (num_eligible + 1)).astype(np.int64)
+        holdings[:, [3, 4, 6, 7]] = self._sample_subsets(additional, num_additional)
+        num_products = holdings.sum(axis=1)
+
+        interests = self._sample_masks(len(self.interests), rng.integers(2, 6, size=n),
+                                       MASK_COLUMNS['primary_interests'][2])
+        channels = self._sample_masks(len(self.channels), rng.integers(2, 5, size=n),
+                                      MASK_COLUMNS['preferred_channels'][2])
+
+        # Transaction patterns and derived engagement
+        transaction_frequency = rng.integers(5, 31, size=n)
+        average_transaction = np.round(rng.uniform(50, 5000, size=n), 2)
+        online_ratio = rng.uniform(0.3, 0.9, size=n)
+        international_ratio = rng.uniform(0, 0.3, size=n)
+        engagement_codes = (online_ratio > 0.4).astype(np.int64) + (online_ratio > 0.7)
+
+        # Segment points: income + capped product count + capped tenure
+        points = ((income > 50000).astype(np.int64) + (income > 80000) + (income > 150000) +
+                  np.minimum(num_products, 4) + np.minimum(relationship_tenure // 2, 3))
+        segment_codes = (points >= 4).astype(np.int64) + (points >= 7)
+
+        life_stage_codes = np.searchsorted([22, 30, 40, 50, 65], age, side='left')
+
+        city_idx = rng.integers(0, len(city_pool), size=n)
+        if compact:
+            cities, pool_codes = _city_categories(len(city_pool))
+            location = pd.Categorical.from_codes(pool_codes[city_idx], categories=cities)
+        else:
+            location = _take_strings(city_pool, city_idx)
+
+        today = datetime.now()
+        interaction_dates = [(today - timedelta(days=d)).strftime('%Y-%m-%d') for d in range(91)]
+
+        def categorical(codes: np.ndarray, categories: Sequence[str]) -> Any:
+            if compact:
+                return pd.Categorical.from_codes(codes, categories=categories)
+            return _take_strings(categories, codes)
+
+        def items(column: str, masks: np.ndarray) -> Tuple[str, np.ndarray]:
+            mask_column, vocabulary, _ = MASK_COLUMNS[column]
+            if compact:
+                return mask_column, masks
+            return column, vocabulary_items(vocabulary)[masks.astype(np.int64)]
+
+        columns = {
+            'customer_id': _uuid4_strings(rng, n),
+            'age': age,
+            'gender': categorical(rng.integers(0, 2, size=n), GENDERS),
+            'location': location,
+            'income': income,
+            'occupation': categorical(occupation_idx, OCCUPATIONS),
+            'life_stage': categorical(life_stage_codes, LIFE_STAGES),
+            'customer_segment': categorical(segment_codes, SEGMENTS),
+            'relationship_tenure': relationship_tenure
+        }
+        columns.update([items('product_holdings',
+                              selection_to_masks(holdings, MASK_COLUMNS['product_holdings'][2]))])
+        columns['num_products'] = num_products
+        columns.update([items('primary_interests', interests),
+                        items('preferred_channels', channels)])
+        columns.update({
+            'digital_engagement': categorical(engagement_codes, ENGAGEMENT_LEVELS),
+            'transaction_frequency': transaction_frequency,
+            'average_transaction': average_transaction,
+            'online_transaction_ratio': online_ratio,
+            'international_transaction_ratio': international_ratio,
+            'credit_score': rng.integers(300, 851, size=n),
+            'last_interaction': categorical(rng.integers(0, 91, size=n), interaction_dates),
+            'satisfaction_score': rng.integers(1, 101, size=n)
+        })
+
+        return columns
+
+    def generate_dataset(self, num_records: int, columnar: bool = True,
+                         compact: bool = False) -> pd.DataFrame:
+        """Generate a dataset with specified number of records
+
+        Args:
+            num_records (int): Number of records to generate
+            columnar (bool): Use the vectorized column engine instead of
+                building one ``generate_customer`` dict per row
+            compact (bool): Use the compact bitmask/categorical representation
+                (columnar engine only)
+        """
+        if columnar:
+            return pd.DataFrame(self.generate_columns(num_records, compact=compact))
+        if compact:
+            raise ValueError("compact output requires the columnar engine")
         customers = [self.generate_customer() for _ in range(num_records)]
         return pd.DataFrame(customers)
 
+    def iter_dataset(self, num_records: int, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Yield the dataset as DataFrames of at most ``chunk_size`` rows
+
+        Only one chunk is held at a time, so memory stays bounded by
+        ``chunk_size`` whatever ``num_records`` is.
+        """
+        for start in range(0, num_records, chunk_size):
+            yield self.generate_dataset(min(chunk_size, num_records - start))
+
+
+def _add_derived_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Add engagement and churn scores derived from the base columns"""
+    data['engagement_score'] = (data['transaction_frequency'] * 0.3 +
+                                data['num_products'] * 0.3 +
+                                data['satisfaction_score'] * 0.4)
+
+    data['churn_risk'] = 100 - data['engagement_score']
 
-def init_session_state():
-    """Initialize session state variables"""
-    if 'initialized' not in st.session_state:
-        st.session_state.initialized = True
-        st.session_state.customer_data = None
-        st.session_state.api_tested = False
+    return data
 
 
-def generate_synthetic_data(num_records: int = 100) -> Optional[pd.DataFrame]:
+def _generate_shard(num_records: int, seed: np.random.SeedSequence,
+                    compact: bool = False) -> pd.DataFrame:
+    """Generate one shard of customers (runs inside a worker process)"""
+    return CustomerDataGenerator(seed=seed).generate_dataset(num_records, compact=compact)
+
+
+def _shard_sizes(num_records: int, shards: int) -> List[int]:
+    """Split a row count into near-equal shard sizes"""
+    base, remainder = divmod(num_records, shards)
+    return [base + (1 if i < remainder else 0) for i in range(shards)]
+
+
+def generate_synthetic_data(num_records: int = 100,
+                            seed: Optional[int] = None,
+                            workers: int = 1,
+                            compact: bool = False) -> Optional[pd.DataFrame]:
     """
     Generate synthetic customer data
 
+    Rows are split into one shard per worker, each seeded from
+    ``SeedSequence(seed).spawn(workers)``, so a given
+    (num_records, seed, workers) always produces the same data.
+
     Args:
         num_records (int): Number of records to generate
+        seed (Optional[int]): Base seed; None draws fresh entropy
+        workers (int): Number of worker processes to generate shards in
+        compact (bool): Return the ``data.compact`` bitmask/categorical representation
 
     Returns:
         Optional[pd.DataFrame]: Generated customer data or None if generation fails
     """
     try:
-        if num_records < DATA_SETTINGS['min_records'] or num_records > DATA_SETTINGS['max_records']:
-            st.error(f"Number of records must be between {DATA_SETTINGS['min_records']} "
-                     f"and {DATA_SETTINGS['max_records']}")
+        if (num_records < DATA_SETTINGS['min_records'] or
+                num_records > DATA_SETTINGS['max_generated_records']):
+            get_reporter().error(f"Number of records must be between {DATA_SETTINGS['min_records']} "
+                     f"and {DATA_SETTINGS['max_generated_records']}")
             return None
 
-        generator = CustomerDataGenerator()
-        data = generator.generate_dataset(num_records)
+        workers = max(1, min(workers, num_records))
+        shard_seeds = np.random.SeedSequence(seed).spawn(workers)
+        shard_sizes = _shard_sizes(num_records, workers)
+
+        if workers == 1:
+            data = _generate_shard(shard_sizes[0], shard_seeds[0], compact)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                shards = list(executor.map(_generate_shard, shard_sizes, shard_seeds,
+                                           [compact] * workers))
+            data = pd.concat(shards, ignore_index=True)
+
+        return _add_derived_columns(data)
 
-        # Add some random correlations and patterns
-        data['engagement_score'] = (data['transaction_frequency'] * 0.3 +
-                                    data['num_products'] * 0.3 +
-                                    data['satisfaction_score'] * 0.4)
+    except Exception as e:
+        get_reporter().error(f"Error generating synthetic data: {str(e)}")
+        return None
+
+
+def generate_synthetic_chunks(num_records: int,
+                              chunk_size: Optional[int] = None,
+                              seed: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream synthetic customer data as fixed-size DataFrame chunks
+
+    Args:
+        num_records (int): Total number of records to generate
+        chunk_size (Optional[int]): Rows per chunk, defaults to DATA_SETTINGS['chunk_size']
+        seed (Optional[int]): Seed for reproducible output
+
+    Yields:
+        pd.DataFrame: Chunks with the same columns as ``generate_synthetic_data``
+    """
+    chunk_size = chunk_size or DATA_SETTINGS['chunk_size']
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
 
-        data['churn_risk'] = 100 - data['engagement_score']
+    generator = CustomerDataGenerator(seed=seed)
+    for chunk in generator.iter_dataset(num_records, chunk_size):
+        yield _add_derived_columns(chunk)
 
-        return data
+
+def write_synthetic_parquet(path: str,
+                            num_records: int,
+                            chunk_size: Optional[int] = None,
+                            seed: Optional[int] = None,
+                            partition_cols: Sequence[str] = ('customer_segment',)) -> Optional[int]:
+    """
+    Write synthetic customer data to a partitioned Parquet dataset chunk by chunk
+
+    Args:
+        path (str): Root directory of the Parquet dataset
+        num_records (int): Total number of records to generate
+        chunk_size (Optional[int]): Rows generated and written per step
+        seed (Optional[int]): Seed for reproducible output
+        partition_cols (Sequence[str]): Columns to partition the dataset by
+
+    Returns:
+        Optional[int]: Number of rows written or None if writing fails
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows_written = 0
+        for index, chunk in enumerate(generate_synthetic_chunks(num_records, chunk_size, seed)):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            pq.write_to_dataset(
+                table,
+                root_path=path,
+                partition_cols=list(partition_cols),
+                basename_template=f"part-{index:05d}-{{i}}.parquet"
+            )
+            rows_written += len(chunk)
+
+        return rows_written
 
     except Exception as e:
-        st.error(f"Error generating synthetic data: {str(e)}")
-        return None
\ No newline at end of file
+        get_reporter().error(f"Error writing synthetic data: {str(e)}")
+        return None
@@ -23,11 +23,12 @@ from ui.components import (
 )
 
 # Import utilities
-from utils.api_utils import initialize_anthropic, test_api_connection, make_api_call
+from utils.api_utils import test_api_connection, make_api_call
 from utils.cache_utils import async_cache_data
 
 # Import data and models
-from data.synthetic_data import generate_synthetic_data, init_session_state
+from data.synthetic_data import generate_synthetic_data
+from data.dataset_store import DatasetStore
 from models.campaign_generator import generate_campaign, estimate_campaign_performance
 from models.customer_insights import create_customer_insights
 
@@ -46,20 +47,29 @@ from config.brand_guidelines import (
 )
 
 # Import other utilities
-from utils.api_utils import initialize_anthropic, test_api_connection, make_api_call
-from data.synthetic_data import generate_synthetic_data, init_session_state
+from utils.api_utils import test_api_connection, make_api_call
+from data.synthetic_data import generate_synthetic_data
 from models.campaign_generator import generate_campaign, estimate_campaign_performance
 from models.customer_insights import create_customer_insights
+from models.prompt_compiler import get_prompt_compiler
+from ui.streamlit_adapter import init_session_state, install as install_streamlit_adapter
 from config.settings import load_config, DATA_SETTINGS
 from config.brand_guidelines import BRAND_GUIDELINES
 # Add this import at the top
-from utils.cache_utils import async_cache_data
-
-
-# Cache data generation
-@async_cache_data(ttl=3600)
+from utils.cache_utils import async_cache_data, get_cache_stats, get_inflight_stats
+from utils.response_cache import get_response_cache
+from utils.rate_limit import get_rate_limiter, get_concurrency_limiter
+from utils.api_utils import get_inflight_call_stats
+from utils.resilience import get_circuit_breaker, get_resilience_metrics
+from utils.hedging import get_hedger
+from utils.token_ledger import get_token_ledger
+from utils.client_pool import client_pool_stats
+
+
+# Cache data generation, backed by the on-disk dataset store
+@async_cache_data(ttl=3600, shared=True)
 def get_cached_data(num_records: int) -> Optional[pd.DataFrame]:
-    return generate_synthetic_data(num_records)
+    return DatasetStore().get_or_generate(num_records, seed=DATA_SETTINGS['default_seed'])
 
 @async_cache_data(ttl=3600)
 def get_cached_insights(customer_data_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -71,6 +81,7 @@ def initialize_app() -> Optional[Dict[str, Any]]:
     """Initialize the Streamlit application"""
     try:
         initialize_page()
+        install_streamlit_adapter()
         config = load_config()
         init_session_state()
         return config
@@ -81,12 +92,25 @@ def initialize_app() -> Optional[Dict[str, Any]]:
 
 def show_debug_info():
     """Display debug information with unique key"""
+    response_cache = get_response_cache()
     with st.sidebar.expander("Debug Information", expanded=False):
         st.json({
             'timestamp': datetime.now().isoformat(),
             'streamlit_version': st.__version__,
             'api_initialized': st.session_state.get('api_tested', False),
-            'data_loaded': st.session_state.get('customer_data') is not None
+            'data_loaded': st.session_state.get('customer_data') is not None,
+            'cache': get_cache_stats(),
+            'response_cache': response_cache.stats().to_dict() if response_cache else None,
+            'rate_limiter': get_rate_limiter().stats(),
+            'concurrency_limiter': get_concurrency_limiter().stats(),
+            'resilience': get_resilience_metrics().to_dict(),
+            'circuit_breaker': get_circuit_breaker().stats(),
+            'hedging': get_hedger().stats(),
+            'connection_pool': client_pool_stats(),
+            'coalesced_api_calls': get_inflight_call_stats(),
+            'coalesced_cache_misses': get_inflight_stats(),
+            'prompt_compiler': get_prompt_compiler().stats(),
+            'tokens': get_token_ledger().stats()
         })
 
 
@@ -219,6 +243,11 @@ def main():
 
                 customer_data = filtered_data.iloc[selected_index]
 
+                force_regenerate = st.checkbox(
+                    "Force regeneration (skip cached campaigns)",
+                    key="force_regenerate_checkbox"
+                )
+
                 if st.button("Generate Campaign", key="generate_campaign_button"):
                     try:
                         with st.spinner("Generating campaign..."):
@@ -229,12 +258,17 @@ def main():
                                 # Display customer profile
                                 display_customer_profile(customer_data, insights)
 
-                                # Generate campaign
-                                campaign_content = generate_campaign(customer_data.to_dict())
+                                # Generate campaign, showing its messages as they stream in
+                                campaign_content = display_campaign_content(
+                                    lambda on_field: generate_campaign(
+                                        customer_data.to_dict(),
+                                        force_regenerate=force_regenerate,
+                                        on_field=on_field
+                                    ),
+                                    customer_data
+                                )
 
                                 if campaign_content:
-                                    # Display campaign content
-                                    display_campaign_content(campaign_content, customer_data)
                                     display_campaign_preview(campaign_content, customer_data)
 
                                     # Calculate and display metrics
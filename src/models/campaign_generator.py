@@ -1,28 +1,35 @@
-import streamlit as st
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Iterable, Iterator, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+import threading
+import time
 import json
+from collections import ChainMap
 from datetime import datetime
 import random
-import pandas as pd
 import numpy as np
-import re
-from utils.api_utils import make_api_call
-from config.brand_guidelines import (
-    BRAND_GUIDELINES,
-    get_segment_guidelines,
-    get_visual_style,
-    get_tone_guidelines,
-    get_message_style,
-    get_channel_recommendations,
-    get_brand_colors,
-    get_legal_disclaimer
-)
+import pandas as pd
+from utils.api_utils import (make_api_call, discard_cached_response, build_complete_prompt,
+                             estimate_prompt_tokens, system_prompt)
+from utils.client_pool import get_client
+from utils.token_ledger import estimate_joined_tokens, get_token_ledger
+from utils.rate_limit import reset_limiters
+from utils.json_utils import IncrementalJSONParser, extract_json
+from utils.cache_utils import async_cache_data
+from config.settings import API_SETTINGS
+from models.campaign_models import CampaignResult
+from models.campaign_validator import ValidationIssue, validate_campaign
+from models.prompt_compiler import (CAMPAIGN_REQUIREMENTS, brand_guidelines_section, campaign_example,
+                                    persona_details, get_prompt_compiler)
+from data.compact import get_product_count, get_interests, get_channels
+from config.brand_guidelines import BRAND_GUIDELINES, get_legal_disclaimer
+from core.reporting import get_reporter
 
 
 def format_persona(customer_data: Dict[str, Any]) -> Dict[str, Any]:
     """Format customer data into a structured persona"""
     try:
         persona = {
+            'customer_id': customer_data.get('customer_id'),
             'demographic': {
                 'age': int(customer_data['age']),
                 'gender': str(customer_data['gender']),
@@ -36,18 +43,18 @@ def format_persona(customer_data: Dict[str, Any]) -> Dict[str, Any]:
                 'average_transaction': float(customer_data['average_transaction']),
                 'digital_engagement': str(customer_data['digital_engagement']),
                 'customer_segment': str(customer_data['customer_segment']),
-                'product_holdings': len(customer_data['product_holdings']),
+                'product_holdings': get_product_count(customer_data),
                 'relationship_tenure': customer_data.get('relationship_tenure', 1)
             },
             'psychographic': {
-                'interests': customer_data['primary_interests'],
-                'preferred_channels': customer_data['preferred_channels']
+                'interests': get_interests(customer_data),
+                'preferred_channels': get_channels(customer_data)
             }
         }
         return persona
     except Exception as e:
-        st.error(f"Error formatting persona: {str(e)}")
-        st.error(f"Customer data: {customer_data}")
+        get_reporter().error(f"Error formatting persona: {str(e)}")
+        get_reporter().error(f"Customer data: {customer_data}")
         return None
 
 
@@ -67,86 +74,57 @@ def get_life_stage(age: int) -> str:
         return 'Retired'
 
 
-def generate_campaign_prompt(persona: Dict[str, Any]) -> str:
-    """Generate prompt for campaign creation"""
+def generate_campaign_prompt(persona: Dict[str, Any], compact: bool = False) -> Optional[Tuple[str, str]]:
+    """Generate prompt for campaign creation as a byte-stable prefix and a per-customer suffix"""
     try:
-        segment = persona['behavioral']['customer_segment']
-        segment_guidelines = get_segment_guidelines(segment)
-        visual_style = get_visual_style(segment)
-        tone = get_tone_guidelines(segment)
-        message_style = get_message_style(segment)
-        colors = get_brand_colors(segment)
-        channels = get_channel_recommendations(persona['behavioral']['digital_engagement'])
-        legal = get_legal_disclaimer('banking')
-
-        # Create the exact JSON structure we want
-        example_json = {
-            "primary_message": f"Discover banking solutions tailored to your {segment.lower()} needs",
-            "secondary_message": "Visit your nearest CommBank branch or login to NetBank to learn more",
-            "visual_elements": {
-                "color_scheme": ", ".join(colors),
-                "imagery": "Professional banking environment",
-                "layout": "Clean, modern layout",
-                "style": visual_style['style']
-            },
-            "channel_strategy": {
-                "primary_channels": channels,
-                "secondary_channels": persona['psychographic']['preferred_channels'],
-                "channel_specific_adaptations": {
-                    "CommBank App": "Mobile-optimized format",
-                    "Email": "Responsive design layout"
-                }
-            },
-            "personalization_elements": {
-                "key_variables": ["products", "transactions", "preferences"],
-                "dynamic_content": ["offers", "services", "features"],
-                "personalization_rules": "Based on banking behavior and preferences"
-            },
-            "tone_guidelines": {
-                "voice": tone,
-                "style": segment_guidelines['style'],
-                "language_level": "Professional and clear"
-            },
-            "legal_disclaimer": legal
-        }
+        return get_prompt_compiler().build(persona, compact=compact)
+
+    except Exception as e:
+        get_reporter().error(f"Error generating prompt: {str(e)}")
+        return None
+
 
-        # Convert example to string with proper formatting
-        example_json_str = json.dumps(example_json, indent=2)
+def generate_packed_prompt(customers: List[Tuple[str, Dict[str, Any]]]) -> Tuple[str, str]:
+    """
+    Generate one prompt asking for a JSON array of campaigns for several customers
 
-        return f"""REQUIRED: Generate a marketing campaign as a JSON object following this EXACT structure:
+    The customers should share a segment and digital engagement level, since
+    the structure example in the prefix is taken from the first persona.
+
+    Args:
+        customers (List[Tuple[str, Dict[str, Any]]]): (customer_id, persona) pairs
+
+    Returns:
+        Tuple[str, str]: Prefix shared by packs of the same segment and engagement, and
+            the suffix listing the customers
+    """
+    behavioral = customers[0][1]['behavioral']
+    example = campaign_example(behavioral['customer_segment'], behavioral['digital_engagement'])
+    example_json_str = json.dumps({'customer_id': 'The customer ID given below', **example}, indent=2)
+
+    prefix = f"""REQUIRED: Generate one marketing campaign per customer listed after these instructions, as a JSON array. Each element must be a JSON object following this EXACT structure:
 
 {example_json_str}
 
-You are an expert marketing specialist. Create a personalized marketing campaign for a bank customer.
-Create the content based on these banking details:
-Segment: {segment}
-Digital Usage: {persona['behavioral']['digital_engagement']}
-Monthly Transactions: {persona['behavioral']['transaction_frequency']}
-Average Transaction: ${persona['behavioral']['average_transaction']:,.2f}
-Current Products: {persona['behavioral']['product_holdings']}
-Banking History: {persona['behavioral']['relationship_tenure']} years
-Preferred Channels: {', '.join(persona['psychographic']['preferred_channels'])}
-Financial Interests: {', '.join(persona['psychographic']['interests'])}
-
-Requirements:
-1. Primary message should be max 150 words and focused on the customer's interests and life stage
-2. Secondary message should be max 50 words and include a clear call to action
-3. Visual elements should specify colors, imagery, and layout that appeal to this customer persona
-4. Channel strategy should prioritize the customer's preferred channels
-5. Include specific personalization elements based on the customer's data
-6. Tone guidelines should match the bank's brand voice and the customer's segment
+You are an expert marketing specialist. Create a personalized marketing campaign for each bank customer.
+
+{brand_guidelines_section(behavioral['customer_segment'])}
+
+{CAMPAIGN_REQUIREMENTS}
 
 CRITICAL INSTRUCTIONS:
-1. Return ONLY valid JSON - no other text
-2. Follow the exact structure shown above
-3. Use appropriate banking terminology
-4. Keep messages professional and clear
-5. Include all required fields
-6. Maintain consistent formatting"""
+1. Return ONLY a valid JSON array with one object per customer - no other text
+2. Set "customer_id" in each object to the customer's ID exactly as given
+3. Follow the exact structure shown above
+4. Use appropriate banking terminology
+5. Keep messages professional and clear
+6. Include all required fields"""
+
+    details = "\n\n".join(
+        f"Customer ID: {customer_id}\n{persona_details(persona)}" for customer_id, persona in customers
+    )
+    return prefix, f"Create the content based on these {len(customers)} customers' banking details:\n\n{details}"
 
-    except Exception as e:
-        st.error(f"Error generating prompt: {str(e)}")
-        return None
 
 def generate_campaign_prompt_1(persona: Dict[str, Any]) -> str:
     try:
@@ -196,26 +174,20 @@ def generate_campaign_prompt_1(persona: Dict[str, Any]) -> str:
         return prompt
 
     except Exception as e:
-        st.error(f"Error generating prompt: {str(e)}")
+        get_reporter().error(f"Error generating prompt: {str(e)}")
         return None
 
 
 def validate_campaign_content(content: Dict[str, Any]) -> bool:
-    """Validate the generated campaign content"""
-    required_keys = [
-        'primary_message',
-        'secondary_message',
-        'visual_elements',
-        'channel_strategy',
-        'personalization_elements',
-        'tone_guidelines'
-    ]
-
+    """Validate the generated campaign content, normalizing it in place"""
     try:
-        for key in required_keys:
-            if key not in content:
-                st.error(f"Missing required key: {key}")
-                return False
+        result = validate_campaign(content)
+        if not result.valid:
+            get_reporter().error("Invalid campaign content: " + "; ".join(str(issue) for issue in result.errors))
+            return False
+
+        content.clear()
+        content.update(result.value)
 
         # Add legal disclaimer if not present
         if 'legal_disclaimer' not in content:
@@ -224,127 +196,579 @@ def validate_campaign_content(content: Dict[str, Any]) -> bool:
         return True
 
     except Exception as e:
-        st.error(f"Error validating campaign content: {str(e)}")
+        get_reporter().error(f"Error validating campaign content: {str(e)}")
         return False
 
 
 def extract_json_content(response_text: str) -> Optional[Dict[str, Any]]:
-    """Extract and validate JSON content from API response"""
+    """Extract JSON content from API response, closing a truncated object where possible"""
     try:
-        # Clean the response text
-        cleaned_text = response_text.strip()
-
-        # Try direct JSON parsing first
-        try:
-            return json.loads(cleaned_text)
-        except json.JSONDecodeError:
-            pass
-
-        # Find JSON content
-        json_start = cleaned_text.find('{')
-        json_end = cleaned_text.rfind('}') + 1
-
-        if json_start >= 0 and json_end > json_start:
-            json_content = cleaned_text[json_start:json_end]
-
-            # Clean up common JSON issues
-            json_content = json_content.replace('\n', ' ')
-            json_content = json_content.replace('\\', '\\\\')
-            json_content = re.sub(r'(?<!\\)"', '\\"', json_content)
-            json_content = re.sub(r',\s*}', '}', json_content)
-            json_content = re.sub(r',\s*]', ']', json_content)
-
-            try:
-                return json.loads(json_content)
-            except json.JSONDecodeError as je:
-                st.error(f"JSON Decode Error: {str(je)}")
-                st.write("Cleaned JSON content:", json_content)
-                return None
-
-        st.error("No valid JSON structure found in response")
-        st.write("Full response:", cleaned_text)
-        return None
+        content, _ = extract_json(response_text)
+        if content is None:
+            get_reporter().error("No valid JSON structure found in response")
+            get_reporter().detail("Full response", response_text.strip())
+        return content
 
     except Exception as e:
-        st.error(f"Error extracting JSON: {str(e)}")
+        get_reporter().error(f"Error extracting JSON: {str(e)}")
         return None
 
 
-# Update the generate_campaign function to use the new extraction
-def generate_campaign(customer_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Generate personalized marketing campaign"""
-    try:
-        # Format customer data into persona
-        persona = format_persona(customer_data)
+class CampaignGenerationError(Exception):
+    """Raised when a campaign cannot be generated for a customer"""
+
+    def __init__(self, message: str, errors: Optional[List[ValidationIssue]] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+def build_campaign(customer_data: Dict[str, Any],
+                   api_call: Callable[..., Optional[Dict[str, Any]]] = make_api_call,
+                   use_cache: bool = True,
+                   compact: Optional[bool] = None,
+                   on_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+    """
+    Generate a campaign for one customer, raising instead of reporting errors
+
+    ``max_tokens`` is sized from the completion lengths observed for the
+    customer's segment, which are recorded in the token ledger along with the
+    prompt tokens compact mode saved. With ``on_field`` the response is
+    streamed and each top-level campaign field is passed to it as soon as it
+    is complete; validation still runs on the whole response.
+
+    Args:
+        customer_data (Dict[str, Any]): Customer record
+        api_call (Callable): Function with the ``make_api_call`` signature
+        use_cache (bool): Allow cached API responses
+        compact (Optional[bool]): Compact prompt, defaults to API_SETTINGS['compact_prompts']
+        on_field (Optional[Callable[[str, Any], None]]): Called with (key, value) of
+            streamed fields, which are unvalidated; a retried stream repeats them
+
+    Returns:
+        Dict[str, Any]: Validated campaign content with metadata
+
+    Raises:
+        CampaignGenerationError: If any step fails
+    """
+    # Format customer data into persona
+    persona = format_persona(customer_data)
+    if not persona:
+        raise CampaignGenerationError("Error formatting persona")
+
+    return campaign_generator_for(api_call).generate(persona, use_cache=use_cache, compact=compact,
+                                                     on_field=on_field)
+
+
+def finish_campaign(campaign_content: Dict[str, Any], persona: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the legal disclaimer, if missing, and metadata to validated campaign content"""
+    # Add legal disclaimer if not present
+    if 'legal_disclaimer' not in campaign_content:
+        campaign_content['legal_disclaimer'] = get_legal_disclaimer('banking')
+
+    # Add metadata
+    campaign_content['metadata'] = {
+        'generated_at': datetime.now().isoformat(),
+        'customer_segment': persona['behavioral']['customer_segment'],
+        'brand_guidelines_version': '1.0',
+        'campaign_type': 'personalized_banking'
+    }
+
+    return campaign_content
+
+
+class CampaignGenerator:
+    """
+    Long-lived campaign generation engine
+
+    Settings, brand guidelines, the compiled prompt prefixes, the validator
+    and the token ledger are looked up once when the engine is built, and the
+    API client on first use, so each campaign only pays for its own prompt
+    suffix, API call and validation.
+    """
+
+    def __init__(self, persona: Optional[Dict[str, Any]] = None, client: Optional[Any] = None,
+                 settings: Optional[Dict[str, Any]] = None,
+                 api_call: Callable[..., Optional[Dict[str, Any]]] = make_api_call):
+        """
+        Args:
+            persona (Optional[Dict[str, Any]]): Default persona from ``format_persona``
+            client (Optional[Any]): Anthropic client, defaults to the shared pooled client
+            settings (Optional[Dict[str, Any]]): Overrides of API_SETTINGS, e.g. 'compact_prompts'
+                or 'max_concurrency'
+            api_call (Callable): Function with the ``make_api_call`` signature, e.g. a local stand-in
+        """
+        self.persona = persona
+        self.model_settings = ChainMap(settings or {}, API_SETTINGS)
+        self.brand_guidelines = BRAND_GUIDELINES
+        self.api_call = api_call
+        self.compiler = get_prompt_compiler()
+        self.ledger = get_token_ledger()
+        self._system_tokens = estimate_prompt_tokens(system_prompt())
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        """The API client, created on first use"""
+        if self._client is None:
+            self._client = get_client()
+        return self._client
+
+    def _persona(self, persona: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        persona = persona if persona is not None else self.persona
         if not persona:
-            return None
+            raise CampaignGenerationError("No persona to generate a campaign for")
+        return persona
 
-        # Generate prompt
-        prompt = generate_campaign_prompt(persona)
-        if not prompt:
-            return None
+    def _compact(self, compact: Optional[bool]) -> bool:
+        return self.model_settings['compact_prompts'] if compact is None else compact
+
+    def _create_prompt(self, persona: Optional[Dict[str, Any]] = None,
+                       compact: Optional[bool] = None) -> str:
+        """Complete prompt text sent for a persona, defaulting to the engine's persona"""
+        compact = self._compact(compact)
+        prefix, suffix = self.compiler.build(self._persona(persona), compact)
+        return build_complete_prompt(suffix, compact, prefix)
+
+    def _parse_response(self, response_text: str) -> Optional[Dict[str, Any]]:
+        """Campaign object in a response, or None; truncated objects are closed where possible"""
+        content, _ = extract_json(response_text)
+        return content
+
+    def _validate_campaign_content(self, content: Dict[str, Any]) -> bool:
+        """Whether content passes the compiled campaign validator"""
+        return validate_campaign(content).valid
+
+    def generate(self, persona: Optional[Dict[str, Any]] = None, use_cache: bool = True,
+                 compact: Optional[bool] = None,
+                 on_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Generate a campaign for a persona, raising instead of reporting errors
+
+        ``max_tokens`` is sized from the completion lengths observed for the
+        persona's segment, which are recorded in the token ledger along with
+        the prompt tokens compact mode saved.
+
+        Args:
+            persona (Optional[Dict[str, Any]]): Persona from ``format_persona``, defaults to the
+                engine's persona
+            use_cache (bool): Allow cached API responses
+            compact (Optional[bool]): Compact prompt, defaults to the 'compact_prompts' setting
+            on_field (Optional[Callable[[str, Any], None]]): Stream the response and call this
+                with (key, value) of each field as it completes
+
+        Returns:
+            Dict[str, Any]: Validated campaign content with metadata
+
+        Raises:
+            CampaignGenerationError: If any step fails
+        """
+        campaign, _ = self._generate(persona, use_cache, compact, on_field)
+        return campaign
+
+    def _generate(self, persona: Optional[Dict[str, Any]], use_cache: bool, compact: Optional[bool],
+                  on_field: Optional[Callable[[str, Any], None]] = None) -> Tuple[Dict[str, Any], bool]:
+        """``generate``, also returning whether the response came from the response cache"""
+        persona = self._persona(persona)
+        compact = self._compact(compact)
+        try:
+            prefix, suffix = self.compiler.build(persona, compact)
+        except Exception as e:
+            raise CampaignGenerationError(f"Error generating prompt: {str(e)}") from e
 
         # Get campaign content from API
-        response = make_api_call(prompt=prompt)
+        segment = persona['behavioral']['customer_segment']
+        max_tokens = self.ledger.suggest_max_tokens(segment)
+        extra = ({'client': self._client, 'settings': self.model_settings}
+                 if self.api_call is make_api_call else {})
+        if on_field is not None:
+            parser = IncrementalJSONParser()
+
+            def on_text(text: str) -> None:
+                for key, value in parser.update(text):
+                    on_field(key, value)
+
+            extra['on_text'] = on_text
+        response = self.api_call(prompt=suffix, prefix=prefix, max_tokens=max_tokens,
+                                 use_cache=use_cache, compact=compact, **extra)
 
         if not response or 'completion' not in response:
-            st.error("Failed to get API response")
-            return None
+            raise CampaignGenerationError("Failed to get API response")
+
+        usage = response.get('usage')
+        if usage:
+            saved = 0
+            if compact:
+                # Only the suffix is new per call; the verbose prefix was counted when compiled
+                _, verbose_suffix = self.compiler.build(persona)
+                verbose_tokens = estimate_joined_tokens(self._system_tokens,
+                                                        self.compiler.prefix_tokens(persona),
+                                                        estimate_prompt_tokens(verbose_suffix))
+                saved = verbose_tokens - usage['prompt_tokens']
+            self.ledger.observe(segment, usage['completion_tokens'], prompt_tokens_saved=saved)
+
+        def reject(message: str, errors: Optional[List[ValidationIssue]] = None) -> CampaignGenerationError:
+            discard_cached_response(suffix, max_tokens=max_tokens, compact=compact, prefix=prefix,
+                                    settings=self.model_settings)
+            return CampaignGenerationError(message, errors)
 
         # Extract and validate JSON content
+        campaign_content, repaired = extract_json(response['completion'])
+        if campaign_content is None:
+            raise reject("No valid JSON found in response")
+
+        result = validate_campaign(campaign_content)
+        if not result.valid:
+            label = "Truncated campaign content" if repaired else "Campaign content"
+            details = "; ".join(str(issue) for issue in result.errors)
+            raise reject(f"{label} failed validation: {details}", result.errors)
+
+        return finish_campaign(result.value, persona), bool(response.get('cached'))
+
+    def _run(self, index: Any, persona: Dict[str, Any], use_cache: bool) -> List[CampaignResult]:
+        """Generate one persona's campaign as a one-item task result, like a pack's"""
+        start = time.perf_counter()
+        issues, cached = [], False
         try:
-            content = response['completion'].strip()
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-
-            if json_start == -1 or json_end <= json_start:
-                st.error("No valid JSON found in response")
-                return None
-
-            json_content = content[json_start:json_end]
-            campaign_content = json.loads(json_content)
-
-            # Validate content
-            if not validate_campaign_content(campaign_content):
-                return None
-
-            # Ensure all nested dictionaries are serializable
-            def make_serializable(obj):
-                if isinstance(obj, (pd.Series, pd.DataFrame)):
-                    return obj.to_dict()
-                elif isinstance(obj, np.ndarray):
-                    return obj.tolist()
-                elif isinstance(obj, dict):
-                    return {k: make_serializable(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [make_serializable(i) for i in obj]
-                elif isinstance(obj, (int, float, str, bool, type(None))):
-                    return obj
-                else:
-                    return str(obj)
-
-            # Convert campaign content to serializable format
-            campaign_content = make_serializable(campaign_content)
-
-            # Add metadata
-            campaign_content['metadata'] = {
-                'generated_at': datetime.now().isoformat(),
-                'customer_segment': persona['behavioral']['customer_segment'],
-                'brand_guidelines_version': '1.0',
-                'campaign_type': 'personalized_banking'
-            }
+            (campaign, cached), error = self._generate(persona, use_cache, None), None
+        except Exception as e:
+            campaign, error, issues = None, str(e), getattr(e, 'errors', [])
+        return [CampaignResult(index=index, customer_id=persona.get('customer_id'), campaign=campaign,
+                               error=error, latency=time.perf_counter() - start,
+                               validation_errors=issues, cached=cached)]
+
+    def generate_many(self, personas: Iterable[Dict[str, Any]], max_concurrency: Optional[int] = None,
+                      use_cache: bool = True) -> Iterator[CampaignResult]:
+        """
+        Generate campaigns for many personas concurrently
+
+        Args:
+            personas (Iterable[Dict[str, Any]]): Personas from ``format_persona``, read lazily
+            max_concurrency (Optional[int]): Parallel requests, defaults to the 'max_concurrency' setting
+            use_cache (bool): Allow cached API responses
+
+        Yields:
+            CampaignResult: One result per persona, indexed by its position, in completion order
+        """
+        tasks = ((self._run, index, persona) for index, persona in enumerate(personas))
+        yield from _run_tasks(tasks, max_concurrency or self.model_settings['max_concurrency'], use_cache)
+
+
+_generator: Optional[CampaignGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_campaign_generator() -> CampaignGenerator:
+    """Process-wide campaign engine calling the API through ``make_api_call``"""
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            _generator = CampaignGenerator()
+        return _generator
+
+
+def campaign_generator_for(api_call: Callable[..., Optional[Dict[str, Any]]]) -> CampaignGenerator:
+    """The shared engine for ``make_api_call``, or a new engine around another API function"""
+    return get_campaign_generator() if api_call is make_api_call else CampaignGenerator(api_call=api_call)
+
+
+def parse_campaign_array(content: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Campaign objects from a packed response, keyed by customer_id
+
+    Elements without a customer_id, or that are not objects, are dropped so
+    their customers count as failed. A truncated array keeps its complete
+    elements; a cut-off last element fails validation and is retried.
+    """
+    elements, _ = extract_json(content, container='[')
+    if not isinstance(elements, list):
+        return {}
+    return {
+        str(element.pop('customer_id')): element
+        for element in elements
+        if isinstance(element, dict) and 'customer_id' in element
+    }
+
+
+def build_campaign_pack(customers: List[Dict[str, Any]],
+                        api_call: Callable[..., Optional[Dict[str, Any]]] = make_api_call,
+                        use_cache: bool = True) -> List[Tuple[Optional[Dict[str, Any]], Optional[str],
+                                                              List[ValidationIssue], bool]]:
+    """
+    Generate campaigns for several customers with one packed API call
+
+    Elements missing from the response or failing validation are retried
+    individually with ``build_campaign``.
+
+    Args:
+        customers (List[Dict[str, Any]]): Customer records, ideally sharing segment and engagement
+        api_call (Callable): Function with the ``make_api_call`` signature
+        use_cache (bool): Allow cached API responses
+
+    Returns:
+        List[Tuple[Optional[Dict[str, Any]], Optional[str], List[ValidationIssue], bool]]: (campaign,
+            error, validation errors, served from the response cache) per customer, in input order
+    """
+    personas = [format_persona(customer) for customer in customers]
+    packed = [(str(customer.get('customer_id')), persona)
+              for customer, persona in zip(customers, personas) if persona]
+
+    elements, pack_cached = {}, False
+    if len(packed) > 1:
+        prefix, suffix = generate_packed_prompt(packed)
+        max_tokens = len(packed) * API_SETTINGS['campaign_completion_tokens']
+        response = api_call(prompt=suffix, prefix=prefix, max_tokens=max_tokens, use_cache=use_cache,
+                            compact=False)
+        if response and 'completion' in response:
+            elements = parse_campaign_array(response['completion'])
+            pack_cached = bool(response.get('cached'))
+        if len(elements) < len(packed):
+            # Do not keep serving a response that drops customers
+            discard_cached_response(suffix, max_tokens=max_tokens, compact=False, prefix=prefix)
+
+    generator = campaign_generator_for(api_call)
+    results = []
+    for customer, persona in zip(customers, personas):
+        content = elements.get(str(customer.get('customer_id'))) if persona else None
+        result = validate_campaign(content) if content is not None else None
+        if result is not None and result.valid:
+            results.append((finish_campaign(result.value, persona), None, [], pack_cached))
+            continue
 
-            return campaign_content
+        try:
+            if not persona:
+                raise CampaignGenerationError("Error formatting persona")
+            campaign, cached = generator._generate(persona, use_cache, None)
+            results.append((campaign, None, [], cached))
+        except Exception as e:
+            results.append((None, str(e), getattr(e, 'errors', []), False))
+
+    return results
+
+
+def plan_packs(customers: pd.DataFrame, pack_size: Optional[int] = None) -> List[List[Tuple[Any, Dict[str, Any]]]]:
+    """
+    Split customers into packs for ``build_campaign_pack``
+
+    Customers are grouped by segment and digital engagement so a pack shares
+    one structure example. Within a group, packs are filled greedily until
+    the estimated prompt plus completion tokens reach
+    API_SETTINGS['pack_token_budget'] or the pack reaches ``pack_size``; the
+    reserved completion tokens also have to fit the model's sampling limit.
+
+    Args:
+        customers (pd.DataFrame): Customer records, one per row
+        pack_size (Optional[int]): Maximum customers per pack, defaults to API_SETTINGS['pack_max_size']
+
+    Returns:
+        List[List[Tuple[Any, Dict[str, Any]]]]: Packs of (index, customer record)
+    """
+    completion_tokens = API_SETTINGS['campaign_completion_tokens']
+    max_size = max(1, min(pack_size or API_SETTINGS['pack_max_size'],
+                          API_SETTINGS['max_completion_tokens'] // completion_tokens))
+    budget = API_SETTINGS['pack_token_budget']
+
+    groups: Dict[Tuple[str, str], List[Tuple[Any, Dict[str, Any], Optional[Dict[str, Any]]]]] = {}
+    for index, row in customers.iterrows():
+        customer = row.to_dict()
+        key = (str(customer.get('customer_segment')), str(customer.get('digital_engagement')))
+        groups.setdefault(key, []).append((index, customer, format_persona(customer)))
+
+    packs = []
+    for members in groups.values():
+        # Tokens of the instructions and example every pack of this group repeats
+        example = [('', persona) for _, _, persona in members if persona][:1]
+        shared_tokens = estimate_prompt_tokens(
+            build_complete_prompt('', prefix=generate_packed_prompt(example)[0])
+        ) if example else 0
+
+        pack, used = [], shared_tokens
+        for index, customer, persona in members:
+            cost = completion_tokens + (estimate_prompt_tokens(persona_details(persona)) if persona else 0)
+            if pack and (len(pack) >= max_size or used + cost > budget):
+                packs.append(pack)
+                pack, used = [], shared_tokens
+            pack.append((index, customer))
+            used += cost
+        if pack:
+            packs.append(pack)
+
+    return packs
+
+
+@async_cache_data(ttl=3600, shared=True, persist=True, refresh_arg='force_regenerate',
+                  coalesce=True, ignore_args=('on_field',))
+def generate_campaign(customer_data: Dict[str, Any],
+                      force_regenerate: bool = False,
+                      on_field: Optional[Callable[[str, Any], None]] = None) -> Optional[Dict[str, Any]]:
+    """Generate personalized marketing campaign
+
+    Args:
+        customer_data (Dict[str, Any]): Customer record
+        force_regenerate (bool): Skip the campaign and response caches and call the API
+        on_field (Optional[Callable[[str, Any], None]]): Stream the response and pass each
+            campaign field to this callback as it arrives; not called for cached campaigns
+    """
+    try:
+        return build_campaign(customer_data, use_cache=not force_regenerate, on_field=on_field)
 
-        except json.JSONDecodeError as e:
-            st.error(f"Error parsing campaign content: {str(e)}")
-            return None
+    except CampaignGenerationError as e:
+        get_reporter().error(str(e))
+        return None
 
     except Exception as e:
-        st.error(f"Error generating campaign: {str(e)}")
+        get_reporter().error(f"Error generating campaign: {str(e)}")
         return None
 
 
+def _run_single(index: Any, customer_data: Dict[str, Any], generator: CampaignGenerator,
+                use_cache: bool) -> List[CampaignResult]:
+    """Format one customer's persona and generate its campaign with the engine"""
+    persona = format_persona(customer_data)
+    if not persona:
+        return [CampaignResult(index=index, customer_id=customer_data.get('customer_id'), campaign=None,
+                               error="Error formatting persona", latency=0.0)]
+    return generator._run(index, persona, use_cache)
+
+
+def _run_pack(pack: List[Tuple[Any, Dict[str, Any]]], api_call: Callable,
+              use_cache: bool) -> List[CampaignResult]:
+    """Run ``build_campaign_pack``; every result carries the latency of the whole pack"""
+    start = time.perf_counter()
+    outcomes = build_campaign_pack([customer for _, customer in pack], api_call=api_call,
+                                   use_cache=use_cache)
+    latency = time.perf_counter() - start
+    return [
+        CampaignResult(index=index, customer_id=customer.get('customer_id'), campaign=campaign,
+                       error=error, latency=latency, validation_errors=issues, cached=cached)
+        for (index, customer), (campaign, error, issues, cached) in zip(pack, outcomes)
+    ]
+
+
+def _worker_share(workers: int, max_concurrency: Optional[int]) -> Dict[str, Any]:
+    """One worker process's share of the provider request, token and concurrency budget"""
+    concurrency = max(1, (max_concurrency or API_SETTINGS['max_concurrency']) // workers)
+    return {
+        'requests_per_minute': API_SETTINGS['requests_per_minute'] / workers,
+        'tokens_per_minute': API_SETTINGS['tokens_per_minute'] / workers,
+        'max_concurrency': concurrency,
+        'min_concurrency': min(API_SETTINGS['min_concurrency'], concurrency)
+    }
+
+
+def _init_worker(share: Dict[str, Any]) -> None:
+    """Apply a worker's budget share before its first call, replacing limiters inherited on fork"""
+    API_SETTINGS.update(share)
+    reset_limiters()
+
+
+def _run_shard(shard: pd.DataFrame, max_concurrency: Optional[int], api_call: Callable, use_cache: bool,
+               packed: bool, pack_size: Optional[int]) -> List[CampaignResult]:
+    """Generate a shard's campaigns inside a worker process"""
+    return list(generate_campaigns(shard, max_concurrency, api_call, use_cache, packed, pack_size))
+
+
+def _generate_in_processes(customers: pd.DataFrame, max_concurrency: Optional[int], api_call: Callable,
+                           use_cache: bool, packed: bool, pack_size: Optional[int],
+                           workers: int) -> Iterator[CampaignResult]:
+    """Spread customers over worker processes, yielding each shard's results as it finishes"""
+    workers = min(workers, len(customers))
+    share = _worker_share(workers, max_concurrency)
+    # A few shards per worker keeps every process busy when shards finish unevenly
+    bounds = np.linspace(0, len(customers), min(len(customers), workers * 4) + 1).astype(int)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(share,)) as executor:
+        futures = [executor.submit(_run_shard, customers.iloc[start:end], share['max_concurrency'],
+                                   api_call, use_cache, packed, pack_size)
+                   for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def generate_campaigns(customers: pd.DataFrame,
+                       max_concurrency: Optional[int] = None,
+                       api_call: Callable[..., Optional[Dict[str, Any]]] = make_api_call,
+                       use_cache: bool = True,
+                       packed: bool = False,
+                       pack_size: Optional[int] = None,
+                       workers: int = 1) -> Iterator[CampaignResult]:
+    """
+    Generate campaigns for many customers concurrently
+
+    At most ``max_concurrency`` requests are in flight at once. A failure is
+    reported on its result and does not stop the batch. In packed mode each
+    request covers a pack of similar customers (see ``plan_packs``), and only
+    the customers a packed response failed for are retried one by one.
+
+    With ``workers`` above one the customers are split into shards that run
+    in a pool of worker processes, each with its own client and limiters.
+    The limits stay totals: every worker gets an equal share of
+    ``max_concurrency`` and of the 'requests_per_minute' and
+    'tokens_per_minute' settings. ``api_call`` must then be picklable.
+
+    Args:
+        customers (pd.DataFrame): Customer records, one per row
+        max_concurrency (Optional[int]): Parallel requests across all workers, defaults to
+            API_SETTINGS['max_concurrency']
+        api_call (Callable): Function with the ``make_api_call`` signature, e.g. a local stand-in
+        use_cache (bool): Allow cached API responses
+        packed (bool): Put several customers into each prompt
+        pack_size (Optional[int]): Maximum customers per packed prompt
+        workers (int): Number of worker processes
+
+    Yields:
+        CampaignResult: One result per customer, in completion order
+    """
+    if workers > 1 and len(customers) > 1:
+        yield from _generate_in_processes(customers, max_concurrency, api_call, use_cache, packed,
+                                          pack_size, workers)
+        return
+
+    if packed:
+        tasks = ((_run_pack, pack, api_call) for pack in plan_packs(customers, pack_size))
+    else:
+        generator = campaign_generator_for(api_call)
+        tasks = ((_run_single, index, row.to_dict(), generator) for index, row in customers.iterrows())
+    yield from _run_tasks(tasks, max_concurrency or API_SETTINGS['max_concurrency'], use_cache)
+
+
+def _run_tasks(tasks: Iterable[Tuple[Any, ...]], max_concurrency: int,
+              use_cache: bool) -> Iterator[CampaignResult]:
+    """
+    Run campaign tasks on a thread pool, with at most ``max_concurrency`` submitted at once
+
+    Tasks are (function, *args) tuples, called with ``use_cache`` appended and
+    returning a list of results; the next task is only taken from ``tasks``
+    when one finishes, so a long batch is never queued up front.
+
+    Args:
+        tasks (Iterable[Tuple[Any, ...]]): Tasks, read lazily
+        max_concurrency (int): Tasks in flight at once
+        use_cache (bool): Allow cached API responses
+
+    Yields:
+        CampaignResult: Each task's results as it completes
+    """
+    max_concurrency = max(1, max_concurrency)
+    tasks = iter(tasks)
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='campaign') as executor:
+        pending = set()
+
+        def submit_next() -> bool:
+            for func, *args in tasks:
+                pending.add(executor.submit(func, *args, use_cache))
+                return True
+            return False
+
+        while len(pending) < max_concurrency and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                submit_next()
+                yield from future.result()
+
+
 def estimate_campaign_performance(campaign_content: Dict[str, Any],
                                   customer_data: Dict[str, Any]) -> Dict[str, Any]:
     """Estimate campaign performance metrics"""
@@ -380,7 +804,7 @@ def estimate_campaign_performance(campaign_content: Dict[str, Any],
         return metrics
 
     except Exception as e:
-        st.error(f"Error estimating performance: {str(e)}")
+        get_reporter().error(f"Error estimating performance: {str(e)}")
         return {
             'engagement_rate': 0.0,
             'channel_optimization': 0.0,
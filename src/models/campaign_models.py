@@ -1,5 +1,5 @@
-from typing import Dict, List, Any, TypedDict
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, TypedDict
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
@@ -86,4 +86,21 @@ class CampaignPerformance:
             'brand_alignment_score': self.brand_alignment_score,
             'overall_score': self.overall_score,
             'timestamp': self.timestamp.isoformat()
-        }
\ No newline at end of file
+        }
+
+
+@dataclass
+class CampaignResult:
+    """Outcome of generating a campaign for one customer in a batch"""
+    index: Any
+    customer_id: Optional[str]
+    campaign: Optional[Dict[str, Any]]
+    error: Optional[str]
+    latency: float
+    validation_errors: List[Any] = field(default_factory=list)  # ValidationIssue of a rejected campaign
+    cached: bool = False  # Served from the response cache
+
+    @property
+    def success(self) -> bool:
+        """Whether a campaign was generated"""
+        return self.campaign is not None
@@ -0,0 +1,216 @@
+"""
+Campaign content validation compiled from the campaign_models TypedDicts
+
+``CampaignValidator`` compiles a TypedDict into a flat plan of checks, one per
+field, ordered so every object is checked before its fields. Validating a
+campaign runs the plan once: each field is type checked, normalized
+(strings stripped, numbers written as strings, a lone string taken as a
+one-item list) and copied into a new JSON-safe object, and every problem is
+collected instead of stopping at the first.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, get_args, get_origin, get_type_hints
+
+import numpy as np
+import pandas as pd
+
+from models.campaign_models import CampaignContent
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """One problem with a field of the validated content"""
+    path: str
+    code: str  # 'missing', 'type' or 'empty'
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path or '<root>'}: {self.message}"
+
+
+@dataclass
+class ValidationResult:
+    """Normalized content, or None, and every issue found"""
+    value: Optional[Dict[str, Any]]
+    errors: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        """Whether the content passed every check"""
+        return not self.errors
+
+
+@dataclass(frozen=True)
+class _Check:
+    path: Tuple[str, ...]
+    kind: str  # 'object', 'str', 'str_list', 'str_map' or 'any'
+    required: bool = True
+    fields: Tuple[str, ...] = ()
+
+
+def json_safe(obj: Any) -> Any:
+    """``obj`` with pandas and numpy values converted and unknown objects as strings"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (str, int, float, bool, type(None))):
+        return obj
+    if isinstance(obj, dict):
+        return {str(k): json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [json_safe(i) for i in obj]
+    if isinstance(obj, (pd.Series, pd.DataFrame)):
+        return json_safe(obj.to_dict())
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
+def _is_typeddict(annotation: Any) -> bool:
+    # typing.is_typeddict needs Python 3.10
+    return (isinstance(annotation, type) and issubclass(annotation, dict) and
+            hasattr(annotation, '__required_keys__'))
+
+
+def _kind(annotation: Any) -> str:
+    if _is_typeddict(annotation):
+        return 'object'
+    if annotation is str:
+        return 'str'
+    args = get_args(annotation)
+    if get_origin(annotation) is list and args == (str,):
+        return 'str_list'
+    if get_origin(annotation) is dict and args == (str, str):
+        return 'str_map'
+    return 'any'
+
+
+def _compile(schema: type, path: Tuple[str, ...], required: bool, exclude: Tuple[str, ...],
+             plan: List[_Check]) -> None:
+    hints = {k: v for k, v in get_type_hints(schema).items() if k not in exclude}
+    plan.append(_Check(path, 'object', required, tuple(hints)))
+    for key, annotation in hints.items():
+        key_required = key in schema.__required_keys__
+        if _kind(annotation) == 'object':
+            _compile(annotation, path + (key,), key_required, (), plan)
+        else:
+            plan.append(_Check(path + (key,), _kind(annotation), key_required))
+
+
+def _format_path(path: Tuple[Any, ...]) -> str:
+    text = ''
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else f".{part}" if text else part
+    return text
+
+
+class _Run:
+    """State of one validation: the issues found so far"""
+
+    def __init__(self):
+        self.errors: List[ValidationIssue] = []
+
+    def error(self, path: Tuple[Any, ...], code: str, message: str) -> None:
+        self.errors.append(ValidationIssue(_format_path(path), code, message))
+
+    def string(self, value: Any, path: Tuple[Any, ...]) -> Optional[str]:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        if not isinstance(value, str):
+            self.error(path, 'type', f"expected a string, got {type(value).__name__}")
+            return None
+        value = value.strip()
+        if not value:
+            self.error(path, 'empty', "must not be empty")
+        return value
+
+    def str_list(self, value: Any, path: Tuple[Any, ...]) -> Optional[List[str]]:
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, (list, tuple)):
+            self.error(path, 'type', f"expected a list of strings, got {type(value).__name__}")
+            return None
+        return [self.string(item, path + (i,)) for i, item in enumerate(value)]
+
+    def str_map(self, value: Any, path: Tuple[Any, ...]) -> Optional[Dict[str, str]]:
+        if not isinstance(value, dict):
+            self.error(path, 'type', f"expected an object, got {type(value).__name__}")
+            return None
+        return {str(k): self.string(v, path + (str(k),)) for k, v in value.items()}
+
+
+class CampaignValidator:
+    """Validator for one TypedDict, compiled into a flat check plan"""
+
+    def __init__(self, schema: type, exclude: Tuple[str, ...] = ()):
+        """
+        Args:
+            schema (type): TypedDict describing the content
+            exclude (Tuple[str, ...]): Top-level keys dropped from the content, not checked
+        """
+        self.exclude = exclude
+        self.plan: List[_Check] = []
+        _compile(schema, (), True, exclude, self.plan)
+
+    def validate(self, content: Any) -> ValidationResult:
+        """
+        Check and normalize content in one pass over the plan
+
+        Keys the schema does not describe are kept and made JSON-safe; the
+        input is not modified.
+
+        Args:
+            content (Any): Parsed model response
+
+        Returns:
+            ValidationResult: The normalized copy if there were no issues, and all issues
+        """
+        run = _Run()
+        sources: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        targets: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+        for check in self.plan:
+            parent = check.path[:-1]
+            if check.path and parent not in sources:
+                continue  # The enclosing object is missing or invalid, already reported
+            value = sources[parent].get(check.path[-1], _MISSING) if check.path else content
+
+            if value is _MISSING:
+                if check.required:
+                    run.error(check.path, 'missing', "is required")
+                continue
+
+            if check.kind == 'object':
+                if not isinstance(value, dict):
+                    run.error(check.path, 'type', f"expected an object, got {type(value).__name__}")
+                    continue
+                skip = self.exclude if not check.path else ()
+                # Checked fields are placeholders here, filled in by their own checks
+                normalized = {str(k): None if k in check.fields else json_safe(v)
+                              for k, v in value.items() if k not in skip}
+                sources[check.path], targets[check.path] = value, normalized
+            elif check.kind == 'str':
+                normalized = run.string(value, check.path)
+            elif check.kind == 'str_list':
+                normalized = run.str_list(value, check.path)
+            elif check.kind == 'str_map':
+                normalized = run.str_map(value, check.path)
+            else:
+                normalized = json_safe(value)
+
+            if check.path:
+                targets[parent][check.path[-1]] = normalized
+
+        if run.errors:
+            return ValidationResult(None, run.errors)
+        return ValidationResult(targets[()], [])
+
+
+# Campaign metadata is added after validation, never taken from the model
+CAMPAIGN_VALIDATOR = CampaignValidator(CampaignContent, exclude=('metadata',))
+
+
+def validate_campaign(content: Any) -> ValidationResult:
+    """Validate and normalize a generated campaign against ``CampaignContent``"""
+    return CAMPAIGN_VALIDATOR.validate(content)
@@ -1,4 +1,3 @@
-import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
@@ -8,6 +7,8 @@ import random
 from datetime import datetime, timedelta
 # Add at the top of the file
 from utils.cache_utils import async_cache_data
+from core.reporting import get_reporter
+from data.compact import PRODUCTS, get_products, get_product_count, has_product
 
 @async_cache_data(ttl=3600)
 def create_transaction_pattern(customer_data: pd.Series) -> go.Figure:
@@ -65,7 +66,7 @@ def create_transaction_pattern(customer_data: pd.Series) -> go.Figure:
 def create_product_usage(customer_data: pd.Series) -> go.Figure:
     """Generate product usage visualization"""
     # Get product holdings
-    products = customer_data['product_holdings']
+    products = get_products(customer_data)
 
     # Generate usage scores based on customer segment and engagement
     base_score = {
@@ -114,7 +115,7 @@ def create_engagement_radar(customer_data: pd.Series) -> go.Figure:
     metrics = {
         'Transaction Activity': min(customer_data['transaction_frequency'] / 30, 1),
         'Digital Engagement': {'High': 0.9, 'Medium': 0.6, 'Low': 0.3}[customer_data['digital_engagement']],
-        'Product Utilization': min(len(customer_data['product_holdings']) / 8, 1),
+        'Product Utilization': min(get_product_count(customer_data) / 8, 1),
         'Relationship Tenure': min(customer_data.get('relationship_tenure', 1) / 20, 1),
         'Satisfaction': customer_data.get('satisfaction_score', 75) / 100
     }
@@ -147,25 +148,15 @@ def generate_recommendations(customer_data: pd.Series) -> list:
     """Generate personalized recommendations"""
     recommendations = []
 
-    # Get current products and potential products
-    current_products = set(customer_data['product_holdings'])
-    potential_products = {
-        'Savings Account', 'Checking Account', 'Credit Card',
-        'Investment Account', 'Mortgage', 'Personal Loan',
-        'Insurance', 'Business Account'
-    }
-
-    missing_products = potential_products - current_products
-
     # Product recommendations based on profile
-    if 'Investment Account' in missing_products and customer_data['income'] > 80000:
+    if not has_product(customer_data, 'Investment Account') and customer_data['income'] > 80000:
         recommendations.append({
             'type': 'product',
             'title': 'Investment Account',
             'description': 'Based on your income level, you might benefit from our investment services.'
         })
 
-    if 'Credit Card' in missing_products and customer_data.get('credit_score', 700) > 700:
+    if not has_product(customer_data, 'Credit Card') and customer_data.get('credit_score', 700) > 700:
         recommendations.append({
             'type': 'product',
             'title': 'Premium Credit Card',
@@ -210,20 +201,22 @@ def calculate_metrics(customer_data: pd.Series) -> Dict[str, float]:
 
     customer_value = monthly_value * segment_multiplier * engagement_multiplier
 
+    num_products = get_product_count(customer_data)
+
     # Calculate churn risk
     churn_risk = 0
     if customer_data['transaction_frequency'] < 10:
         churn_risk += 30
     if customer_data['digital_engagement'] == 'Low':
         churn_risk += 30
-    if len(customer_data['product_holdings']) < 2:
+    if num_products < 2:
         churn_risk += 20
 
     # Calculate opportunity score
     opportunity_score = 0
     if customer_data['income'] > 100000:
         opportunity_score += 30
-    opportunity_score += (8 - len(customer_data['product_holdings'])) * 5
+    opportunity_score += (len(PRODUCTS) - num_products) * 5
     if customer_data['digital_engagement'] == 'High':
         opportunity_score += 20
 
@@ -233,7 +226,7 @@ def calculate_metrics(customer_data: pd.Series) -> Dict[str, float]:
         'opportunity_score': min(opportunity_score, 100)
     }
 
-@async_cache_data(ttl=3600)
+@async_cache_data(ttl=3600, shared=True, persist=True, coalesce=True)
 def create_customer_insights(customer_data: pd.Series) -> Optional[Dict[str, Any]]:
     """
     Generate comprehensive customer insights
@@ -268,7 +261,7 @@ def create_customer_insights(customer_data: pd.Series) -> Optional[Dict[str, Any
             'summary': {
                 'segment': customer_data['customer_segment'],
                 'engagement_level': customer_data['digital_engagement'],
-                'products_held': len(customer_data['product_holdings']),
+                'products_held': get_product_count(customer_data),
                 'generated_at': datetime.now().isoformat()
             }
         }
@@ -276,5 +269,5 @@ def create_customer_insights(customer_data: pd.Series) -> Optional[Dict[str, Any
         return insights
 
     except Exception as e:
-        st.error(f"Error generating customer insights: {str(e)}")
+        get_reporter().error(f"Error generating customer insights: {str(e)}")
         return None
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Campaign prompt templates and their precompiled prefixes
+
+A campaign prompt is a long prefix followed by a short per-customer suffix.
+The prefix (example structure, brand guidelines and instructions) depends
+only on the customer segment, digital engagement level and prompt mode, so
+it is byte-stable across customers and can be served from a provider-side
+prompt cache. ``PromptCompiler`` renders every prefix once and recompiles
+them when the brand guidelines change; building a customer's prompt is then
+a lookup plus the banking details suffix.
+"""
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from config.brand_guidelines import (
+    get_segment_guidelines,
+    get_visual_style,
+    get_tone_guidelines,
+    get_message_style,
+    get_channel_recommendations,
+    get_brand_colors,
+    get_legal_disclaimer,
+    get_guidelines_version
+)
+from data.compact import ENGAGEMENT_LEVELS, SEGMENTS
+from utils.token_ledger import estimate_tokens
+
+CAMPAIGN_REQUIREMENTS = """Requirements:
+1. Primary message should be max 150 words and focused on the customer's interests and life stage
+2. Secondary message should be max 50 words and include a clear call to action
+3. Visual elements should specify colors, imagery, and layout that appeal to this customer persona
+4. Channel strategy should prioritize the customer's preferred channels
+5. Include specific personalization elements based on the customer's data
+6. Tone guidelines should match the bank's brand voice and the customer's segment"""
+
+def campaign_example(segment: str, engagement: str) -> Dict[str, Any]:
+    """Example campaign JSON showing the required structure for a segment and engagement level"""
+    segment_guidelines = get_segment_guidelines(segment)
+    visual_style = get_visual_style(segment)
+    tone = get_tone_guidelines(segment)
+    colors = get_brand_colors(segment)
+    channels = get_channel_recommendations(engagement)
+    legal = get_legal_disclaimer('banking')
+
+    return {
+        "primary_message": f"Discover banking solutions tailored to your {segment.lower()} needs",
+        "secondary_message": "Visit your nearest CommBank branch or login to NetBank to learn more",
+        "visual_elements": {
+            "color_scheme": ", ".join(colors),
+            "imagery": "Professional banking environment",
+            "layout": "Clean, modern layout",
+            "visual_hierarchy": "Headline > Offer > Call to action",
+            "style": visual_style['style']
+        },
+        "channel_strategy": {
+            "primary_channels": channels,
+            "secondary_channels": ["The customer's preferred channels"],
+            "channel_specific_adaptations": {
+                "CommBank App": "Mobile-optimized format",
+                "Email": "Responsive design layout"
+            }
+        },
+        "personalization_elements": {
+            "key_variables": ["products", "transactions", "preferences"],
+            "dynamic_content": ["offers", "services", "features"],
+            "personalization_rules": "Based on banking behavior and preferences"
+        },
+        "tone_guidelines": {
+            "voice": tone,
+            "style": segment_guidelines['style'],
+            "language_level": "Professional and clear"
+        },
+        "legal_disclaimer": legal
+    }
+
+
+def persona_details(persona: Dict[str, Any]) -> str:
+    """Details of a persona as prompt lines, grouped under headings"""
+    demographic = persona['demographic']
+    return f"""Demographics:
+Age: {demographic['age']} ({demographic['life_stage']})
+Gender: {demographic['gender']}
+Location: {demographic['location']}
+Occupation: {demographic['occupation']}
+Income: ${demographic['income']:,.0f}
+Behavioral Data:
+Segment: {persona['behavioral']['customer_segment']}
+Digital Usage: {persona['behavioral']['digital_engagement']}
+Monthly Transactions: {persona['behavioral']['transaction_frequency']}
+Average Transaction: ${persona['behavioral']['average_transaction']:,.2f}
+Current Products: {persona['behavioral']['product_holdings']}
+Banking History: {persona['behavioral']['relationship_tenure']} years
+Psychographic Data:
+Preferred Channels: {', '.join(persona['psychographic']['preferred_channels'])}
+Financial Interests: {', '.join(persona['psychographic']['interests'])}"""
+
+
+def brand_guidelines_section(segment: str) -> str:
+    """Segment guidelines the example structure does not already carry"""
+    messages = get_message_style(segment)
+    return f"""Brand Guidelines:
+- Message tone: {messages['primary_tone']}
+- Call to action style: {messages['cta_style']}
+- Imagery: {get_visual_style(segment)['imagery']}"""
+
+
+def dump_example(example: Dict[str, Any], compact: bool = False) -> str:
+    """Example JSON pretty-printed, or minified in compact mode"""
+    return json.dumps(example, separators=(',', ':')) if compact else json.dumps(example, indent=2)
+
+
+def render_campaign_prefix(segment: str, engagement: str, compact: bool = False) -> str:
+    """Static part of the campaign prompt for a segment and engagement level"""
+    example_json_str = dump_example(campaign_example(segment, engagement), compact)
+    guidelines = brand_guidelines_section(segment)
+
+    if compact:
+        return f"""Create a personalized marketing campaign for the bank customer described at the end as a JSON object with exactly this structure:
+{example_json_str}
+
+{guidelines}
+
+{CAMPAIGN_REQUIREMENTS}
+Use appropriate banking terminology and include all fields."""
+
+    return f"""REQUIRED: Generate a marketing campaign as a JSON object following this EXACT structure:
+
+{example_json_str}
+
+You are an expert marketing specialist. Create a personalized marketing campaign for the bank customer whose banking details follow these instructions.
+
+{guidelines}
+
+{CAMPAIGN_REQUIREMENTS}
+
+CRITICAL INSTRUCTIONS:
+1. Return ONLY valid JSON - no other text
+2. Follow the exact structure shown above
+3. Use appropriate banking terminology
+4. Keep messages professional and clear
+5. Include all required fields
+6. Maintain consistent formatting"""
+
+
+def render_campaign_suffix(persona: Dict[str, Any], compact: bool = False) -> str:
+    """Per-customer part of the campaign prompt"""
+    label = "Banking details:" if compact else "Create the content based on these banking details:"
+    return f"{label}\n{persona_details(persona)}"
+
+
+def build_campaign_prompt(persona: Dict[str, Any], compact: bool = False) -> Tuple[str, str]:
+    """Render a campaign prompt's (prefix, suffix) from scratch, without compiled prefixes"""
+    behavioral = persona['behavioral']
+    prefix = render_campaign_prefix(behavioral['customer_segment'], behavioral['digital_engagement'],
+                                    compact)
+    return prefix, render_campaign_suffix(persona, compact)
+
+
+class PromptCompiler:
+    """Precompiled prompt prefixes per (segment, engagement, mode)"""
+
+    def __init__(self, check_interval: float = 1.0):
+        """
+        Args:
+            check_interval (float): Seconds between brand guideline version checks
+        """
+        self.check_interval = check_interval
+        self._prefixes: Dict[Tuple[str, str, bool], str] = {}
+        self._prefix_tokens: Dict[Tuple[str, str, bool], int] = {}
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self.version = get_guidelines_version()
+        self.compilations = 0
+        self.compile_all()
+
+    def compile_all(self) -> None:
+        """Compile prefixes for every known segment and engagement level, in both modes"""
+        for segment in SEGMENTS:
+            for engagement in ENGAGEMENT_LEVELS:
+                for compact in (False, True):
+                    self._compile(segment, engagement, compact)
+
+    def _compile(self, segment: str, engagement: str, compact: bool) -> str:
+        prefix = render_campaign_prefix(segment, engagement, compact)
+        tokens = estimate_tokens(prefix)
+        with self._lock:
+            self._prefixes[(segment, engagement, compact)] = prefix
+            self._prefix_tokens[(segment, engagement, compact)] = tokens
+            self.compilations += 1
+        return prefix
+
+    def _refresh_if_stale(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        version = get_guidelines_version()
+        if version != self.version:
+            with self._lock:
+                self._prefixes.clear()
+                self._prefix_tokens.clear()
+                self.version = version
+            self.compile_all()
+
+    def build(self, persona: Dict[str, Any], compact: bool = False) -> Tuple[str, str]:
+        """
+        Campaign prompt for a persona, identical to ``build_campaign_prompt``
+
+        Args:
+            persona (Dict[str, Any]): Persona from ``format_persona``
+            compact (bool): Build the compact prompt
+
+        Returns:
+            Tuple[str, str]: Byte-stable prefix and per-customer suffix
+        """
+        self._refresh_if_stale()
+        key = (persona['behavioral']['customer_segment'], persona['behavioral']['digital_engagement'],
+               compact)
+        prefix = self._prefixes.get(key) or self._compile(*key)
+        return prefix, render_campaign_suffix(persona, compact)
+
+    def prefix_tokens(self, persona: Dict[str, Any], compact: bool = False) -> int:
+        """Estimated tokens of the persona's prefix, counted once when it is compiled"""
+        self._refresh_if_stale()
+        key = (persona['behavioral']['customer_segment'], persona['behavioral']['digital_engagement'],
+               compact)
+        tokens = self._prefix_tokens.get(key)
+        if tokens is None:
+            self._compile(*key)
+            tokens = self._prefix_tokens[key]
+        return tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """Compiled prefix counters for the debug panel"""
+        with self._lock:
+            return {
+                'guidelines_version': self.version,
+                'prefixes': len(self._prefixes),
+                'compilations': self.compilations
+            }
+
+
+_compiler: Optional[PromptCompiler] = None
+_compiler_lock = threading.Lock()
+
+
+def get_prompt_compiler() -> PromptCompiler:
+    """Process-wide prompt compiler, compiling all skeletons on first use"""
+    global _compiler
+    with _compiler_lock:
+        if _compiler is None:
+            _compiler = PromptCompiler()
+        return _compiler
@@ -1,5 +1,5 @@
 import streamlit as st
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Union
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
@@ -90,8 +90,18 @@ def initialize_page():
         st.session_state.customer_data = None
         st.session_state.campaign_history = []
 
-def display_campaign_content(campaign_content: Dict[str, Any], customer_data: Dict[str, Any]):
-    """Display campaign content with CommBank styling"""
+def display_campaign_content(campaign_content: Union[Dict[str, Any], Callable[..., Optional[Dict[str, Any]]]],
+                             customer_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Display campaign content with CommBank styling
+
+    ``campaign_content`` is either a finished campaign or a function that
+    generates one, taking an ``on_field(key, value)`` callback for streamed
+    fields. In the latter case the primary and secondary messages are shown
+    as soon as they arrive and the other tabs once the campaign is complete.
+
+    Returns:
+        Optional[Dict[str, Any]]: The displayed campaign, None if generation failed
+    """
     segment = customer_data['customer_segment']
     segment_guidelines = get_segment_guidelines(segment)
 
@@ -104,10 +114,25 @@ def display_campaign_content(campaign_content: Dict[str, Any], customer_data: Di
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("### Primary Message")
-            st.markdown(f">{campaign_content['primary_message']}")
+            primary = st.empty()
         with col2:
             st.markdown("### Secondary Message")
-            st.markdown(f">{campaign_content['secondary_message']}")
+            secondary = st.empty()
+    messages = {'primary_message': primary, 'secondary_message': secondary}
+
+    if callable(campaign_content):
+        def on_field(key: str, value: Any):
+            if key in messages:
+                messages[key].markdown(f">{value}")
+
+        campaign_content = campaign_content(on_field=on_field)
+        if not campaign_content:
+            for placeholder in messages.values():
+                placeholder.empty()
+            return None
+
+    for key, placeholder in messages.items():
+        placeholder.markdown(f">{campaign_content[key]}")
 
     with tabs[1]:
         st.markdown("### Visual Elements")
@@ -157,6 +182,8 @@ def display_campaign_content(campaign_content: Dict[str, Any], customer_data: Di
         st.markdown(f"*{get_legal_disclaimer('banking')}*")
         st.markdown(f"*{BRAND_GUIDELINES['legal']['copyright']}*")
 
+    return campaign_content
+
 
 def display_customer_profile(customer_data: Dict[str, Any], insights: Dict[str, Any]):
     """Display customer profile with CommBank styling"""
@@ -0,0 +1,76 @@
+"""
+Streamlit adapter for the core modules
+
+The core reports through ``core.reporting`` and keeps per-session caches
+through ``utils.cache_utils.set_session_store``; ``install`` points both at
+the running Streamlit session. Messages from threads without a script run
+context, such as batch workers, go to the log instead.
+"""
+from typing import Any, Dict, Optional
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core.reporting import LoggingReporter, Reporter, set_reporter
+from utils.cache_utils import LRUCache, set_session_store
+
+
+class StreamlitReporter(Reporter):
+    """Shows messages in the current Streamlit page"""
+
+    def __init__(self):
+        self.fallback = LoggingReporter()
+
+    @staticmethod
+    def _in_session() -> bool:
+        return get_script_run_ctx(suppress_warning=True) is not None
+
+    def error(self, message: str) -> None:
+        if self._in_session():
+            st.error(message)
+        else:
+            self.fallback.error(message)
+
+    def warning(self, message: str) -> None:
+        if self._in_session():
+            st.warning(message)
+        else:
+            self.fallback.warning(message)
+
+    def info(self, message: str) -> None:
+        if self._in_session():
+            st.info(message)
+        else:
+            self.fallback.info(message)
+
+    def detail(self, label: str, value: Any) -> None:
+        if self._in_session():
+            st.write(f"{label}:", value)
+        else:
+            self.fallback.detail(label, value)
+
+    def event(self, name: str, **data: Any) -> None:
+        self.fallback.event(name, **data)
+
+
+def streamlit_session_caches() -> Optional[Dict[str, LRUCache]]:
+    """Cache registry kept in ``st.session_state``, or None outside a Streamlit session"""
+    if not st.runtime.exists() or get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    if '_memo_caches' not in st.session_state:
+        st.session_state['_memo_caches'] = {}
+    return st.session_state['_memo_caches']
+
+
+def init_session_state():
+    """Initialize session state variables"""
+    if 'initialized' not in st.session_state:
+        st.session_state.initialized = True
+        st.session_state.customer_data = None
+        st.session_state.api_tested = False
+
+
+def install() -> None:
+    """Route core reporting and per-session caches through Streamlit"""
+    set_reporter(StreamlitReporter())
+    set_session_store(streamlit_session_caches)
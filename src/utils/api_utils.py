@@ -1,19 +1,20 @@
-import streamlit as st
-from anthropic import Anthropic, HUMAN_PROMPT, AI_PROMPT
+from anthropic import HUMAN_PROMPT, AI_PROMPT, RateLimitError
 import json
-from typing import Optional, Dict, Any
-from config.settings import load_config
+from typing import Optional, Dict, Any, Tuple, Callable, Mapping
+from config.settings import API_SETTINGS
+from core.reporting import get_reporter
+from utils.client_pool import get_client
+from utils.response_cache import get_response_cache, response_cache_key
+from utils.singleflight import SingleFlight
+from utils.token_ledger import estimate_tokens, get_token_ledger
+from utils.rate_limit import get_rate_limiter, get_concurrency_limiter
+from utils.hedging import get_hedger
+from utils.resilience import (DeadlineExceeded, call_with_resilience, get_circuit_breaker,
+                              get_resilience_metrics, get_retry_policy)
 
 
-def make_api_call(prompt: str, max_tokens: int = 2000, temperature: float = 0.5) -> Optional[Dict[str, Any]]:
-    """Make API call with specific JSON requirements"""
-    try:
-        if 'anthropic' not in st.session_state:
-            if not initialize_anthropic():
-                return None
-
-        # Create a more specific role and instruction
-        system_instruction = """You are a specialized marketing AI assistant that generates JSON responses for a bank's marketing system. Your role is to:
+# Create a more specific role and instruction
+SYSTEM_INSTRUCTION = """You are a specialized marketing AI assistant that generates JSON responses for a bank's marketing system. Your role is to:
 1. Generate ONLY valid JSON marketing content
 2. Never provide explanations or apologies
 3. Never deviate from JSON format
@@ -22,54 +23,273 @@ def make_api_call(prompt: str, max_tokens: int = 2000, temperature: float = 0.5)
 
 Format all responses as valid JSON only."""
 
-        # Create the complete prompt
-        complete_prompt = f"""
-{system_instruction}
+# Compact prompts state the JSON-only requirement once
+COMPACT_SYSTEM_INSTRUCTION = """You are a specialized marketing AI assistant for a bank's marketing system. Respond with a single complete, valid JSON object only, with no other text."""
+
+# Blank lines are not a stop sequence: they occur inside pretty-printed JSON and cut it short
+STOP_SEQUENCES = ["Note:", "Remember:", "I apologize", "Let me"]
+
+
+def resolve_compact(compact: Optional[bool], settings: Optional[Mapping[str, Any]] = None) -> bool:
+    """Compact prompt mode, defaulting to the 'compact_prompts' setting"""
+    return (settings or API_SETTINGS)['compact_prompts'] if compact is None else compact
+
+
+def system_prompt(compact: bool = False) -> str:
+    """Instructions that lead every prompt with a static prefix"""
+    if compact:
+        return COMPACT_SYSTEM_INSTRUCTION
+
+    return f"""{SYSTEM_INSTRUCTION}
 
 IMPORTANT: Your response must be a single valid JSON object.
 DO NOT include any explanatory text, apologies, or additional content.
-ONLY return the JSON object itself.
+ONLY return the JSON object itself."""
+
+
+def split_prompt(prompt: str, compact: bool = False, prefix: Optional[str] = None) -> Tuple[str, str]:
+    """
+    The (stable, variable) parts of the text sent to the API
+
+    With a ``prefix`` the system instructions and prefix form a byte-stable
+    leading part shared by every call with that prefix, and ``prompt`` is the
+    short per-call suffix. Without one, the whole wrapped prompt is variable.
+    """
+    if prefix is not None:
+        return f"{system_prompt(compact)}\n\n{prefix}", prompt
+    if compact:
+        return "", f"{COMPACT_SYSTEM_INSTRUCTION}\n\n{prompt}"
+
+    return "", f"""
+{system_prompt()}
 
 Required JSON structure and content:
 {prompt}
 
 Remember: Return ONLY the JSON object. No other text allowed."""
 
-        # Make the API call with specific parameters
-        response = st.session_state.anthropic.completions.create(
-            model="claude-2",
-            prompt=f"{HUMAN_PROMPT}{complete_prompt}{AI_PROMPT}",
-            max_tokens_to_sample=max_tokens,
-            temperature=temperature,
-            stop_sequences=["\n\n", "Note:", "Remember:", "I apologize", "Let me"],
-            top_p=0.1,  # More focused responses
-            top_k=10  # More deterministic output
-        )
 
-        return {'completion': response.completion.strip()}
+def build_complete_prompt(prompt: str, compact: bool = False, prefix: Optional[str] = None) -> str:
+    """Wrap a prompt, or a prefix and suffix, in the system instruction sent to the API"""
+    stable, variable = split_prompt(prompt, compact, prefix)
+    return f"{stable}\n\n{variable}" if stable else variable
 
-    except Exception as e:
-        st.error(f"API Call Error: {str(e)}")
-        return None
+
+def send_prompt(client: Any, stable: str, variable: str, max_tokens: int, temperature: float,
+                timeout: float, on_text: Optional[Callable[[str], None]] = None,
+                model: Optional[str] = None) -> Tuple[str, int]:
+    """
+    Send one request and return its completion text and prompt-cache read tokens
+
+    Clients with a Messages API get the stable part as a system block marked
+    for prompt caching and the variable part as the user message; older
+    clients get a single completions prompt that starts with the stable part.
+    With ``on_text`` the response is streamed and ``on_text`` is called with
+    the text received so far after every chunk. ``model`` defaults to
+    API_SETTINGS['model'].
+    """
+    model = model or API_SETTINGS['model']
+    stream = on_text is not None
+    if hasattr(client, 'messages'):
+        request = {
+            'model': model,
+            'messages': [{'role': 'user', 'content': variable}],
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'stop_sequences': STOP_SEQUENCES,
+            'top_p': 0.1,
+            'top_k': 10,
+            'timeout': timeout,
+            'stream': stream
+        }
+        # Without a stable part there is no system block to send
+        if stable:
+            request['system'] = [{'type': 'text', 'text': stable, 'cache_control': {'type': 'ephemeral'}}]
+        response = client.messages.create(**request)
+        if not stream:
+            text = ''.join(block.text for block in response.content
+                           if getattr(block, 'type', 'text') == 'text')
+            cache_read = getattr(getattr(response, 'usage', None), 'cache_read_input_tokens', 0) or 0
+            return text, cache_read
+
+        text, cache_read = '', 0
+        for event in response:
+            if event.type == 'message_start':
+                cache_read = getattr(event.message.usage, 'cache_read_input_tokens', 0) or 0
+            elif event.type == 'content_block_delta' and getattr(event.delta, 'text', None):
+                text += event.delta.text
+                on_text(text)
+        return text, cache_read
+
+    complete_prompt = f"{stable}\n\n{variable}" if stable else variable
+    response = client.completions.create(
+        model=model,
+        prompt=f"{HUMAN_PROMPT}{complete_prompt}{AI_PROMPT}",
+        max_tokens_to_sample=max_tokens,
+        temperature=temperature,
+        stop_sequences=STOP_SEQUENCES,
+        top_p=0.1,  # More focused responses
+        top_k=10,  # More deterministic output
+        timeout=timeout,
+        stream=stream
+    )
+    if not stream:
+        return response.completion, 0
+
+    # Each streamed completion event carries the next piece of text
+    text = ''
+    for event in response:
+        if event.completion:
+            text += event.completion
+            on_text(text)
+    return text, 0
+
+
+# Identical API requests in flight, keyed on the prompt hash
+_inflight_calls = SingleFlight()
 
 
-def initialize_anthropic():
-    """Initialize Anthropic API client"""
+def get_inflight_call_stats() -> Dict[str, int]:
+    """Coalescing counters for identical concurrent API requests"""
+    return _inflight_calls.stats()
+
+
+def estimate_prompt_tokens(text: str) -> int:
+    """Approximate token count for rate limiting and budgeting"""
+    return estimate_tokens(text)
+
+
+def discard_cached_response(prompt: str, max_tokens: int = 2000, temperature: float = 0.5,
+                            compact: Optional[bool] = None, prefix: Optional[str] = None,
+                            settings: Optional[Mapping[str, Any]] = None) -> None:
+    """Remove a cached response, e.g. after it failed parsing or validation"""
+    settings = settings or API_SETTINGS
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        response_cache.discard(build_complete_prompt(prompt, resolve_compact(compact, settings), prefix),
+                               settings['model'], temperature, max_tokens)
+
+
+def make_api_call(prompt: str, max_tokens: int = 2000, temperature: float = 0.5,
+                  use_cache: bool = True, hedge: Optional[bool] = None,
+                  compact: Optional[bool] = None,
+                  prefix: Optional[str] = None,
+                  on_text: Optional[Callable[[str], None]] = None,
+                  client: Optional[Any] = None,
+                  settings: Optional[Mapping[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Make API call with specific JSON requirements
+
+    Responses are served from and stored in the persistent response cache;
+    with ``use_cache`` False the cached response is not read, and the fresh
+    one replaces it. Transient errors are retried with backoff
+    under the 'call_deadline' setting; errors that remain are reported
+    and None is returned. With ``hedge`` (default: the 'hedge_requests' setting)
+    a slow attempt is duplicated and the first non-empty completion wins.
+    Identical requests already in flight are joined rather than repeated.
+    ``compact`` (default: the 'compact_prompts' setting) uses the short
+    system instruction. Responses from the API, unlike cached ones, carry
+    estimated ``usage`` token counts, which are also recorded in the token ledger;
+    cached responses are marked with ``'cached': True``.
+    A ``prefix`` is sent ahead of ``prompt`` as a byte-stable part that the
+    provider can cache across calls (see ``send_prompt``).
+    With ``on_text`` the response is streamed: ``on_text`` is called with the
+    completion received so far as it grows, and restarts from the beginning
+    if the call is retried. Cached and coalesced responses are passed to it
+    once, whole. Streamed calls are never hedged.
+
+    ``client`` defaults to the shared pooled client and ``settings`` to
+    API_SETTINGS, so the function needs no UI session and can run in any
+    thread or worker process.
+    """
     try:
-        config = load_config()
-        client = Anthropic(api_key=config['api_key'])
-        st.session_state.anthropic = client
-        return True
+        # Create the complete prompt
+        settings = settings or API_SETTINGS
+        compact = resolve_compact(compact, settings)
+        stable, variable = split_prompt(prompt, compact, prefix)
+        complete_prompt = build_complete_prompt(prompt, compact, prefix)
+
+        model = settings['model']
+        # A forced call skips the lookup but still stores its fresh response over the old one
+        response_cache = get_response_cache()
+        if response_cache is not None and use_cache:
+            cached = response_cache.get(complete_prompt, model, temperature, max_tokens)
+            if cached is not None:
+                if on_text is not None:
+                    on_text(cached['completion'])
+                return {**cached, 'cached': True}
+
+        if client is None:
+            client = get_client()
+        prompt_tokens = estimate_prompt_tokens(complete_prompt)
+        budget = prompt_tokens + max_tokens
+        streamed = []
+
+        def stream_text(text: str) -> None:
+            streamed.append(True)
+            on_text(text)
+
+        def attempt(remaining: float):
+            # Pace each attempt under the shared request/token budgets and concurrency limit
+            if not get_rate_limiter().acquire(budget, timeout=remaining):
+                raise DeadlineExceeded("API call deadline reached while waiting for rate limit")
+            with get_concurrency_limiter().slot() as outcome:
+                try:
+                    return send_prompt(client, stable, variable, max_tokens, temperature, remaining,
+                                       on_text=stream_text if on_text is not None else None,
+                                       model=model)
+                except RateLimitError:
+                    outcome['throttled'] = True
+                    raise
+
+        def hedged_attempt(remaining: float):
+            # Duplicate a slow attempt, the first non-empty completion wins
+            return get_hedger().call(lambda: attempt(remaining),
+                                     is_valid=lambda response: bool(response[0].strip()))
+
+        # A hedged duplicate would stream a second, interleaved copy of the text
+        use_hedging = on_text is None and (settings['hedge_requests'] if hedge is None else hedge)
+
+        def fetch() -> Dict[str, Any]:
+            # Retry transient failures within the call deadline, failing fast while the circuit is open
+            completion, cache_read_tokens = call_with_resilience(
+                hedged_attempt if use_hedging else attempt,
+                policy=get_retry_policy(),
+                breaker=get_circuit_breaker(),
+                deadline=settings['call_deadline'],
+                metrics=get_resilience_metrics()
+            )
+
+            result = {'completion': completion.strip()}
+            if response_cache is not None:
+                response_cache.set(complete_prompt, model, temperature, max_tokens, result)
+
+            completion_tokens = estimate_tokens(result['completion'])
+            ledger = get_token_ledger()
+            ledger.record(prompt_tokens, completion_tokens, max_tokens)
+            if stable:
+                ledger.record_prefix(stable, cache_read_tokens)
+            return {**result, 'usage': {'prompt_tokens': prompt_tokens,
+                                        'completion_tokens': completion_tokens}}
+
+        # Concurrent callers with the same request share one API call; forced calls
+        # only join other forced calls, never a call that may return the old response
+        key = response_cache_key(complete_prompt, model, temperature, max_tokens)
+        response = _inflight_calls.do(key if use_cache else f"{key}:refresh", fetch)
+        if on_text is not None and not streamed:
+            # Joined another caller's request, so nothing was streamed to this one
+            on_text(response['completion'])
+        return response
+
     except Exception as e:
-        st.error(f"Error initializing Anthropic client: {str(e)}")
-        return False
+        get_reporter().error(f"API Call Error: {str(e)}")
+        return None
 
 
 def test_api_connection() -> bool:
     """Test API connection"""
     try:
-        response = make_api_call("Hi", max_tokens=10)
+        response = make_api_call("Hi", max_tokens=10, use_cache=False)
         return response is not None
     except Exception as e:
-        st.error(f"API Connection Error: {str(e)}")
+        get_reporter().error(f"API Connection Error: {str(e)}")
         return False
\ No newline at end of file
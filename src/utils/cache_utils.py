@@ -1,63 +1,602 @@
 """
-Utility functions for handling caching in Streamlit
+Memoization with LRU/TTL, process-wide and SQLite cache tiers
+
+``async_cache_data`` keys results on the call arguments and looks them up in
+the current session's LRU cache, a process-wide LRU cache shared by every
+session, and an optional SQLite cache shared across processes. Concurrent
+identical calls are coalesced so only one of them computes the result.
 """
-import streamlit as st
 from functools import wraps
-from typing import Any, Callable, Optional
-import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+import hashlib
+import threading
+import os
 import pickle
+import sqlite3
+import sys
+import time
+import numpy as np
+import pandas as pd
+from config.settings import CACHE_SETTINGS, PROMPT_VERSION
+from config.brand_guidelines import get_guidelines_version
+from utils.singleflight import SingleFlight
+
 
+def _update_digest(digest: 'hashlib._Hash', obj: Any) -> None:
+    """Feed a stable, type-tagged representation of ``obj`` into ``digest``"""
+    if isinstance(obj, np.generic):
+        obj = obj.item()
 
-def is_serializable(obj: Any) -> bool:
-    """Check if an object is pickle-serializable"""
-    try:
-        pickle.dumps(obj)
-        return True
-    except (pickle.PickleError, TypeError):
-        return False
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        digest.update(f"{type(obj).__name__}:{obj!r};".encode('utf-8'))
+    elif isinstance(obj, dict):
+        digest.update(f"dict:{len(obj)}{{".encode('utf-8'))
+        for key in sorted(obj, key=repr):
+            _update_digest(digest, key)
+            _update_digest(digest, obj[key])
+        digest.update(b"}")
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = sorted(obj, key=repr) if isinstance(obj, (set, frozenset)) else obj
+        digest.update(f"{type(obj).__name__}:{len(obj)}[".encode('utf-8'))
+        for item in items:
+            _update_digest(digest, item)
+        digest.update(b"]")
+    elif isinstance(obj, np.ndarray):
+        digest.update(f"ndarray:{obj.dtype}:{obj.shape};".encode('utf-8'))
+        if obj.dtype == object:
+            for item in obj.ravel():
+                _update_digest(digest, item)
+        else:
+            digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, pd.Series):
+        digest.update(f"series:{obj.name!r}:{len(obj)};".encode('utf-8'))
+        _update_digest(digest, list(obj.index))
+        _update_digest(digest, list(obj.array))
+    elif isinstance(obj, pd.DataFrame):
+        digest.update(f"frame:{obj.shape};".encode('utf-8'))
+        _update_digest(digest, list(obj.columns))
+        digest.update(pd.util.hash_pandas_object(obj.index).to_numpy().tobytes())
+        for _, column in obj.items():
+            try:
+                digest.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+            except TypeError:
+                # Unhashable cells such as lists, hash them one by one
+                for value in column.array:
+                    _update_digest(digest, value)
+    else:
+        digest.update(f"{type(obj).__module__}.{type(obj).__qualname__}:{obj!r};".encode('utf-8'))
 
 
-def async_cache_data(ttl: int = 3600):
+def make_cache_key(func: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
     """
-    Custom cache decorator that ensures data is serializable
+    Build a stable cache key from a function and its arguments
 
     Args:
-        ttl (int): Time to live in seconds
+        func (Callable): Cached function
+        args (Tuple[Any, ...]): Positional arguments
+        kwargs (Dict[str, Any]): Keyword arguments
+
+    Returns:
+        str: Hex digest that is equal for equal arguments, including pandas objects
     """
+    digest = hashlib.sha256(f"{func.__module__}.{func.__qualname__};".encode('utf-8'))
+    _update_digest(digest, args)
+    _update_digest(digest, kwargs)
+    return digest.hexdigest()
 
-    def decorator(func: Callable) -> Callable:
-        cache_key = f"cache_{func.__name__}"
-        timestamp_key = f"timestamp_{func.__name__}"
 
-        @wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            current_time = time.time()
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Rough in-memory size of ``obj`` in bytes, without serializing it"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
 
-            # Check if we need to refresh the cache
-            if (cache_key not in st.session_state or
-                    timestamp_key not in st.session_state or
-                    current_time - st.session_state[timestamp_key] > ttl):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(index=True, deep=False)
+        return int(usage.sum() if isinstance(obj, pd.DataFrame) else usage)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(k, _seen) + estimate_size(v, _seen)
+                                        for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_size(item, _seen) for item in obj)
+    if hasattr(obj, 'to_plotly_json'):
+        return estimate_size(obj.to_plotly_json(), _seen)
+    return sys.getsizeof(obj)
 
-                # Clear old cache if it exists
-                if cache_key in st.session_state:
-                    del st.session_state[cache_key]
 
-                # Generate new data
-                result = func(*args, **kwargs)
+@dataclass
+class CacheStats:
+    """Counters for a single cache"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert stats to dictionary"""
+        return {**asdict(self), 'hit_rate': self.hit_rate}
+
+
+class LRUCache:
+    """Thread-safe LRU cache with per-entry TTL, bounded by entry count and estimated bytes"""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Args:
+            ttl (Optional[float]): Default time to live in seconds, None for no expiry
+            max_entries (Optional[int]): Maximum number of entries, None for unbounded
+            max_bytes (Optional[int]): Maximum estimated size of all entries, None for unbounded
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[Any, Optional[float], int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a key
+
+        Returns:
+            Tuple[bool, Any]: (found, value); value is None when not found
+        """
+        found, value, _ = self.lookup(key)
+        return found, value
+
+    def lookup(self, key: str) -> Tuple[bool, Any, Optional[float]]:
+        """
+        Look up a key along with the time it has left
+
+        Returns:
+            Tuple[bool, Any, Optional[float]]: (found, value, seconds until expiry or None)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return False, None, None
+
+            value, expires_at, _ = entry
+            now = time.monotonic()
+            if expires_at is not None and now >= expires_at:
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return False, None, None
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return True, value, None if expires_at is None else expires_at - now
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries to stay within bounds"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = estimate_size(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, expires_at, size)
+            self._stats.entries += 1
+            self._stats.bytes += size
+
+            while ((self.max_entries is not None and self._stats.entries > self.max_entries) or
+                   (self.max_bytes is not None and self._stats.bytes > self.max_bytes)):
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._stats.entries = 0
+            self._stats.bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters"""
+        with self._lock:
+            return CacheStats(**asdict(self._stats))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._stats.entries -= 1
+        self._stats.bytes -= size
+
+
+class SQLiteCache:
+    """
+    Disk-backed cache in a SQLite file, safe to share between threads and processes
+
+    Values are serialized with ``serializer``/``deserializer`` (pickle by
+    default). Writes keep running estimates of the table's rows and bytes;
+    only when an estimate passes a limit, or every ``SYNC_INTERVAL`` writes
+    to catch up with other processes, is the table counted and swept of
+    expired rows. Eviction then removes least recently accessed rows down to
+    ``EVICT_TO`` of each limit, so a full cache is not recounted on every write.
+    """
+
+    SYNC_INTERVAL = 256
+    EVICT_TO = 0.9
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, table: str = 'cache',
+                 serializer: Callable[[Any], bytes] = pickle.dumps,
+                 deserializer: Callable[[bytes], Any] = pickle.loads):
+        """
+        Args:
+            path (str): SQLite database file
+            ttl (Optional[float]): Default time to live in seconds, None for no expiry
+            max_entries (Optional[int]): Maximum number of rows, None for unbounded
+            max_bytes (Optional[int]): Maximum total size of stored values, None for unbounded
+            table (str): Table name, so several caches can share one file
+            serializer (Callable[[Any], bytes]): Converts values to bytes
+            deserializer (Callable[[bytes], Any]): Converts bytes back to values
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.table = table
+        self.serializer = serializer
+        self.deserializer = deserializer
+        self._local = threading.local()
+        self._stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        self._size_lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table}(accessed_at)")
+            self._entries, self._bytes = self._totals(conn)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self._stats, counter, getattr(self._stats, counter) + 1)
+
+    def _totals(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        return conn.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a key
+
+        Returns:
+            Tuple[bool, Any]: (found, value); value is None when not found
+        """
+        found, value, _ = self.lookup(key)
+        return found, value
+
+    def lookup(self, key: str) -> Tuple[bool, Any, Optional[float]]:
+        """
+        Look up a key along with the time it has left
+
+        Returns:
+            Tuple[bool, Any, Optional[float]]: (found, value, seconds until expiry or None)
+        """
+        conn = self._connection()
+        row = conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None:
+            self._count('misses')
+            return False, None, None
+        if row[1] is not None and now >= row[1]:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._count('expirations')
+            self._count('misses')
+            return False, None, None
+
+        conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count('hits')
+        return True, self.deserializer(row[0]), None if row[1] is None else row[1] - now
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently accessed rows to stay within bounds"""
+        ttl = self.ttl if ttl is None else ttl
+        payload = self.serializer(value)
+        if self.max_bytes is not None and len(payload) > self.max_bytes:
+            return
+
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, payload, len(payload), now + ttl if ttl is not None else None, now)
+        )
+
+        # Replacing a key overcounts, which at worst brings the next sync forward
+        with self._size_lock:
+            self._writes += 1
+            self._entries += 1
+            self._bytes += len(payload)
+            due = (self._writes >= self.SYNC_INTERVAL or self._over_limit(self._entries, self._bytes))
+            if due:
+                self._writes = 0
+        if due:
+            self._evict(conn)
+
+    def _over_limit(self, entries: int, total: int) -> bool:
+        return ((self.max_entries is not None and entries > self.max_entries) or
+                (self.max_bytes is not None and total > self.max_bytes))
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                     (time.time(),))
+        entries, total = self._totals(conn)
+        max_entries = max_bytes = None
+        if self._over_limit(entries, total):
+            # Leave headroom so the following writes do not each recount the table
+            if self.max_entries is not None:
+                max_entries = round(self.max_entries * self.EVICT_TO)
+            if self.max_bytes is not None:
+                max_bytes = round(self.max_bytes * self.EVICT_TO)
+        while ((max_entries is not None and entries > max_entries) or
+               (max_bytes is not None and total > max_bytes)):
+            row = conn.execute(
+                f"SELECT key, size FROM {self.table} ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (row[0],))
+            entries -= 1
+            total -= row[1]
+            self._count('evictions')
+        with self._size_lock:
+            self._entries, self._bytes = entries, total
+
+    def delete(self, key: str) -> None:
+        """Remove one row if present"""
+        self._connection().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
 
-                # Verify result is serializable
-                if not is_serializable(result):
-                    st.error(f"Cache error: Result from {func.__name__} is not serializable")
-                    return result
+    def clear(self) -> None:
+        """Remove all rows"""
+        self._connection().execute(f"DELETE FROM {self.table}")
+        with self._size_lock:
+            self._entries = self._bytes = 0
 
-                # Update cache
-                st.session_state[cache_key] = result
-                st.session_state[timestamp_key] = current_time
+    def stats(self) -> CacheStats:
+        """Snapshot of this process's counters plus current table size"""
+        entries, total = self._totals(self._connection())
+        with self._stats_lock:
+            return CacheStats(**{**asdict(self._stats), 'entries': entries, 'bytes': total})
 
+    def __len__(self) -> int:
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+_namespace: Optional[str] = None
+_namespace_checked_at = 0.0
+
+
+def cache_namespace() -> str:
+    """
+    Namespace for shared cache entries, tied to the brand guidelines and prompt version
+
+    Hashing the guidelines is too slow for every memoized call, so the version
+    is rechecked at most once per CACHE_SETTINGS['namespace_check_interval'].
+    """
+    global _namespace, _namespace_checked_at
+    now = time.monotonic()
+    if _namespace is None or now - _namespace_checked_at >= CACHE_SETTINGS['namespace_check_interval']:
+        _namespace = f"guidelines-{get_guidelines_version()}:prompt-{PROMPT_VERSION}"
+        _namespace_checked_at = now
+    return _namespace
+
+
+# Caches used when no Streamlit session is running (tests, scripts)
+_local_caches: Dict[str, LRUCache] = {}
+
+# Process-wide tier shared by every session
+_shared_caches: Dict[str, LRUCache] = {}
+_shared_lock = threading.Lock()
+
+# Disk tier shared across processes, created on first use
+_disk_cache: Optional[SQLiteCache] = None
+_disk_lock = threading.Lock()
+
+
+# Returns the current session's cache registry, or None outside a session
+_session_store: Optional[Callable[[], Optional[Dict[str, LRUCache]]]] = None
+
+
+def set_session_store(store: Optional[Callable[[], Optional[Dict[str, LRUCache]]]]) -> None:
+    """
+    Install the lookup of per-session cache registries
+
+    A UI adapter installs one that keeps each user session's caches in its
+    session state; without one, all callers share a module-level registry.
+
+    Args:
+        store (Optional[Callable[[], Optional[Dict[str, LRUCache]]]]): Returns the
+            current session's registry, or None when no session is active
+    """
+    global _session_store
+    _session_store = store
+
+
+def _session_caches() -> Dict[str, LRUCache]:
+    """Per-session cache registry, from the installed session store when a session is active"""
+    caches = _session_store() if _session_store is not None else None
+    return _local_caches if caches is None else caches
+
+
+def _shared_cache(name: str, ttl: Optional[float]) -> LRUCache:
+    """Process-wide cache for one memoized function"""
+    with _shared_lock:
+        if name not in _shared_caches:
+            _shared_caches[name] = LRUCache(
+                ttl=ttl,
+                max_entries=CACHE_SETTINGS['shared_max_entries'],
+                max_bytes=CACHE_SETTINGS['shared_max_bytes']
+            )
+        return _shared_caches[name]
+
+
+def get_disk_cache() -> Optional[SQLiteCache]:
+    """Process's handle on the disk tier, or None when CACHE_SETTINGS['disk_path'] is unset"""
+    global _disk_cache
+    if not CACHE_SETTINGS['disk_path']:
+        return None
+    with _disk_lock:
+        if _disk_cache is None:
+            _disk_cache = SQLiteCache(
+                CACHE_SETTINGS['disk_path'],
+                ttl=CACHE_SETTINGS['ttl'],
+                max_entries=CACHE_SETTINGS['disk_max_entries'],
+                max_bytes=CACHE_SETTINGS['disk_max_bytes'],
+                table='memo'
+            )
+        return _disk_cache
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters for every cache tier, for the debug panel"""
+    stats = {f"session:{name}": cache.stats().to_dict() for name, cache in _session_caches().items()}
+    with _shared_lock:
+        stats.update({f"shared:{name}": cache.stats().to_dict() for name, cache in _shared_caches.items()})
+    disk_cache = get_disk_cache()
+    if disk_cache is not None:
+        stats['disk'] = disk_cache.stats().to_dict()
+    return stats
+
+
+# Identical misses of coalescing functions in flight across all sessions
+_inflight = SingleFlight()
+
+
+def get_inflight_stats() -> Dict[str, int]:
+    """Coalescing counters of ``async_cache_data(coalesce=True)`` functions"""
+    return _inflight.stats()
+
+
+def async_cache_data(ttl: Optional[int] = 3600, max_entries: Optional[int] = None,
+                     max_bytes: Optional[int] = None, shared: bool = False, persist: bool = False,
+                     namespace: Optional[Callable[[], str]] = cache_namespace,
+                     refresh_arg: Optional[str] = None, coalesce: bool = False,
+                     ignore_args: Tuple[str, ...] = ()):
+    """
+    Memoize a function, keyed on a stable hash of its arguments
+
+    Lookups go through up to three tiers: the session's own LRU cache, a
+    process-wide cache shared by all sessions (``shared``), and the SQLite
+    disk cache shared across processes (``persist``, when configured). Hits
+    in a lower tier are copied into the tiers above it for the time the entry
+    has left. ``None`` results are treated as failures and not cached.
+
+    Args:
+        ttl (Optional[int]): Time to live in seconds
+        max_entries (Optional[int]): Session entry limit, defaults to CACHE_SETTINGS['max_entries']
+        max_bytes (Optional[int]): Session size limit, defaults to CACHE_SETTINGS['max_bytes']
+        shared (bool): Also use the process-wide tier
+        persist (bool): Also use the disk tier
+        namespace (Optional[Callable[[], str]]): Prefix for keys, so entries made
+            under other brand guidelines or prompt versions are never served
+        refresh_arg (Optional[str]): Keyword argument that, when truthy, skips the
+            lookup and overwrites the cached entry; it is not part of the key
+        coalesce (bool): Concurrent misses for the same key, from any session,
+            share a single call to the function
+        ignore_args (Tuple[str, ...]): Keyword arguments left out of the key,
+            such as progress callbacks
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache_name = f"{func.__module__}.{func.__qualname__}"
+
+        def get_cache() -> LRUCache:
+            caches = _session_caches()
+            if cache_name not in caches:
+                caches[cache_name] = LRUCache(
+                    ttl=ttl,
+                    max_entries=max_entries or CACHE_SETTINGS['max_entries'],
+                    max_bytes=max_bytes or CACHE_SETTINGS['max_bytes']
+                )
+            return caches[cache_name]
+
+        def tiers() -> list:
+            caches = [get_cache()]
+            if shared:
+                caches.append(_shared_cache(cache_name, ttl))
+            if persist:
+                disk_cache = get_disk_cache()
+                if disk_cache is not None:
+                    caches.append(disk_cache)
+            return caches
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            caches = tiers()
+            key_kwargs = {k: v for k, v in kwargs.items() if k != refresh_arg and k not in ignore_args}
+            key = make_cache_key(func, args, key_kwargs)
+            if namespace is not None:
+                key = f"{namespace()}:{key}"
+
+            refresh = bool(refresh_arg and kwargs.get(refresh_arg))
+            if not refresh:
+                for level, cache in enumerate(caches):
+                    found, value, remaining = cache.lookup(key)
+                    if found:
+                        # Promoted copies expire with the entry they came from
+                        for upper in caches[:level]:
+                            upper.set(key, value, ttl if remaining is None else remaining)
+                        return value
+
+            def compute() -> Any:
+                result = func(*args, **kwargs)
+                if result is not None:
+                    for cache in caches:
+                        cache.set(key, result, ttl)
                 return result
 
-            return st.session_state[cache_key]
+            if not coalesce:
+                return compute()
+
+            result = _inflight.do(f"{key}:refresh" if refresh else key, compute)
+            if result is not None:
+                # Callers that joined another session's call fill their own session tier
+                caches[0].set(key, result, ttl)
+            return result
 
+        wrapper.cache_info = lambda: get_cache().stats()
+        wrapper.cache_clear = lambda: get_cache().clear()
         return wrapper
 
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,114 @@
+"""
+Process-wide Anthropic client on a shared HTTP connection pool
+
+The client is created lazily on first use and shared by every session and
+thread, so connections and TLS sessions are reused across users. New
+connections are counted through httpcore's trace hook, which lets the debug
+panel report how often a request found a warm connection.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+from anthropic import Anthropic
+
+from config.settings import API_SETTINGS, load_config
+
+
+class ConnectionStats:
+    """Counts requests and newly opened connections on the pool"""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self._lock = threading.Lock()
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == 'connection.connect_tcp.complete':
+            with self._lock:
+                self.new_connections += 1
+
+    def on_request(self, request: httpx.Request) -> None:
+        """httpx request hook: count the request and trace its connection setup"""
+        request.extensions['trace'] = self._trace
+        with self._lock:
+            self.requests += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counters and reuse rate"""
+        with self._lock:
+            reused = max(0, self.requests - self.new_connections)
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reuse_rate': reused / self.requests if self.requests else 0.0
+            }
+
+
+def build_http_client(stats: Optional[ConnectionStats] = None) -> httpx.Client:
+    """
+    HTTP client with pool limits, keep-alive and timeouts from API_SETTINGS
+
+    Args:
+        stats (Optional[ConnectionStats]): Counters to attach as a request hook
+
+    Returns:
+        httpx.Client: Thread-safe pooled client
+    """
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=API_SETTINGS['pool_max_connections'],
+            max_keepalive_connections=API_SETTINGS['pool_max_keepalive'],
+            keepalive_expiry=API_SETTINGS['pool_keepalive_expiry']
+        ),
+        timeout=httpx.Timeout(API_SETTINGS['read_timeout'],
+                              connect=API_SETTINGS['connect_timeout']),
+        event_hooks={'request': [stats.on_request]} if stats is not None else None
+    )
+
+
+_client: Optional[Anthropic] = None
+_http_client: Optional[httpx.Client] = None
+_connection_stats = ConnectionStats()
+_client_lock = threading.Lock()
+
+
+def get_client() -> Anthropic:
+    """
+    Shared Anthropic client, created on first use
+
+    Raises:
+        ValueError: If the API key is not configured
+    """
+    global _client, _http_client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None:
+            config = load_config()
+            _http_client = build_http_client(_connection_stats)
+            # Retries are handled by utils.resilience, so disable the SDK's own
+            _client = Anthropic(api_key=config['api_key'], http_client=_http_client, max_retries=0)
+        return _client
+
+
+def close_client() -> None:
+    """Close the shared client's connections; the next ``get_client`` builds a new one"""
+    global _client, _http_client
+    with _client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        _client = _http_client = None
+
+
+def client_pool_stats() -> Dict[str, Any]:
+    """Pool utilization and connection reuse for the debug panel"""
+    stats = _connection_stats.to_dict()
+    pool = getattr(getattr(_http_client, '_transport', None), '_pool', None)
+    connections = list(getattr(pool, 'connections', []))
+    stats.update({
+        'open_connections': len(connections),
+        'idle_connections': sum(connection.is_idle() for connection in connections),
+        'max_connections': API_SETTINGS['pool_max_connections']
+    })
+    return stats
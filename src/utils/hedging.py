@@ -0,0 +1,164 @@
+"""
+Hedged requests for API calls
+
+A ``Hedger`` runs a call and, if it has not answered within a percentile of
+recently observed latency, issues one duplicate. The first valid response
+wins; the other leg is cancelled if it has not started yet, otherwise its
+result is ignored. A cap on the fraction of hedged calls bounds the extra
+cost.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from config.settings import API_SETTINGS
+
+
+class LatencyHistogram:
+    """Rolling window of recent latencies"""
+
+    def __init__(self, window: int = 200):
+        """
+        Args:
+            window (int): Number of most recent samples kept
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        """Add a latency sample in seconds"""
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency at percentile ``q`` (0-100) of the window, None if empty"""
+        with self._lock:
+            if not self._samples:
+                return None
+            return float(np.percentile(np.fromiter(self._samples, dtype=float), q))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+class Hedger:
+    """Issues a duplicate call when the first one is slower than recent latency suggests"""
+
+    def __init__(self, percentile: float = 95, max_hedge_fraction: float = 0.1,
+                 min_samples: int = 20, window: int = 200, max_workers: int = 16):
+        """
+        Args:
+            percentile (float): Latency percentile after which a hedge is issued
+            max_hedge_fraction (float): Maximum share of calls that may be hedged
+            min_samples (int): Samples needed before hedging starts
+            window (int): Size of the rolling latency window
+            max_workers (int): Threads available to run call legs
+        """
+        self.percentile = percentile
+        self.max_hedge_fraction = max_hedge_fraction
+        self.min_samples = min_samples
+        self.histogram = LatencyHistogram(window)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.cancelled = 0
+
+    def threshold(self) -> Optional[float]:
+        """Seconds to wait before hedging, None while there are too few samples"""
+        if len(self.histogram) < self.min_samples:
+            return None
+        return self.histogram.percentile(self.percentile)
+
+    def _may_hedge(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.max_hedge_fraction * self.calls:
+                return False
+            self.hedged += 1
+            return True
+
+    def _run(self, func: Callable[[], Any]) -> Future:
+        def timed():
+            start = time.perf_counter()
+            result = func()
+            self.histogram.record(time.perf_counter() - start)
+            return result
+        return self._executor.submit(timed)
+
+    def call(self, func: Callable[[], Any],
+             is_valid: Callable[[Any], bool] = lambda result: True) -> Any:
+        """
+        Run ``func``, hedging it once if it is slow
+
+        Args:
+            func (Callable[[], Any]): The call, safe to run twice concurrently
+            is_valid (Callable[[Any], bool]): Whether a result may win; an
+                invalid result waits for the other leg
+
+        Returns:
+            Any: First valid result, or the last leg's result or error if none is valid
+        """
+        with self._lock:
+            self.calls += 1
+
+        primary = self._run(func)
+        threshold = self.threshold()
+        if threshold is None:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=threshold)
+        if done or not self._may_hedge():
+            return primary.result()
+
+        pending = {primary, self._run(func)}
+        last = primary
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                last = future
+                if future.exception() is None and is_valid(future.result()):
+                    self._discard(pending, hedge_won=future is not primary)
+                    return future.result()
+        return last.result()
+
+    def _discard(self, losers, hedge_won: bool) -> None:
+        """Cancel losing legs that have not started; running ones finish and are ignored"""
+        cancelled = sum(future.cancel() for future in losers)
+        with self._lock:
+            self.cancelled += cancelled
+            self.hedge_wins += hedge_won
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the debug panel"""
+        threshold = self.threshold()
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'cancelled': self.cancelled,
+                'threshold_seconds': round(threshold, 3) if threshold is not None else None
+            }
+
+
+_hedger: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Hedger:
+    """Process-wide hedger configured from API_SETTINGS"""
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger(percentile=API_SETTINGS['hedge_percentile'],
+                             max_hedge_fraction=API_SETTINGS['hedge_max_fraction'],
+                             min_samples=API_SETTINGS['hedge_min_samples'],
+                             window=API_SETTINGS['latency_window'],
+                             max_workers=2 * API_SETTINGS['max_concurrency'])
+        return _hedger
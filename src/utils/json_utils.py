@@ -0,0 +1,273 @@
+"""
+JSON helpers for model responses
+
+``extract_json`` finds the first JSON object or array in a completion in a
+single pass, tolerating surrounding text, code fences and trailing commas,
+and closes a response cut off by a stop sequence or token limit when only
+whole members have to be dropped. ``IncrementalJSONParser`` reads a JSON
+object as it streams in and reports each top-level field as soon as its
+value is complete, so the UI can show the first fields of a campaign long
+before the whole response arrives.
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Characters that change the scanner state; everything else is skipped in bulk
+_STRUCTURAL = re.compile(r'["{}\[\],:]')
+_IN_STRING = re.compile(r'[\\"]')
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+class _Tokenizer:
+    """Structural characters of JSON text outside strings, resumable as text is appended"""
+
+    def __init__(self):
+        self.in_string = False
+        self.escape = False
+
+    def next(self, text: str, pos: int) -> Tuple[Optional[str], int]:
+        """
+        The next structural character at or after ``pos`` and the position after it
+
+        A '"' is returned when a string opens and when it closes; ``in_string``
+        tells which. Escaped characters and the rest of a string are skipped.
+
+        Returns:
+            Tuple[Optional[str], int]: The character, or None and the position
+                to resume from once more text has arrived
+        """
+        while True:
+            if self.escape:
+                if pos >= len(text):
+                    return None, pos
+                self.escape = False
+                pos += 1
+                continue
+
+            match = (_IN_STRING if self.in_string else _STRUCTURAL).search(text, pos)
+            if match is None:
+                return None, len(text)
+            char, pos = match.group(), match.end()
+
+            if self.in_string:
+                if char == '\\':
+                    self.escape = True
+                    continue
+                self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            return char, pos
+
+
+def extract_json(text: str, container: str = '{') -> Tuple[Optional[Any], bool]:
+    """
+    Parse the first balanced JSON object (or array) in a model response
+
+    Text before and after it, such as an explanation or code fences, is
+    ignored and trailing commas are dropped. If the response ends before the
+    value is closed, it is cut back to the last complete member and closed;
+    a half-written member, including an object or array cut off before its
+    first complete member, is dropped rather than guessed at.
+
+    Args:
+        text (str): Model response
+        container (str): '{' for an object, '[' for an array
+
+    Returns:
+        Tuple[Optional[Any], bool]: The parsed value, or None if there is none,
+            and whether a truncated value had to be closed
+    """
+    stripped = text.strip()
+    if stripped.startswith(container):
+        # Most responses are exactly the JSON value
+        try:
+            return json.loads(stripped), False
+        except json.JSONDecodeError:
+            pass
+
+    start = text.find(container)
+    if start == -1:
+        return None, False
+
+    stack: List[str] = []
+    dropped: List[int] = []      # Trailing commas
+    # (end, commas dropped, open containers, rollback): a point the value can be closed at. A
+    # container that has just opened carries the point before its member as the rollback.
+    safe: Optional[Tuple[int, int, Tuple[str, ...], Optional[tuple]]] = None
+    is_key = after_colon = False
+    last_comma: Optional[int] = None
+    end: Optional[int] = None
+    tokens = _Tokenizer()
+    pos = start
+
+    while True:
+        char, pos = tokens.next(text, pos)
+        if char is None:
+            break
+        index = pos - 1
+
+        if char == '"' and not tokens.in_string:
+            # A string closed; a value ends a member, a key does not
+            if not is_key:
+                safe = (pos, len(dropped), tuple(stack), None)
+            continue
+
+        if last_comma is not None and char not in '}]':
+            last_comma = None
+
+        if char == '"':
+            is_key = stack[-1] == '{' and not after_colon
+        elif char == ':':
+            after_colon = True
+        elif char in '{[':
+            stack.append(char)
+            after_colon = False
+            safe = (pos, len(dropped), tuple(stack), safe)
+        elif char in '}]':
+            if last_comma is not None and not text[last_comma + 1:index].strip():
+                dropped.append(last_comma)
+            last_comma = None
+            if not stack or _CLOSERS[stack.pop()] != char:
+                return None, False
+            after_colon = False
+            if not stack:
+                end = pos
+                break
+            safe = (pos, len(dropped), tuple(stack), None)
+        elif char == ',':
+            # Whatever preceded the comma at this depth was a complete value
+            if text[(safe[0] if safe else start):index].strip(' \t\r\n'):
+                safe = (index, len(dropped), tuple(stack), None)
+            last_comma = index
+            after_colon = False
+
+    repaired = end is None
+    if repaired:
+        if safe is None:
+            return None, False
+        # A container cut off before its first complete member is dropped with its member
+        while safe[3] is not None:
+            safe = safe[3]
+        end, kept, open_containers, _ = safe
+        dropped = dropped[:kept]
+        closing = ''.join(_CLOSERS[opener] for opener in reversed(open_containers))
+    else:
+        closing = ''
+
+    pieces, piece_start = [], start
+    for comma in dropped:
+        pieces.append(text[piece_start:comma])
+        piece_start = comma + 1
+    pieces.append(text[piece_start:end])
+    try:
+        return json.loads(''.join(pieces) + closing), repaired
+    except json.JSONDecodeError:
+        return None, False
+
+
+class IncrementalJSONParser:
+    """Top-level fields of a streamed JSON object, each emitted once its value is complete"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything fed so far, e.g. when a retried stream starts over"""
+        self.text = ''
+        self.fields: Dict[str, Any] = {}
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._member_start = 0
+        self._depth = 0
+        self._tokens = _Tokenizer()
+
+    @property
+    def done(self) -> bool:
+        """Whether the root object has been closed"""
+        return self._end is not None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add the next piece of the response
+
+        Text before the root object's opening brace is skipped.
+
+        Args:
+            chunk (str): Text received since the last call
+
+        Returns:
+            List[Tuple[str, Any]]: (key, value) of the fields this chunk completed
+        """
+        self.text += chunk
+        return self._scan()
+
+    def update(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        Parse the full text received so far
+
+        When ``text`` does not extend what was already parsed, the stream is
+        taken to have restarted and parsing begins again from scratch.
+
+        Args:
+            text (str): Everything received so far
+
+        Returns:
+            List[Tuple[str, Any]]: (key, value) of the fields completed since the last call
+        """
+        if text.startswith(self.text):
+            return self.feed(text[len(self.text):])
+        self.reset()
+        return self.feed(text)
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """The complete root object, or None while it is unfinished or invalid"""
+        if not self.done:
+            return None
+        try:
+            return json.loads(self.text[self._start:self._end])
+        except json.JSONDecodeError:
+            return None
+
+    def _scan(self) -> List[Tuple[str, Any]]:
+        text, pos, emitted = self.text, self._pos, []
+
+        if self._start is None:
+            pos = text.find('{', pos)
+            if pos == -1:
+                self._pos = len(text)
+                return emitted
+            self._start, self._member_start, self._depth = pos, pos + 1, 1
+            pos += 1
+
+        while not self.done:
+            char, pos = self._tokens.next(text, pos)
+            if char is None:
+                break
+
+            if char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(text[self._member_start:pos - 1], emitted)
+                    self._end = pos
+            elif char == ',' and self._depth == 1:
+                self._emit(text[self._member_start:pos - 1], emitted)
+                self._member_start = pos
+
+        self._pos = pos
+        return emitted
+
+    def _emit(self, member: str, emitted: List[Tuple[str, Any]]) -> None:
+        # A member is `"key": value`; malformed ones are left for the final parse to report
+        if not member.strip():
+            return
+        try:
+            parsed = json.loads(f"{{{member}}}")
+        except json.JSONDecodeError:
+            return
+        for key, value in parsed.items():
+            self.fields[key] = value
+            emitted.append((key, value))
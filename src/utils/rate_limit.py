@@ -0,0 +1,229 @@
+"""
+Client-side pacing for API calls
+
+A token-bucket ``RateLimiter`` keeps requests and tokens per minute under the
+provider's limits, and an ``AdaptiveConcurrencyLimiter`` adjusts how many
+calls may be in flight using AIMD: it backs off multiplicatively on rate
+limit errors or latency spikes and grows additively while responses are
+healthy. Both are shared by every caller in the process.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from config.settings import API_SETTINGS
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate_per_minute (float): Refill rate
+            capacity (Optional[float]): Burst size, defaults to one minute of refill
+            clock (Callable[[], float]): Monotonic clock in seconds
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` tokens; call only after ``wait_time`` returned 0"""
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits acquired together"""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.requests = TokenBucket(requests_per_minute, clock=clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock)
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+        self.acquired = 0
+
+    def acquire(self, tokens: float, timeout: Optional[float] = None) -> bool:
+        """
+        Block until one request and ``tokens`` tokens can be taken
+
+        Args:
+            tokens (float): Estimated tokens for the call (prompt plus completion)
+            timeout (Optional[float]): Give up after this many seconds
+
+        Returns:
+            bool: True if acquired, False on timeout
+        """
+        start = self.clock()
+        while True:
+            with self._lock:
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if wait == 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    self.acquired += 1
+                    self.total_wait += self.clock() - start
+                    return True
+            if timeout is not None and self.clock() - start + wait > timeout:
+                return False
+            self.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the debug panel"""
+        with self._lock:
+            return {
+                'acquired': self.acquired,
+                'total_wait_seconds': round(self.total_wait, 3),
+                'available_requests': round(self.requests.tokens, 2),
+                'available_tokens': round(self.tokens.tokens, 2)
+            }
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD controller for the number of in-flight calls"""
+
+    def __init__(self, initial: float, minimum: float = 1, maximum: float = 64,
+                 decrease_factor: float = 0.5, latency_spike_factor: float = 2.0,
+                 latency_smoothing: float = 0.1):
+        """
+        Args:
+            initial (float): Starting concurrency limit
+            minimum (float): Lowest limit after backing off
+            maximum (float): Highest limit reached by growth
+            decrease_factor (float): Multiplier applied on throttling or latency spikes
+            latency_spike_factor (float): Latency above this multiple of the
+                smoothed baseline counts as a spike
+            latency_smoothing (float): EWMA weight of each new latency sample
+        """
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.decrease_factor = decrease_factor
+        self.latency_spike_factor = latency_spike_factor
+        self.latency_smoothing = latency_smoothing
+        self.baseline_latency: Optional[float] = None
+        self.in_flight = 0
+        self.throttled = 0
+        self.spikes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a slot is free under the current limit"""
+        with self._condition:
+            while self.in_flight >= max(1, int(self.limit)):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency: Optional[float] = None, throttled: bool = False) -> None:
+        """
+        Free a slot and adjust the limit from the call's outcome
+
+        Args:
+            latency (Optional[float]): Call latency in seconds, None if the call failed early
+            throttled (bool): Whether the provider rejected the call as rate limited
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                self._decrease()
+            elif latency is not None:
+                baseline = self.baseline_latency
+                if baseline is not None and latency > baseline * self.latency_spike_factor:
+                    self.spikes += 1
+                    self._decrease()
+                else:
+                    # Additive increase: about +1 per limit's worth of healthy calls
+                    self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+                self.baseline_latency = latency if baseline is None else (
+                    (1 - self.latency_smoothing) * baseline + self.latency_smoothing * latency
+                )
+            self._condition.notify_all()
+
+    def _decrease(self) -> None:
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+
+    @contextmanager
+    def slot(self) -> Iterator[Dict[str, Any]]:
+        """
+        Hold a slot for the duration of a call
+
+        The yielded dict may be updated with ``throttled=True`` before the
+        block exits. Latency is measured automatically for calls that complete.
+        """
+        self.acquire()
+        outcome: Dict[str, Any] = {'throttled': False}
+        start = time.perf_counter()
+        completed = False
+        try:
+            yield outcome
+            completed = True
+        finally:
+            latency = time.perf_counter() - start if completed else None
+            self.release(latency=latency, throttled=outcome['throttled'])
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the debug panel"""
+        with self._condition:
+            return {
+                'limit': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'throttled': self.throttled,
+                'latency_spikes': self.spikes,
+                'baseline_latency': round(self.baseline_latency, 3) if self.baseline_latency else None
+            }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide rate limiter configured from API_SETTINGS"""
+    global _rate_limiter
+    with _limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(API_SETTINGS['requests_per_minute'],
+                                        API_SETTINGS['tokens_per_minute'])
+        return _rate_limiter
+
+
+def get_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    """Process-wide adaptive concurrency limiter configured from API_SETTINGS"""
+    global _concurrency_limiter
+    with _limiter_lock:
+        if _concurrency_limiter is None:
+            _concurrency_limiter = AdaptiveConcurrencyLimiter(
+                initial=API_SETTINGS['max_concurrency'],
+                minimum=API_SETTINGS['min_concurrency'],
+                maximum=API_SETTINGS['max_concurrency'],
+                latency_spike_factor=API_SETTINGS['latency_spike_factor']
+            )
+        return _concurrency_limiter
+
+
+def reset_limiters() -> None:
+    """Drop the process-wide limiters so the next use rebuilds them from API_SETTINGS"""
+    global _rate_limiter, _concurrency_limiter
+    with _limiter_lock:
+        _rate_limiter = _concurrency_limiter = None
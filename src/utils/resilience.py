@@ -0,0 +1,253 @@
+"""
+Retries, deadlines and circuit breaking for API calls
+
+``call_with_resilience`` retries transient failures with jittered
+exponential backoff, stops once the per-call deadline would be exceeded,
+and consults a ``CircuitBreaker`` so calls fail fast while the upstream is
+degraded instead of queueing behind doomed requests.
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional
+
+import anthropic
+
+from config.settings import API_SETTINGS
+
+# HTTP statuses worth retrying: timeout, conflict, rate limit and server errors
+_TRANSIENT_STATUSES = {408, 409, 429}
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call"""
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call and its retries run past the deadline"""
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether an API error is likely to succeed on retry"""
+    if isinstance(error, (anthropic.APITimeoutError, anthropic.APIConnectionError)):
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in _TRANSIENT_STATUSES or error.status_code >= 500
+    return False
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Server-requested delay from a ``retry-after`` header, if any"""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('retry-after') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(self, retry: int, rng: random.Random) -> float:
+        """Delay before retry number ``retry`` (0-based)"""
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker driven by consecutive transient failures"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            recovery_time (float): Seconds to stay open before letting a probe through
+            clock (Callable[[], float]): Monotonic clock in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may proceed; in half-open state only one probe at a time"""
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.recovery_time:
+                self.state = self.HALF_OPEN
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the circuit at the threshold or on a failed probe"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without recording an outcome"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """State for the debug panel"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'times_opened': self.times_opened
+            }
+
+
+@dataclass
+class ResilienceMetrics:
+    """Counters for retries, failures and time spent waiting"""
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    successes: int = 0
+    transient_failures: int = 0
+    permanent_failures: int = 0
+    deadline_exceeded: int = 0
+    circuit_rejections: int = 0
+    backoff_seconds: float = 0.0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def add(self, **counts: float) -> None:
+        """Increment counters by name"""
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot of the counters"""
+        with self._lock:
+            return {**asdict(self), 'backoff_seconds': round(self.backoff_seconds, 3)}
+
+
+def call_with_resilience(func: Callable[[float], Any],
+                         policy: RetryPolicy,
+                         breaker: CircuitBreaker,
+                         deadline: float,
+                         metrics: ResilienceMetrics,
+                         sleep: Callable[[float], None] = time.sleep,
+                         clock: Callable[[], float] = time.monotonic,
+                         rng: Optional[random.Random] = None) -> Any:
+    """
+    Call ``func`` with classified retries under a total deadline
+
+    Args:
+        func (Callable[[float], Any]): The call; receives the seconds remaining
+            before the deadline so it can pass them on as a request timeout
+        policy (RetryPolicy): Attempt limit and backoff
+        breaker (CircuitBreaker): Shared breaker for the upstream
+        deadline (float): Seconds allowed for all attempts and backoff
+        metrics (ResilienceMetrics): Counters to update
+        sleep (Callable[[float], None]): Sleep function
+        clock (Callable[[], float]): Monotonic clock in seconds
+        rng (Optional[random.Random]): Source of jitter
+
+    Returns:
+        Any: Result of the first successful attempt
+
+    Raises:
+        CircuitOpenError: If the breaker rejects the call
+        DeadlineExceeded: If no attempt succeeded before the deadline
+        Exception: The last error for permanent failures or exhausted retries
+    """
+    rng = rng or random.Random()
+    expires_at = clock() + deadline
+    metrics.add(calls=1)
+
+    for attempt in range(policy.max_attempts):
+        remaining = expires_at - clock()
+        if remaining <= 0:
+            metrics.add(deadline_exceeded=1)
+            raise DeadlineExceeded(f"API call exceeded its {deadline:.0f}s deadline")
+        if not breaker.allow():
+            metrics.add(circuit_rejections=1)
+            raise CircuitOpenError("API temporarily unavailable (circuit open), please retry shortly")
+
+        metrics.add(attempts=1)
+        try:
+            result = func(remaining)
+        except Exception as e:
+            if not is_transient(e):
+                breaker.release()
+                metrics.add(permanent_failures=1)
+                raise
+            breaker.record_failure()
+            metrics.add(transient_failures=1)
+            if attempt + 1 >= policy.max_attempts:
+                raise
+
+            delay = max(policy.backoff(attempt, rng), _retry_after(e) or 0.0)
+            if clock() + delay >= expires_at:
+                metrics.add(deadline_exceeded=1)
+                raise DeadlineExceeded(f"API call exceeded its {deadline:.0f}s deadline") from e
+            metrics.add(retries=1, backoff_seconds=delay)
+            sleep(delay)
+            continue
+
+        breaker.record_success()
+        metrics.add(successes=1)
+        return result
+
+
+_breaker: Optional[CircuitBreaker] = None
+_metrics = ResilienceMetrics()
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Process-wide breaker for the Anthropic API"""
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(API_SETTINGS['breaker_failure_threshold'],
+                                      API_SETTINGS['breaker_recovery_seconds'])
+        return _breaker
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Retry policy configured from API_SETTINGS"""
+    return RetryPolicy(max_attempts=API_SETTINGS['max_retries'] + 1,
+                       base_delay=API_SETTINGS['retry_base_delay'],
+                       max_delay=API_SETTINGS['retry_max_delay'])
+
+
+def get_resilience_metrics() -> ResilienceMetrics:
+    """Process-wide retry and failure counters"""
+    return _metrics
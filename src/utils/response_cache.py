@@ -0,0 +1,94 @@
+"""
+Durable cache of LLM completions keyed by request parameters and normalized prompt
+"""
+import hashlib
+import json
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from config.settings import CACHE_SETTINGS
+from utils.cache_utils import CacheStats, SQLiteCache
+
+_WHITESPACE = re.compile(r'[ \t]+')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize insignificant whitespace so formatting-only differences share a cache entry"""
+    lines = (_WHITESPACE.sub(' ', line).strip() for line in prompt.strip().splitlines())
+    return '\n'.join(lines)
+
+
+def response_cache_key(prompt: str, model: str, temperature: float, max_tokens: int) -> str:
+    """Hash of the model, sampling parameters and normalized prompt"""
+    payload = json.dumps(
+        [model, float(temperature), int(max_tokens), normalize_prompt(prompt)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed store of API responses with TTL and size caps"""
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Args:
+            path (str): SQLite database file
+            ttl (Optional[float]): Time to live in seconds
+            max_entries (Optional[int]): Maximum number of stored responses
+            max_bytes (Optional[int]): Maximum total size of stored responses
+        """
+        self._store = SQLiteCache(
+            path,
+            ttl=ttl,
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            table='responses',
+            serializer=lambda value: json.dumps(value).encode('utf-8'),
+            deserializer=lambda payload: json.loads(payload.decode('utf-8'))
+        )
+
+    def get(self, prompt: str, model: str, temperature: float,
+            max_tokens: int) -> Optional[Dict[str, Any]]:
+        """Cached response for these request parameters, or None"""
+        found, value = self._store.get(response_cache_key(prompt, model, temperature, max_tokens))
+        return value if found else None
+
+    def set(self, prompt: str, model: str, temperature: float, max_tokens: int,
+            response: Dict[str, Any]) -> None:
+        """Store a response for these request parameters"""
+        self._store.set(response_cache_key(prompt, model, temperature, max_tokens), response)
+
+    def discard(self, prompt: str, model: str, temperature: float, max_tokens: int) -> None:
+        """Drop a stored response, e.g. one that failed validation"""
+        self._store.delete(response_cache_key(prompt, model, temperature, max_tokens))
+
+    def clear(self) -> None:
+        """Remove all stored responses"""
+        self._store.clear()
+
+    def stats(self) -> CacheStats:
+        """Hit/miss counters and current size"""
+        return self._store.stats()
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process's response cache, or None when CACHE_SETTINGS['response_cache_path'] is empty"""
+    global _response_cache
+    if not CACHE_SETTINGS['response_cache_path']:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                CACHE_SETTINGS['response_cache_path'],
+                ttl=CACHE_SETTINGS['response_ttl'],
+                max_entries=CACHE_SETTINGS['response_max_entries'],
+                max_bytes=CACHE_SETTINGS['response_max_bytes']
+            )
+        return _response_cache
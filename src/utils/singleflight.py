@@ -0,0 +1,65 @@
+"""
+Coalescing of identical in-flight calls
+
+With ``SingleFlight.do`` the first caller for a key runs the function while
+later callers for the same key wait on its future and receive the same
+result or exception, so a burst of identical requests does the work once.
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its outcome"""
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Call ``func``, or join an in-flight call with the same key
+
+        Args:
+            key (str): Identity of the call, e.g. a hash of its inputs
+            func (Callable[[], Any]): The work to run if no call is in flight
+
+        Returns:
+            Any: Result of the (shared) call; its exception is raised to every caller
+        """
+        with self._lock:
+            self.calls += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed"""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the debug panel"""
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
@@ -0,0 +1,136 @@
+"""
+Token estimation and per-call token accounting
+
+``estimate_tokens`` approximates the model's tokenizer closely enough for
+budgeting. ``TokenLedger`` records prompt and completion tokens for every
+API call, tracks completion lengths per customer segment to size
+``max_tokens`` from what responses actually need, and totals the tokens
+saved by compact prompts and smaller completion reservations. It also
+tracks how often a call's static prompt prefix was already sent before,
+which is the share of calls a provider-side prompt cache can serve.
+"""
+import hashlib
+import math
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config.settings import API_SETTINGS
+
+# Words, numbers, single symbols and runs of indentation each cost about one token
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+| {2,}|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``; long words count one token per six characters"""
+    return sum(1 + len(piece) // 6 for piece in _TOKEN_PIECES.findall(text)) + 1
+
+
+def estimate_joined_tokens(*counts: int) -> int:
+    """``estimate_tokens`` of texts joined by blank lines, from the estimate of each text"""
+    # Pieces never span a line break, so only the one-token floor is counted more than once
+    return sum(counts) - (len(counts) - 1)
+
+
+class TokenLedger:
+    """Running token totals and per-segment completion lengths"""
+
+    def __init__(self, window: int = 200, max_prefixes: int = 1024):
+        """
+        Args:
+            window (int): Completion lengths kept per segment
+            max_prefixes (int): Distinct prompt prefixes remembered for reuse tracking
+        """
+        self.window = window
+        self.max_prefixes = max_prefixes
+        self._completions: Dict[str, deque] = {}
+        self._prefixes: OrderedDict = OrderedDict()
+        self.prefix_calls = 0
+        self.prefix_reuses = 0
+        self.cache_read_tokens = 0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.reserved_tokens = 0
+        self.prompt_tokens_saved = 0
+        self.reserved_tokens_saved = 0
+
+    def record(self, prompt_tokens: int, completion_tokens: int, max_tokens: int) -> None:
+        """Record one API call and the completion tokens it reserved"""
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.reserved_tokens += max_tokens
+            self.reserved_tokens_saved += max(0, API_SETTINGS['default_max_tokens'] - max_tokens)
+
+    def observe(self, segment: str, completion_tokens: int, prompt_tokens_saved: int = 0) -> None:
+        """Record a segment's completion length and the prompt tokens compaction saved"""
+        with self._lock:
+            self._completions.setdefault(segment, deque(maxlen=self.window)).append(completion_tokens)
+            self.prompt_tokens_saved += max(0, prompt_tokens_saved)
+
+    def record_prefix(self, prefix: str, cache_read_tokens: int = 0) -> None:
+        """Record the static prefix a call was sent with and any tokens read from the provider cache"""
+        digest = hashlib.sha256(prefix.encode('utf-8')).digest()
+        with self._lock:
+            self.prefix_calls += 1
+            self.cache_read_tokens += cache_read_tokens
+            if digest in self._prefixes:
+                self.prefix_reuses += 1
+                self._prefixes.move_to_end(digest)
+            else:
+                self._prefixes[digest] = None
+                if len(self._prefixes) > self.max_prefixes:
+                    self._prefixes.popitem(last=False)
+
+    def suggest_max_tokens(self, segment: str) -> int:
+        """
+        ``max_tokens`` for a segment from observed completion lengths
+
+        The 95th percentile with headroom, rounded up to a step so the value
+        (and with it the response cache key) changes rarely. Until enough
+        completions are observed, API_SETTINGS['default_max_tokens'] is used.
+        """
+        default = API_SETTINGS['default_max_tokens']
+        with self._lock:
+            samples = self._completions.get(segment)
+            if not samples or len(samples) < API_SETTINGS['max_tokens_min_samples']:
+                return default
+            observed = np.percentile(np.fromiter(samples, dtype=float), 95)
+
+        step = API_SETTINGS['max_tokens_step']
+        size = math.ceil(observed * API_SETTINGS['max_tokens_headroom'] / step) * step
+        return int(min(default, max(step, size)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals and savings for the debug panel"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'reserved_tokens': self.reserved_tokens,
+                'prompt_tokens_saved': self.prompt_tokens_saved,
+                'reserved_tokens_saved': self.reserved_tokens_saved,
+                'prefix_calls': self.prefix_calls,
+                'prefix_reuse_rate': self.prefix_reuses / self.prefix_calls if self.prefix_calls else 0.0,
+                'cache_read_tokens': self.cache_read_tokens
+            }
+
+
+_ledger: Optional[TokenLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_token_ledger() -> TokenLedger:
+    """Process-wide token ledger"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = TokenLedger()
+        return _ledger
@@ -0,0 +1,85 @@
+import copy
+import json
+import re
+import threading
+import time
+
+import pytest
+
+CAMPAIGN = {
+    'primary_message': 'Primary',
+    'secondary_message': 'Secondary',
+    'visual_elements': {'color_scheme': 'Gold', 'imagery': 'City', 'layout': 'Grid',
+                        'visual_hierarchy': 'Headline first'},
+    'channel_strategy': {'primary_channels': ['Email'], 'secondary_channels': [],
+                         'channel_specific_adaptations': {}},
+    'personalization_elements': {'key_variables': [], 'dynamic_content': [],
+                                 'personalization_rules': 'By segment'},
+    'tone_guidelines': {'voice': 'Warm', 'style': 'Clear', 'language_level': 'Plain'}
+}
+
+
+class StandInLLM:
+    """Local stand-in for make_api_call that answers every prompt with a valid campaign
+
+    Packed prompts get a JSON array with one campaign per ``Customer ID:`` line,
+    leaving out the ids in ``drop``. ``answers`` maps a prompt substring to the
+    campaign (dict) or raw completion (str) to send instead. Prompts, prefixes
+    and peak concurrency are recorded; pickling drops the lock, so instances can
+    be handed to worker processes.
+    """
+
+    def __init__(self, campaign, delay=0.0, answers=None, drop=()):
+        self.campaign = campaign
+        self.delay = delay
+        self.answers = answers or {}
+        self.drop = set(drop)
+        self.prompts = []
+        self.prefixes = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt, prefix=None, use_cache=True, **kwargs):
+        with self.lock:
+            self.prompts.append(prompt)
+            self.prefixes.append(prefix)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return {'completion': self._completion(prompt), 'cached': use_cache}
+
+    def _completion(self, prompt):
+        ids = re.findall(r'^Customer ID: (\S+)$', prompt, flags=re.MULTILINE)
+        if ids:
+            return json.dumps([{'customer_id': customer_id, **self.campaign}
+                               for customer_id in ids if customer_id not in self.drop])
+        for marker, answer in self.answers.items():
+            if marker in prompt:
+                return answer if isinstance(answer, str) else json.dumps(answer)
+        return json.dumps(self.campaign)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+
+@pytest.fixture
+def campaign():
+    """A complete campaign response that passes validation"""
+    return copy.deepcopy(CAMPAIGN)
+
+
+@pytest.fixture
+def stand_in_llm(campaign):
+    """Factory for ``StandInLLM`` instances answering with ``campaign``"""
+    def make(**options):
+        return StandInLLM(campaign, **options)
+    return make
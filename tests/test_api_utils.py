@@ -0,0 +1,192 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from config.settings import CACHE_SETTINGS
+from utils import api_utils, response_cache, token_ledger
+from utils.api_utils import make_api_call
+from utils.response_cache import ResponseCache, normalize_prompt, response_cache_key
+
+
+class FakeCompletions:
+    """Local stand-in for the Anthropic completions endpoint"""
+
+    def __init__(self, completion='{"primary_message": "Hello"}'):
+        self.completion = completion
+        self.prompts = []
+
+    def create(self, **kwargs):
+        self.prompts.append(kwargs['prompt'])
+        return SimpleNamespace(completion=self.completion)
+
+
+@pytest.fixture
+def fake_client(monkeypatch, tmp_path):
+    monkeypatch.setitem(CACHE_SETTINGS, 'response_cache_path', str(tmp_path / 'responses.db'))
+    monkeypatch.setattr(response_cache, '_response_cache', None)
+    client = SimpleNamespace(completions=FakeCompletions())
+    monkeypatch.setattr(api_utils, 'get_client', lambda: client)
+    return client
+
+
+def test_normalized_prompts_share_a_key():
+    assert normalize_prompt("  Segment:   Premium \n\nName\t x ") == "Segment: Premium\n\nName x"
+    assert (response_cache_key("a  b", 'claude-2', 0.5, 100) ==
+            response_cache_key("a b ", 'claude-2', 0.5, 100))
+    assert (response_cache_key("a b", 'claude-2', 0.5, 100) !=
+            response_cache_key("a b", 'claude-2', 0.7, 100))
+
+
+def test_response_cache_round_trip(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'responses.db'), max_entries=10)
+    cache.set('prompt', 'claude-2', 0.5, 100, {'completion': '{}'})
+
+    assert cache.get('prompt ', 'claude-2', 0.5, 100) == {'completion': '{}'}
+    cache.discard('prompt', 'claude-2', 0.5, 100)
+    assert cache.get('prompt', 'claude-2', 0.5, 100) is None
+
+
+def test_make_api_call_uses_response_cache(fake_client):
+    first = make_api_call("Create a campaign")
+    second = make_api_call("Create a campaign")
+    forced = make_api_call("Create a campaign", use_cache=False)
+
+    completion = '{"primary_message": "Hello"}'
+    assert first['completion'] == second['completion'] == forced['completion'] == completion
+    # Only responses that came from the API carry token usage
+    assert 'usage' in first and 'usage' in forced and 'usage' not in second
+    assert second['cached'] and 'cached' not in first and 'cached' not in forced
+    assert len(fake_client.completions.prompts) == 2
+
+
+def test_forced_call_replaces_cached_response(fake_client):
+    make_api_call("Create a campaign")
+    fake_client.completions.completion = '{"primary_message": "Fresh"}'
+
+    forced = make_api_call("Create a campaign", use_cache=False)
+    later = make_api_call("Create a campaign")
+
+    assert forced['completion'] == later['completion'] == '{"primary_message": "Fresh"}'
+    assert later['cached'] and len(fake_client.completions.prompts) == 2
+
+
+def test_forced_call_does_not_join_a_normal_call_in_flight(fake_client):
+    started, release = threading.Event(), threading.Event()
+    completions = iter(['{"primary_message": "Old"}', '{"primary_message": "Fresh"}'])
+
+    def create(**kwargs):
+        fake_client.completions.prompts.append(kwargs['prompt'])
+        completion = next(completions)
+        if not started.is_set():
+            started.set()
+            release.wait(5)
+        return SimpleNamespace(completion=completion)
+
+    fake_client.completions.create = create
+    normal = {}
+    thread = threading.Thread(target=lambda: normal.update(make_api_call("Create a campaign")))
+    thread.start()
+    started.wait(5)
+
+    forced = make_api_call("Create a campaign", use_cache=False)
+    release.set()
+    thread.join(5)
+
+    assert forced['completion'] == '{"primary_message": "Fresh"}'
+    assert normal['completion'] == '{"primary_message": "Old"}'
+    assert len(fake_client.completions.prompts) == 2
+
+
+def test_compact_prompt_is_smaller_and_recorded(fake_client):
+    ledger = token_ledger.get_token_ledger()
+    before = ledger.stats()
+    verbose = make_api_call("Create a campaign", compact=False)
+    compact = make_api_call("Create a campaign", compact=True)
+
+    assert compact['usage']['prompt_tokens'] < verbose['usage']['prompt_tokens']
+    assert "Remember:" not in fake_client.completions.prompts[-1]
+    stats = ledger.stats()
+    assert stats['calls'] == before['calls'] + 2
+    assert stats['prompt_tokens'] == (before['prompt_tokens'] + verbose['usage']['prompt_tokens'] +
+                                      compact['usage']['prompt_tokens'])
+
+
+class FakeMessages:
+    """Local stand-in for a Messages endpoint that records the cached system prefixes it receives"""
+
+    def __init__(self):
+        self.prefixes = []
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        if 'system' not in kwargs:
+            return SimpleNamespace(content=[SimpleNamespace(type='text', text='{"primary_message": "Hi"}')])
+        block, = kwargs['system']
+        assert block['cache_control'] == {'type': 'ephemeral'}
+        cache_read = 100 if block['text'] in self.prefixes else 0
+        self.prefixes.append(block['text'])
+        return SimpleNamespace(content=[SimpleNamespace(type='text', text='{"primary_message": "Hi"}')],
+                               usage=SimpleNamespace(cache_read_input_tokens=cache_read))
+
+
+def test_stable_prefix_is_sent_as_cached_system_block(fake_client):
+    fake_client.messages = FakeMessages()
+    ledger = token_ledger.get_token_ledger()
+    before = ledger.stats()
+
+    for customer in ('Customer A', 'Customer B', 'Customer C'):
+        response = make_api_call(f"Banking details: {customer}", prefix="Shared instructions",
+                                 compact=False)
+        assert response['completion'] == '{"primary_message": "Hi"}'
+
+    prefixes = fake_client.messages.prefixes
+    assert len(set(prefixes)) == 1 and prefixes[0].endswith("\n\nShared instructions")
+    assert fake_client.completions.prompts == []
+    stats = ledger.stats()
+    assert stats['prefix_calls'] - before['prefix_calls'] == 3
+    assert stats['cache_read_tokens'] - before['cache_read_tokens'] == 200
+
+
+def test_prompt_without_prefix_sends_no_system_block(fake_client):
+    fake_client.messages = FakeMessages()
+
+    make_api_call("Banking details: Customer A")
+
+    request, = fake_client.messages.requests
+    assert 'system' not in request
+    assert "Banking details: Customer A" in request['messages'][0]['content']
+
+
+def test_completions_prompt_starts_with_stable_prefix(fake_client):
+    for customer in ('Customer A', 'Customer B'):
+        make_api_call(f"Banking details: {customer}", prefix="Shared instructions", compact=True)
+
+    first, second = fake_client.completions.prompts
+    stable = first[:first.index("Banking details:")]
+    assert stable.endswith("Shared instructions\n\n") and second.startswith(stable)
+
+
+class StreamingCompletions(FakeCompletions):
+    """Completions stand-in that streams its completion in small chunks when asked to"""
+
+    def create(self, **kwargs):
+        if not kwargs.get('stream'):
+            return super().create(**kwargs)
+        self.prompts.append(kwargs['prompt'])
+        return (SimpleNamespace(completion=self.completion[i:i + 5]) for i in range(0, len(self.completion), 5))
+
+
+def test_streamed_response_is_passed_on_as_it_grows(fake_client):
+    fake_client.completions = StreamingCompletions('{"primary_message": "Hello", "secondary_message": "Bye"}')
+    received = []
+
+    response = make_api_call("Stream a campaign", on_text=received.append)
+    assert response['completion'] == fake_client.completions.completion
+    assert len(received) > 5 and received[-1] == response['completion']
+    assert all(later.startswith(earlier) for earlier, later in zip(received, received[1:]))
+
+    # A cached response is passed on whole
+    cached = []
+    make_api_call("Stream a campaign", on_text=cached.append)
+    assert cached == [response['completion']] and len(fake_client.completions.prompts) == 1
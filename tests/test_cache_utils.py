@@ -0,0 +1,200 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from utils import cache_utils
+from utils.cache_utils import LRUCache, SQLiteCache, async_cache_data, make_cache_key
+
+
+def test_keys_depend_on_arguments():
+    def func():
+        pass
+
+    first = pd.Series({'customer_id': 'a', 'product_holdings': ['Savings Account']})
+    same = pd.Series({'customer_id': 'a', 'product_holdings': ['Savings Account']})
+    other = pd.Series({'customer_id': 'b', 'product_holdings': ['Savings Account']})
+
+    assert make_cache_key(func, (first,), {}) == make_cache_key(func, (same,), {})
+    assert make_cache_key(func, (first,), {}) != make_cache_key(func, (other,), {})
+    assert make_cache_key(func, (1,), {}) != make_cache_key(func, (1.0,), {})
+
+
+def test_dataframe_keys():
+    def func():
+        pass
+
+    frame = pd.DataFrame({'a': [1, 2], 'b': [['x'], ['y']]})
+    changed = pd.DataFrame({'a': [1, 2], 'b': [['x'], ['z']]})
+
+    assert make_cache_key(func, (frame,), {}) == make_cache_key(func, (frame.copy(),), {})
+    assert make_cache_key(func, (frame,), {}) != make_cache_key(func, (changed,), {})
+
+
+def test_lru_eviction_and_ttl():
+    cache = LRUCache(ttl=None, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    assert cache.stats().evictions == 1
+
+    cache.set('short', 'value', ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get('short') == (False, None)
+    assert cache.stats().expirations == 1
+
+
+def test_byte_bound():
+    cache = LRUCache(max_bytes=10_000)
+    for index in range(10):
+        cache.set(str(index), 'x' * 3000)
+
+    assert cache.stats().bytes <= 10_000
+    assert cache.stats().evictions > 0
+
+
+def test_decorator_caches_per_argument():
+    calls = []
+
+    @async_cache_data(ttl=60)
+    def insights(customer: pd.Series):
+        calls.append(customer['customer_id'])
+        return {'customer_id': customer['customer_id']}
+
+    for customer_id in ['a', 'b', 'a', 'b']:
+        result = insights(pd.Series({'customer_id': customer_id}))
+        assert result['customer_id'] == customer_id
+
+    assert calls == ['a', 'b']
+    assert insights.cache_info().hits == 2
+    assert insights.cache_info().misses == 2
+
+
+def test_sqlite_cache_round_trip(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.db'), max_entries=2)
+    cache.set('a', {'value': 1})
+    cache.set('b', [1, 2])
+    cache.get('a')
+    cache.set('c', 'third')
+
+    assert cache.get('a') == (True, {'value': 1})
+    assert cache.get('b') == (False, None)
+    assert len(cache) == 2
+
+    # A second handle on the same file sees the same entries
+    assert SQLiteCache(str(tmp_path / 'cache.db')).get('c') == (True, 'third')
+
+
+def test_sqlite_cache_evicts_with_headroom(tmp_path, monkeypatch):
+    cache = SQLiteCache(str(tmp_path / 'cache.db'), max_entries=100)
+    counts = []
+    totals = cache._totals
+    monkeypatch.setattr(cache, '_totals', lambda conn: counts.append(1) or totals(conn))
+
+    for i in range(101):
+        cache.set(str(i), i)
+    # Only the write that passed the limit counted the table, and it evicted to 90%
+    assert len(counts) == 1 and len(cache) == 90
+    assert cache.get('0') == (False, None) and cache.get('100') == (True, 100)
+
+    for i in range(101, 110):
+        cache.set(str(i), i)
+    assert len(counts) == 1 and len(cache) == 99
+
+
+def test_promoted_entries_keep_their_expiry(monkeypatch):
+    calls = []
+    clock = [1000.0]
+    monkeypatch.setattr(cache_utils.time, 'monotonic', lambda: clock[0])
+
+    @async_cache_data(ttl=60, shared=True)
+    def campaign(customer_id):
+        calls.append(customer_id)
+        return {'customer_id': customer_id}
+
+    campaign('a')
+    monkeypatch.setattr(cache_utils, '_local_caches', {})
+    clock[0] += 50
+    campaign('a')  # Promoted from the shared tier with 10 seconds left
+    clock[0] += 15
+    campaign('a')
+    assert calls == ['a', 'a']
+
+
+def test_shared_tier_serves_other_sessions(monkeypatch):
+    calls = []
+
+    @async_cache_data(ttl=60, shared=True)
+    def campaign(customer_id):
+        calls.append(customer_id)
+        return {'customer_id': customer_id}
+
+    campaign('a')
+    # A new session starts with an empty session tier
+    monkeypatch.setattr(cache_utils, '_local_caches', {})
+    assert campaign('a') == {'customer_id': 'a'}
+    assert calls == ['a']
+
+
+def test_namespace_change_misses(monkeypatch):
+    calls = []
+    version = ['v1']
+
+    @async_cache_data(ttl=60, namespace=lambda: version[0])
+    def campaign(customer_id):
+        calls.append(customer_id)
+        return {'customer_id': customer_id}
+
+    campaign('a')
+    version[0] = 'v2'
+    campaign('a')
+    assert calls == ['a', 'a']
+
+
+def test_guidelines_version_is_rechecked_on_an_interval(monkeypatch):
+    versions = []
+
+    def guidelines_version():
+        versions.append(len(versions))
+        return f"v{versions[-1]}"
+
+    monkeypatch.setattr(cache_utils, 'get_guidelines_version', guidelines_version)
+    monkeypatch.setattr(cache_utils, '_namespace', None)
+    monkeypatch.setitem(cache_utils.CACHE_SETTINGS, 'namespace_check_interval', 60)
+
+    first = cache_utils.cache_namespace()
+    assert [cache_utils.cache_namespace() for _ in range(100)] == [first] * 100
+    assert versions == [0]
+
+    monkeypatch.setattr(cache_utils, '_namespace_checked_at', time.monotonic() - 61)
+    assert cache_utils.cache_namespace() != first
+    assert versions == [0, 1]
+
+
+def test_coalesced_misses_share_one_call():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    @async_cache_data(ttl=60, namespace=None, coalesce=True)
+    def insights(customer_id):
+        calls.append(customer_id)
+        started.set()
+        release.wait(5)
+        return {'customer_id': customer_id}
+
+    coalesced = cache_utils.get_inflight_stats()['coalesced']
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(insights, 'a')
+        started.wait(5)
+        followers = [executor.submit(insights, 'a') for _ in range(3)]
+        while cache_utils.get_inflight_stats()['coalesced'] < coalesced + 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert calls == ['a']
+    assert all(result == {'customer_id': 'a'} for result in results)
@@ -0,0 +1,88 @@
+import json
+import time
+from functools import partial
+
+import pytest
+from data.synthetic_data import generate_synthetic_data
+from config.settings import API_SETTINGS
+from models.campaign_generator import generate_campaigns, plan_packs
+
+@pytest.fixture
+def customers():
+    return generate_synthetic_data(24, seed=8)
+
+
+def test_batch_respects_concurrency_limit(customers, stand_in_llm):
+    llm = stand_in_llm(delay=0.05)
+    start = time.perf_counter()
+    results = list(generate_campaigns(customers, max_concurrency=6, api_call=llm))
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 24
+    assert all(result.success for result in results)
+    assert llm.peak == 6
+    # 24 calls of 50ms at 6-way concurrency take about 4 rounds, not 24
+    assert elapsed < 24 * llm.delay / 2
+    assert {result.customer_id for result in results} == set(customers['customer_id'])
+
+
+def test_batch_reports_failures_without_aborting(customers, stand_in_llm):
+    segment = customers['customer_segment'].iloc[0]
+    llm = stand_in_llm(answers={f"Segment: {segment}": 'I apologize, I cannot help with that.'})
+    results = list(generate_campaigns(customers, max_concurrency=4, api_call=llm))
+
+    failed = [result for result in results if not result.success]
+    assert len(results) == 24
+    assert len(failed) == (customers['customer_segment'] == segment).sum()
+    assert all(result.error == "No valid JSON found in response" for result in failed)
+    assert all(result.campaign['metadata']['customer_segment'] != segment
+               for result in results if result.success)
+
+
+def test_packed_batch_retries_only_missing_customers(customers, stand_in_llm):
+    dropped = customers['customer_id'].iloc[0]
+    llm = stand_in_llm(drop={dropped})
+    results = list(generate_campaigns(customers, max_concurrency=4, api_call=llm,
+                                      packed=True, pack_size=4))
+
+    packs = plan_packs(customers, pack_size=4)
+    packed_prompts = [prompt for prompt in llm.prompts if 'Customer ID:' in prompt]
+    assert len(results) == 24 and all(result.success for result in results)
+    assert {result.customer_id for result in results} == set(customers['customer_id'])
+    assert len(packed_prompts) == sum(len(pack) > 1 for pack in packs) < 24
+    # Only the dropped customer (and any customer left alone in a pack) is sent individually
+    assert len(llm.prompts) - len(packed_prompts) == 1 + sum(len(pack) == 1 for pack in packs)
+
+
+def test_packs_share_segment_and_fit_token_budget(customers, monkeypatch):
+    monkeypatch.setitem(API_SETTINGS, 'pack_token_budget', 5000)
+    packs = plan_packs(customers, pack_size=8)
+
+    assert sum(len(pack) for pack in packs) == 24
+    for pack in packs:
+        assert len({(c['customer_segment'], c['digital_engagement']) for _, c in pack}) == 1
+        assert len(pack) <= 5000 // API_SETTINGS['campaign_completion_tokens']
+
+
+def budget_reporting_llm(campaign, prompt, **kwargs):
+    """Picklable stand-in that reports the worker's rate and concurrency limits"""
+    from utils.rate_limit import get_concurrency_limiter, get_rate_limiter
+    limiter = get_rate_limiter()
+    budget = (limiter.requests.rate * 60, limiter.tokens.rate * 60, get_concurrency_limiter().maximum)
+    return {'completion': json.dumps({**campaign, 'primary_message': json.dumps(budget)})}
+
+
+def test_worker_processes_split_the_provider_budget(customers, campaign):
+    results = list(generate_campaigns(customers, max_concurrency=8,
+                                      api_call=partial(budget_reporting_llm, campaign), workers=2))
+
+    budgets = {tuple(json.loads(result.campaign['primary_message'])) for result in results}
+    assert budgets == {(API_SETTINGS['requests_per_minute'] / 2, API_SETTINGS['tokens_per_minute'] / 2,
+                        API_SETTINGS['max_concurrency'] // 2)}
+
+
+def test_batch_runs_in_worker_processes(customers, stand_in_llm):
+    results = list(generate_campaigns(customers, max_concurrency=2, api_call=stand_in_llm(), workers=2))
+
+    assert sorted(result.index for result in results) == list(customers.index)
+    assert all(result.success for result in results)
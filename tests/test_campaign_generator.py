@@ -1,5 +1,11 @@
+import json
+from types import SimpleNamespace
+
 import pytest
+from config.settings import API_SETTINGS, CACHE_SETTINGS
+from models import campaign_generator
 from models.campaign_generator import CampaignGenerator, generate_campaign
+from utils import api_utils, response_cache
 from datetime import datetime
 
 
@@ -98,4 +104,38 @@ def test_response_parsing(sample_persona):
     valid_response = '{"primary_message": "Test message"}'
     parsed_content = generator._parse_response(valid_response)
     assert parsed_content is not None
-    assert parsed_content['primary_message'] == 'Test message'
\ No newline at end of file
+    assert parsed_content['primary_message'] == 'Test message'
+
+def test_engine_generates_many_campaigns_with_one_setup(sample_persona, stand_in_llm):
+    llm = stand_in_llm(answers={'Age: 70': {'primary_message': 'Only this'}})
+    generator = CampaignGenerator(client=object(), settings={'compact_prompts': True}, api_call=llm)
+    personas = [{**sample_persona, 'customer_id': 'c1'},
+                {**sample_persona, 'customer_id': 'c2',
+                 'demographic': {**sample_persona['demographic'], 'age': 70}}]
+    results = sorted(generator.generate_many(personas, max_concurrency=2), key=lambda r: r.index)
+
+    assert [result.customer_id for result in results] == ['c1', 'c2']
+
+    assert results[0].success and results[0].campaign['metadata']['customer_segment'] == 'Premium'
+    assert not results[1].success
+    assert {issue.path for issue in results[1].validation_errors} >= {'secondary_message', 'tone_guidelines'}
+    # Both prompts share the compiled compact prefix
+    assert len(set(llm.prefixes)) == 1 and 'Brand Guidelines' in llm.prefixes[0]
+    assert generator.model_settings['max_concurrency'] == API_SETTINGS['max_concurrency']
+
+
+def test_engine_reads_the_response_cache_before_creating_a_client(sample_persona, campaign,
+                                                                   monkeypatch, tmp_path):
+    monkeypatch.setitem(CACHE_SETTINGS, 'response_cache_path', str(tmp_path / 'responses.db'))
+    monkeypatch.setattr(response_cache, '_response_cache', None)
+    completions = SimpleNamespace(create=lambda **kwargs: SimpleNamespace(completion=json.dumps(campaign)))
+    monkeypatch.setattr(api_utils, 'get_client', lambda: SimpleNamespace(completions=completions))
+    CampaignGenerator(sample_persona).generate()
+
+    # A warm re-run needs no API key
+    def missing_key():
+        raise ValueError("ANTHROPIC_API_KEY environment variable is required")
+    monkeypatch.setattr(api_utils, 'get_client', missing_key)
+    monkeypatch.setattr(campaign_generator, 'get_client', missing_key)
+
+    assert CampaignGenerator(sample_persona).generate()['primary_message'] == campaign['primary_message']
@@ -0,0 +1,57 @@
+import copy
+
+import numpy as np
+
+from models.campaign_validator import validate_campaign
+
+CAMPAIGN = {
+    'primary_message': '  Grow your savings  ',
+    'secondary_message': 'Open NetBank today',
+    'visual_elements': {'color_scheme': 'Gold', 'imagery': 'City', 'layout': 'Grid',
+                        'visual_hierarchy': 'Headline first', 'style': 'Modern'},
+    'channel_strategy': {'primary_channels': 'Email', 'secondary_channels': ['SMS', 3],
+                         'channel_specific_adaptations': {'Email': 'Short'}},
+    'personalization_elements': {'key_variables': ['tenure'], 'dynamic_content': [],
+                                 'personalization_rules': 'By segment'},
+    'tone_guidelines': {'voice': 'Warm', 'style': 'Clear', 'language_level': 'Plain'},
+    'legal_disclaimer': 'Terms apply',
+    'score': np.float64(0.5),
+    'metadata': {'generated_at': 'by the model'}
+}
+
+
+def test_valid_campaign_is_normalized_into_a_json_safe_copy():
+    original = copy.deepcopy(CAMPAIGN)
+    result = validate_campaign(CAMPAIGN)
+
+    assert result.valid and result.errors == []
+    value = result.value
+    assert value['primary_message'] == 'Grow your savings'
+    assert value['channel_strategy']['primary_channels'] == ['Email']
+    assert value['channel_strategy']['secondary_channels'] == ['SMS', '3']
+    assert value['visual_elements']['style'] == 'Modern'
+    assert value['score'] == 0.5 and type(value['score']) is float
+    assert 'metadata' not in value
+    assert list(value)[:2] == ['primary_message', 'secondary_message']
+    assert CAMPAIGN == original
+
+
+def test_all_errors_are_reported_at_once():
+    content = copy.deepcopy(CAMPAIGN)
+    del content['tone_guidelines']
+    del content['visual_elements']['visual_hierarchy']
+    content['primary_message'] = ' '
+    content['channel_strategy']['secondary_channels'] = ['SMS', None]
+    content['personalization_elements'] = 'Use their name'
+
+    result = validate_campaign(content)
+
+    assert result.value is None
+    assert {(issue.path, issue.code) for issue in result.errors} == {
+        ('primary_message', 'empty'),
+        ('visual_elements.visual_hierarchy', 'missing'),
+        ('channel_strategy.secondary_channels[1]', 'type'),
+        ('personalization_elements', 'type'),
+        ('tone_guidelines', 'missing'),
+    }
+    assert validate_campaign(['not', 'an', 'object']).errors[0].code == 'type'
@@ -0,0 +1,72 @@
+import json
+
+import pandas as pd
+import pytest
+
+import cli
+from data.synthetic_data import generate_synthetic_data
+from models.campaign_models import CampaignResult
+from models.campaign_validator import ValidationIssue
+
+@pytest.mark.parametrize('suffix', ['.jsonl', '.parquet'])
+def test_batch_streams_results_and_prints_summary(tmp_path, capsys, suffix, campaign, stand_in_llm):
+    output = tmp_path / f"campaigns{suffix}"
+    # Basic customers get a campaign missing its message
+    unsent = {key: value for key, value in campaign.items() if key != 'primary_message'}
+    llm = stand_in_llm(answers={"Segment: Basic": unsent})
+    status = cli.main(['--generate', '24', '--seed', '5', '--output', str(output), '--quiet',
+                       '--concurrency', '4'], api_call=llm)
+
+    customers = generate_synthetic_data(24, seed=5)
+    basic = int((customers['customer_segment'] == 'Basic').sum())
+    if suffix == '.jsonl':
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+    else:
+        records = pd.read_parquet(output).to_dict('records')
+        for record in records:
+            record['insights'] = json.loads(record['insights'])
+
+    assert status == 0
+    assert {record['customer_id'] for record in records} == set(customers['customer_id'])
+    assert sum(not record['success'] for record in records) == basic
+    assert all('churn_risk' in record['insights']['metrics'] for record in records)
+
+    summary = capsys.readouterr().out
+    assert "Customers:        24" in summary
+    assert f"Failed:           {basic}" in summary
+    # Rejected responses do not count as cache hits
+    assert f"Cache hit rate:   {(24 - basic) / 24:.1%}" in summary
+    assert "p50/p90/p99" in summary
+    if basic:
+        assert f"{basic}  primary_message: missing" in summary
+
+
+def test_load_customers_reads_list_columns_back_from_csv(tmp_path):
+    customers = generate_synthetic_data(12, seed=2)
+    path = tmp_path / 'customers.csv'
+    customers.to_csv(path, index=False)
+
+    loaded = cli.load_customers(str(path))
+
+    for column in ('primary_interests', 'product_holdings'):
+        assert loaded[column].tolist() == [list(items) for items in customers[column]]
+
+    customers.drop(columns=['income']).to_csv(path, index=False)
+    with pytest.raises(ValueError, match='income'):
+        cli.load_customers(str(path))
+
+
+def test_summary_groups_failures_by_reason(campaign):
+    summary = cli.BatchSummary()
+    issue = ValidationIssue('tone_guidelines.voice', 'empty', "must not be empty")
+    summary.add(CampaignResult(0, 'a', campaign, None, 0.1, cached=True))
+    summary.add(CampaignResult(1, 'b', None, "failed validation", 0.2, validation_errors=[issue]))
+    summary.add(CampaignResult(2, 'c', None, "failed validation", 0.3, validation_errors=[issue]))
+    summary.add(CampaignResult(3, 'd', None, "Failed to get API response", 0.4))
+
+    report = summary.format(elapsed=2.0)
+
+    assert summary.failed == 3
+    assert "Throughput:       2.00 customers/s" in report
+    assert "Cache hit rate:   25.0%" in report
+    assert report.index("2  tone_guidelines.voice: empty") < report.index("1  Failed to get API response")
@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import client_pool
+from utils.client_pool import ConnectionStats, build_http_client
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), OkHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sequential_requests_reuse_one_connection(server):
+    stats = ConnectionStats()
+    with build_http_client(stats) as http_client:
+        for _ in range(3):
+            assert http_client.get(server).text == 'ok'
+
+    assert stats.to_dict() == {'requests': 3, 'new_connections': 1, 'reuse_rate': 2 / 3}
+
+
+def test_client_is_created_once_across_threads(monkeypatch):
+    loads = []
+
+    def load_config():
+        loads.append(None)
+        return {'api_key': 'test-key'}
+
+    monkeypatch.setattr(client_pool, 'load_config', load_config)
+    client_pool.close_client()
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: client_pool.get_client(), range(16)))
+        assert len(loads) == 1
+        assert all(client is clients[0] for client in clients)
+        assert client_pool.client_pool_stats()['open_connections'] == 0
+    finally:
+        client_pool.close_client()
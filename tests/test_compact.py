@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from data.compact import (
+    POOLED_COLUMNS,
+    PRODUCTS,
+    count_mask,
+    decode_compact,
+    encode_compact,
+    encode_items,
+    get_product_count,
+    has_product
+)
+from data.synthetic_data import CustomerDataGenerator
+from models.customer_insights import calculate_metrics, generate_recommendations
+from models.campaign_generator import format_persona
+
+
+@pytest.fixture
+def datasets():
+    data = CustomerDataGenerator(seed=5).generate_dataset(200)
+    compact = CustomerDataGenerator(seed=5).generate_dataset(200, compact=True)
+    return data, compact
+
+
+def test_compact_generation_matches_encoding(datasets):
+    data, compact = datasets
+
+    assert compact['product_holdings_mask'].dtype == np.uint8
+    assert compact['primary_interests_mask'].dtype == np.uint16
+    assert compact['customer_segment'].dtype == 'category'
+    assert compact['location'].dtype == 'category'
+    assert decode_compact(compact).equals(data)
+
+    # Pooled columns get their categories from the data rather than the whole pool
+    encoded = encode_compact(data)
+    assert encoded.drop(columns=list(POOLED_COLUMNS)).equals(compact.drop(columns=list(POOLED_COLUMNS)))
+    for column in POOLED_COLUMNS:
+        assert encoded[column].astype(str).equals(compact[column].astype(str))
+
+
+def test_mask_helpers():
+    mask = encode_items(['Credit Card', 'Mortgage'], PRODUCTS)
+    row = {'product_holdings_mask': mask}
+
+    assert count_mask(mask) == 2
+    assert get_product_count(row) == 2
+    assert has_product(row, 'Mortgage')
+    assert not has_product(row, 'Insurance')
+
+
+def test_models_accept_compact_rows(datasets):
+    data, compact = datasets
+
+    for index in range(20):
+        row, compact_row = data.iloc[index], compact.iloc[index]
+        assert calculate_metrics(row) == calculate_metrics(compact_row)
+        assert generate_recommendations(row) == generate_recommendations(compact_row)
+        assert format_persona(row.to_dict()) == format_persona(compact_row.to_dict())
@@ -0,0 +1,49 @@
+import pytest
+from data.dataset_store import DatasetStore
+
+pytest.importorskip('pyarrow')
+
+
+def test_get_or_generate_round_trips(tmp_path):
+    store = DatasetStore(root=str(tmp_path), version='v1')
+
+    generated = store.get_or_generate(150, seed=4)
+    assert store.path_for(150, 4).exists()
+
+    loaded = store.load(150, 4)
+    assert loaded.equals(generated)
+    assert isinstance(loaded['product_holdings'].iloc[0], tuple)
+
+    compact = store.load(150, 4, compact_form=True)
+    assert 'product_holdings_mask' in compact.columns
+
+
+def test_unseeded_datasets_are_not_stored(tmp_path):
+    store = DatasetStore(root=str(tmp_path), version='v1')
+
+    first = store.get_or_generate(30, seed=None)
+    second = store.get_or_generate(30, seed=None)
+
+    assert len(first) == len(second) == 30
+    assert not first['customer_id'].equals(second['customer_id'])
+    assert not store.directory.exists()
+    with pytest.raises(ValueError, match='integer seed'):
+        store.save(first, 30, None)
+
+
+def test_invalidate_removes_other_versions(tmp_path):
+    DatasetStore(root=str(tmp_path), version='old').get_or_generate(20, seed=1)
+    store = DatasetStore(root=str(tmp_path), version='new')
+
+    assert store.load(20, 1) is None
+    assert store.invalidate() == 1
+    assert not (tmp_path / 'old').exists()
+
+
+def test_generator_fingerprint_is_computed_once(monkeypatch):
+    from data import dataset_store
+
+    first = dataset_store.generator_fingerprint()
+    monkeypatch.setattr(dataset_store.Path, 'read_bytes',
+                        lambda self: pytest.fail("generator source read again"))
+    assert DatasetStore().version == first
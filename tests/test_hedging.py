@@ -0,0 +1,71 @@
+import threading
+import time
+
+from utils.hedging import Hedger, LatencyHistogram
+
+
+def warmed_hedger(latency=0.01, **kwargs):
+    hedger = Hedger(percentile=50, min_samples=5, **kwargs)
+    for _ in range(10):
+        hedger.histogram.record(latency)
+    return hedger
+
+
+def test_histogram_percentile_over_rolling_window():
+    histogram = LatencyHistogram(window=3)
+    assert histogram.percentile(50) is None
+    for latency in (10.0, 1.0, 2.0, 3.0):
+        histogram.record(latency)
+
+    assert len(histogram) == 3
+    assert histogram.percentile(50) == 2.0
+
+
+def test_slow_call_is_hedged_and_hedge_wins():
+    hedger = warmed_hedger(max_hedge_fraction=1.0)
+    release = threading.Event()
+    calls = []
+
+    def func():
+        calls.append(None)
+        if len(calls) == 1:
+            release.wait(5)  # first leg hangs until the test ends
+            return 'slow'
+        return 'fast'
+
+    try:
+        assert hedger.call(func) == 'fast'
+    finally:
+        release.set()
+    assert hedger.stats()['hedged'] == 1 and hedger.stats()['hedge_wins'] == 1
+
+
+def test_invalid_first_response_waits_for_other_leg():
+    hedger = warmed_hedger(max_hedge_fraction=1.0)
+    calls = []
+
+    def func():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            return 'valid'
+        return ''
+
+    assert hedger.call(func, is_valid=bool) == 'valid'
+    assert hedger.stats()['hedge_wins'] == 0
+
+
+def test_hedge_fraction_caps_duplicates():
+    hedger = warmed_hedger(max_hedge_fraction=0.5)
+    calls = []
+
+    def slow():
+        calls.append(None)
+        time.sleep(0.05)
+        return 'ok'
+
+    for _ in range(4):
+        assert hedger.call(slow) == 'ok'
+
+    assert hedger.stats()['hedged'] == 2
+    assert len(calls) == 6
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from utils.json_utils import IncrementalJSONParser, extract_json
+
+CAMPAIGN = {
+    'primary_message': 'Save {more} with "Goal Saver", 3% p.a.\\n',
+    'secondary_message': 'Tap [here], in the app',
+    'visual_elements': {'color_scheme': '#FDB813, #000000', 'layout': {'grid': [1, 2]}},
+    'channel_strategy': {'primary_channels': ['CommBank App', 'Email']},
+    'score': 0.9
+}
+
+
+def test_fields_are_emitted_once_complete_when_fed_char_by_char():
+    text = 'Here is the campaign:\n' + json.dumps(CAMPAIGN, indent=2) + '\nThanks'
+    parser = IncrementalJSONParser()
+
+    emitted = []
+    for i, char in enumerate(text):
+        for key, value in parser.feed(char):
+            emitted.append((key, value, i))
+
+    assert [(key, value) for key, value, _ in emitted] == list(CAMPAIGN.items())
+    # The primary message is available long before the response ends
+    assert emitted[0][2] < len(text) // 3
+    assert parser.done and parser.result() == CAMPAIGN
+
+
+def test_update_with_restarted_text_reparses_from_scratch():
+    parser = IncrementalJSONParser()
+    assert parser.update('{"primary_message": "First"') == []
+    assert parser.update('{"primary_message": "First", ') == [('primary_message', 'First')]
+
+    # A retried stream starts over with different text
+    assert parser.update('{"primary_message": "Second", "x"') == [('primary_message', 'Second')]
+    assert parser.update('{"primary_message": "Second", "x": 1}') == [('x', 1)]
+    assert parser.result() == {'primary_message': 'Second', 'x': 1}
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"a": 1}', {'a': 1}),
+    ('Here you go:\n```json\n{"a": "x, }", "b": [1, 2,],}\n```\nAnything else? {"c": 1}',
+     {'a': 'x, }', 'b': [1, 2]}),
+    ('{"a": "say \\"{hi}\\"", "b": {"c": [true, null]}}', {'a': 'say "{hi}"', 'b': {'c': [True, None]}}),
+])
+def test_extract_json_finds_first_balanced_object(text, expected):
+    assert extract_json(text) == (expected, False)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"primary_message": "Hi",\n  "secondary_message": "Tap to', {'primary_message': 'Hi'}),
+    ('{"a": "x", "b": {"c": 1, "d": [1, 2', {'a': 'x', 'b': {'c': 1, 'd': [1]}}),
+    ('{"a": 1, "b": tr', {'a': 1}),
+    ('{"a": "x", "b":', {'a': 'x'}),
+])
+def test_extract_json_closes_truncated_objects(text, expected):
+    assert extract_json(text) == (expected, True)
+
+
+def test_extract_json_rejects_what_it_cannot_repair():
+    assert extract_json('No JSON here') == (None, False)
+    assert extract_json('{"a": "x"]') == (None, False)
+
+
+@pytest.mark.parametrize('text, container, expected', [
+    ('[{"id": 1}, {"id": 2', '[', [{'id': 1}]),
+    ('{"primary_message": "x", "visual_elements": {"color_scheme": "Go', '{', {'primary_message': 'x'}),
+    ('{"a": "x", "b": [{"c": [', '{', {'a': 'x'}),
+    ('{"a": {"b": "', '{', {}),
+])
+def test_extract_json_drops_containers_cut_before_their_first_member(text, container, expected):
+    assert extract_json(text, container=container) == (expected, True)
+
+
+def test_escape_split_across_chunks_is_skipped():
+    parser = IncrementalJSONParser()
+    emitted = []
+    for chunk in ['{"a": "x\\', '"}", ', '"b": 1}']:
+        emitted += parser.feed(chunk)
+    assert emitted == [('a', 'x"}'), ('b', 1)]
@@ -0,0 +1,61 @@
+import pytest
+
+from config.brand_guidelines import BRAND_GUIDELINES
+from data.synthetic_data import generate_synthetic_data
+from models.campaign_generator import format_persona, generate_campaign_prompt
+from models.prompt_compiler import PromptCompiler, build_campaign_prompt
+from utils.api_utils import build_complete_prompt, system_prompt
+from utils.token_ledger import estimate_joined_tokens, estimate_tokens
+
+
+@pytest.fixture(scope='module')
+def personas():
+    customers = generate_synthetic_data(60, seed=17)
+    return [format_persona(row.to_dict()) for _, row in customers.iterrows()]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_compiled_prompts_match_uncompiled(personas, compact):
+    compiler = PromptCompiler()
+
+    for persona in personas:
+        assert compiler.build(persona, compact) == build_campaign_prompt(persona, compact)
+        assert generate_campaign_prompt(persona, compact) == build_campaign_prompt(persona, compact)
+
+
+def test_prefix_is_shared_and_customer_data_is_in_suffix(personas):
+    prefixes = {}
+    for persona in personas:
+        prefix, suffix = generate_campaign_prompt(persona)
+        key = (persona['behavioral']['customer_segment'], persona['behavioral']['digital_engagement'])
+        assert prefixes.setdefault(key, prefix) == prefix
+        assert ', '.join(persona['psychographic']['preferred_channels']) in suffix
+        assert ', '.join(persona['psychographic']['interests']) not in prefix
+
+    # One prefix per segment and engagement level, much longer than a suffix
+    assert len(set(prefixes.values())) == len(prefixes)
+    assert all(len(prefix) > 4 * len(suffix) for prefix in prefixes.values())
+
+
+def test_cached_prefix_tokens_add_up_to_the_full_prompt_estimate(personas):
+    compiler = PromptCompiler()
+    system_tokens = estimate_tokens(system_prompt())
+
+    for persona in personas:
+        prefix, suffix = compiler.build(persona)
+        full = estimate_tokens(build_complete_prompt(suffix, prefix=prefix))
+        assert estimate_joined_tokens(system_tokens, compiler.prefix_tokens(persona),
+                                      estimate_tokens(suffix)) == full
+
+
+def test_prefixes_recompile_when_guidelines_change(personas, monkeypatch):
+    compiler = PromptCompiler(check_interval=0)
+    persona = next(p for p in personas if p['behavioral']['customer_segment'] == 'Premium')
+    before, _ = compiler.build(persona)
+
+    monkeypatch.setitem(BRAND_GUIDELINES['segments']['Premium'], 'tone', 'Warm and exclusive')
+    after, _ = compiler.build(persona)
+
+    assert after != before
+    assert '"voice": "Warm and exclusive"' in after
+    assert after == build_campaign_prompt(persona)[0]
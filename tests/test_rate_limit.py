@@ -0,0 +1,84 @@
+import threading
+import time
+
+from utils.rate_limit import AdaptiveConcurrencyLimiter, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(60, capacity=2, clock=clock)
+    bucket.consume(2)
+
+    assert bucket.wait_time(1) == 1.0
+    clock.now = 1.0
+    assert bucket.wait_time(1) == 0
+
+
+def test_rate_limiter_paces_requests_and_tokens():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=600,
+                          clock=clock, sleep=clock.sleep)
+    limiter.requests.tokens = 0
+
+    assert limiter.acquire(tokens=100)
+    assert clock.now == 1.0
+
+    # Token budget, not request budget, is the bottleneck here
+    limiter.tokens.tokens = 0
+    limiter.requests.tokens = 60
+    assert limiter.acquire(tokens=300)
+    assert clock.now == 31.0
+    assert not limiter.acquire(tokens=600, timeout=5)
+
+
+def test_aimd_shrinks_on_throttle_and_grows_back():
+    limiter = AdaptiveConcurrencyLimiter(initial=8, minimum=1, maximum=8)
+
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert limiter.limit == 4
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(latency=0.1)
+    assert 6 < limiter.limit <= 8
+
+    limiter.acquire()
+    limiter.release(latency=1.0)  # ten times the baseline
+    assert limiter.spikes == 1
+    assert limiter.limit < 6
+
+
+def test_concurrency_limit_is_enforced():
+    limiter = AdaptiveConcurrencyLimiter(initial=2, minimum=1, maximum=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def call():
+        with limiter.slot():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+from core.reporting import Reporter, get_reporter, set_reporter
+from models.campaign_generator import extract_json_content
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+class RecordingReporter(Reporter):
+    def __init__(self):
+        self.messages = []
+
+    def error(self, message):
+        self.messages.append(('error', message))
+
+    def detail(self, label, value):
+        self.messages.append((label, value))
+
+
+def test_core_modules_import_without_streamlit():
+    code = ("import sys, models.campaign_generator, models.customer_insights, data.dataset_store, "
+            "utils.api_utils; assert 'streamlit' not in sys.modules")
+    subprocess.run([sys.executable, '-c', code], cwd=SRC, check=True)
+
+
+def test_errors_go_to_the_installed_reporter():
+    reporter = RecordingReporter()
+    previous = set_reporter(reporter)
+    try:
+        assert extract_json_content('No JSON here') is None
+    finally:
+        set_reporter(previous)
+
+    assert reporter.messages == [('error', "No valid JSON structure found in response"),
+                                 ('Full response', 'No JSON here')]
+    assert get_reporter() is previous
@@ -0,0 +1,100 @@
+import random
+
+import anthropic
+import httpx
+import pytest
+
+from utils.resilience import (CircuitBreaker, CircuitOpenError, DeadlineExceeded,
+                              ResilienceMetrics, RetryPolicy, call_with_resilience)
+
+REQUEST = httpx.Request('POST', 'https://api.anthropic.com/v1/complete')
+
+
+def status_error(cls, status, headers=None):
+    response = httpx.Response(status, headers=headers, request=REQUEST)
+    return cls(f"status {status}", response=response, body=None)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def flaky(errors, result='ok'):
+    """Callable raising each of ``errors`` in turn, then returning ``result``"""
+    pending = list(errors)
+    calls = []
+
+    def func(remaining):
+        calls.append(remaining)
+        if pending:
+            raise pending.pop(0)
+        return result
+
+    func.calls = calls
+    return func
+
+
+def run(func, clock, breaker=None, deadline=60, max_attempts=4):
+    metrics = ResilienceMetrics()
+    result = call_with_resilience(func, RetryPolicy(max_attempts=max_attempts), breaker or CircuitBreaker(),
+                                  deadline, metrics, sleep=clock.sleep, clock=clock,
+                                  rng=random.Random(0))
+    return result, metrics
+
+
+def test_transient_errors_are_retried_with_backoff():
+    clock = FakeClock()
+    func = flaky([anthropic.APITimeoutError(REQUEST),
+                  status_error(anthropic.InternalServerError, 503)])
+
+    result, metrics = run(func, clock)
+
+    assert result == 'ok'
+    assert len(func.calls) == 3
+    assert metrics.retries == 2 and metrics.transient_failures == 2
+    assert metrics.backoff_seconds == pytest.approx(clock.now)
+    # Each attempt is told how much of the deadline is left
+    assert func.calls[0] == 60 and func.calls[2] == pytest.approx(60 - clock.now)
+
+
+def test_permanent_errors_are_not_retried():
+    clock = FakeClock()
+    func = flaky([status_error(anthropic.BadRequestError, 400)])
+
+    with pytest.raises(anthropic.BadRequestError):
+        run(func, clock)
+    assert len(func.calls) == 1
+
+
+def test_retry_after_beyond_deadline_fails_fast():
+    clock = FakeClock()
+    func = flaky([status_error(anthropic.RateLimitError, 429, {'retry-after': '30'})])
+
+    with pytest.raises(DeadlineExceeded):
+        run(func, clock, deadline=10)
+    assert clock.now == 0
+
+
+def test_circuit_opens_and_recovers_after_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=30, clock=clock)
+    failing = flaky([anthropic.APITimeoutError(REQUEST)] * 2)
+
+    with pytest.raises(anthropic.APITimeoutError):
+        run(failing, clock, breaker=breaker, max_attempts=2)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        run(flaky([]), clock, breaker=breaker)
+
+    clock.now += 30
+    result, _ = run(flaky([]), clock, breaker=breaker)
+    assert result == 'ok'
+    assert breaker.stats() == {'state': 'closed', 'consecutive_failures': 0, 'times_opened': 1}
@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.singleflight import SingleFlight
+
+
+def run_burst(flight, func, callers=5):
+    """Start a leader, wait until every other caller has joined, then let it finish"""
+    started, release = threading.Event(), threading.Event()
+
+    def leader():
+        started.set()
+        release.wait(5)
+        return func()
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(flight.do, 'key', leader)]
+        started.wait(5)
+        futures += [executor.submit(flight.do, 'key', func) for _ in range(callers - 1)]
+        while flight.stats()['coalesced'] < callers - 1:
+            pass
+        release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_identical_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+
+    results = run_burst(flight, lambda: calls.append(None) or len(calls))
+
+    assert results == [1] * 5
+    assert flight.stats() == {'calls': 5, 'coalesced': 4, 'in_flight': 0}
+    # Once the call has finished the next one runs again
+    assert flight.do('key', lambda: 'fresh') == 'fresh'
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    results = run_burst(flight, fail, callers=3)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.in_flight() == 0
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
@@ -0,0 +1,97 @@
+import uuid
+
+import numpy as np
+import pytest
+from data.synthetic_data import (
+    CustomerDataGenerator,
+    generate_synthetic_data,
+    generate_synthetic_chunks,
+    write_synthetic_parquet,
+    _city_pool
+)
+from config.settings import DATA_SETTINGS
+
+
+@pytest.fixture
+def generator():
+    return CustomerDataGenerator(seed=7)
+
+
+def test_columnar_schema_matches_row_mode(generator):
+    columnar = generator.generate_dataset(50)
+    rows = generator.generate_dataset(5, columnar=False)
+
+    assert list(columnar.columns) == list(rows.columns)
+    assert len(columnar) == 50
+
+
+def test_columnar_rules(generator):
+    data = generator.generate_dataset(2000)
+
+    assert data['age'].between(18, 75).all()
+    assert (data['relationship_tenure'] <= data['age'] - 18).all()
+    assert (data['num_products'] == data['product_holdings'].map(len)).all()
+    assert data['primary_interests'].map(len).between(2, 5).all()
+    assert data['preferred_channels'].map(len).between(2, 4).all()
+    assert data['product_holdings'].map(
+        lambda p: 'Savings Account' in p and 'Checking Account' in p
+    ).all()
+
+    # Derived columns follow the same thresholds as the per-row helpers
+    for _, row in data.head(200).iterrows():
+        assert row['life_stage'] == generator._determine_life_stage(row['age'])
+        assert row['customer_segment'] == generator._determine_segment(
+            row['income'], row['num_products'], row['relationship_tenure']
+        )
+
+
+def test_columnar_is_seeded():
+    first = CustomerDataGenerator(seed=3).generate_columns(100)
+    second = CustomerDataGenerator(seed=3).generate_columns(100)
+
+    assert np.array_equal(first['income'], second['income'])
+    assert np.array_equal(first['customer_segment'], second['customer_segment'])
+
+
+def test_sharded_generation_is_reproducible():
+    first = generate_synthetic_data(120, seed=11, workers=3)
+    second = generate_synthetic_data(120, seed=11, workers=3)
+
+    assert len(first) == 120
+    assert first['customer_id'].is_unique
+    assert first.equals(second)
+    assert {'engagement_score', 'churn_risk'} <= set(first.columns)
+
+
+def test_chunked_generation_respects_chunk_size():
+    chunks = list(generate_synthetic_chunks(250, chunk_size=100, seed=1))
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    assert 'churn_risk' in chunks[0].columns
+
+
+def test_write_synthetic_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    written = write_synthetic_parquet(str(tmp_path), 250, chunk_size=100, seed=1)
+    table = pq.read_table(str(tmp_path))
+
+    assert written == 250
+    assert table.num_rows == 250
+    assert (tmp_path / 'customer_segment=Premium').is_dir()
+
+
+def test_columnar_ids_and_cities_are_pooled(generator):
+    data = generator.generate_dataset(500)
+
+    assert data['customer_id'].map(lambda value: uuid.UUID(value).version == 4).all()
+    assert data['customer_id'].is_unique
+    assert set(data['location']) <= set(_city_pool(DATA_SETTINGS['city_pool_size']))
+
+
+def test_item_cells_are_immutable(generator):
+    data = generator.generate_dataset(300)
+
+    # Cells come from a process-wide lookup table shared by every dataset
+    for column in ('product_holdings', 'primary_interests', 'preferred_channels'):
+        assert data[column].map(lambda items: isinstance(items, tuple)).all()
@@ -0,0 +1,38 @@
+from config.settings import API_SETTINGS
+from data.synthetic_data import generate_synthetic_data
+from models.campaign_generator import format_persona, generate_campaign_prompt
+from utils.api_utils import build_complete_prompt
+from utils.token_ledger import TokenLedger, estimate_tokens
+
+
+def test_estimate_counts_words_symbols_and_indentation():
+    assert estimate_tokens('{"a": 1}') < estimate_tokens('{\n    "a": 1\n}')
+    assert estimate_tokens('hello world') == 3
+
+
+def test_max_tokens_adapts_per_segment(monkeypatch):
+    monkeypatch.setitem(API_SETTINGS, 'max_tokens_min_samples', 5)
+    ledger = TokenLedger()
+    for _ in range(4):
+        ledger.observe('Basic', 300)
+    assert ledger.suggest_max_tokens('Basic') == API_SETTINGS['default_max_tokens']
+
+    ledger.observe('Basic', 300)
+    # 300 * 1.25 rounded up to the 256 step
+    assert ledger.suggest_max_tokens('Basic') == 512
+    assert ledger.suggest_max_tokens('Premium') == API_SETTINGS['default_max_tokens']
+
+    ledger.record(prompt_tokens=700, completion_tokens=300, max_tokens=512)
+    assert ledger.stats()['reserved_tokens_saved'] == API_SETTINGS['default_max_tokens'] - 512
+
+
+def test_compact_prompts_match_uncompiled_and_save_tokens():
+    customers = generate_synthetic_data(20, seed=5)
+    for _, row in customers.iterrows():
+        persona = format_persona(row.to_dict())
+        compact_prefix, compact_suffix = generate_campaign_prompt(persona, compact=True)
+        verbose_prefix, verbose_suffix = generate_campaign_prompt(persona)
+
+        assert '\n  ' not in compact_prefix
+        assert (estimate_tokens(build_complete_prompt(compact_suffix, True, compact_prefix)) <
+                0.8 * estimate_tokens(build_complete_prompt(verbose_suffix, False, verbose_prefix)))